@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+网段内逐个地址的分配记录（位图）
+
+子网规划只处理整块网段，规划好的子网内还需要记录每个主机地址是否已分配（例如DHCP地址池、服务器地址表）。
+AddressBitmap为一个网段保存一个bytearray位图，每个地址1位，/8的约1677万个地址只占2MB：
+- 按地址顺序排列（每字节高位在前），查找空闲地址和连续空闲地址时先用正则表达式在C层按字节跳过
+  全满或全空的字节，只在边界字节内逐位检查
+- 顺序分配时记录最低的可能空闲位置，逐个分配的耗时与网段大小无关
+- IPv4网段（/31和/32除外）的网络地址和广播地址不可分配，不计入可用地址和使用率
+
+用法:
+    from address_bitmap import AddressBitmap, plan_address_bitmaps
+
+    bitmap = AddressBitmap("10.0.0.0/24")
+    bitmap.allocate()               # '10.0.0.1'
+    bitmap.allocate("10.0.0.10")
+    bitmap.allocate_range(20)       # ('10.0.0.11', '10.0.0.30')，最低地址的20个连续空闲地址
+    bitmap.release("10.0.0.10")
+    bitmap.utilization
+
+    bitmaps = plan_address_bitmaps(suggest_subnet_planning("10.0.0.0/16", required_subnets))
+"""
+
+import re
+
+from ip_subnet_calculator import parse_network_ints, int_to_ip, iter_allocated_cidrs
+
+# 单个位图允许的最大地址数（/0的IPv4需要512MB），更大的网段（如IPv6的/64）无法逐个地址记录
+MAX_BITMAP_ADDRESSES = 1 << 32
+
+# 第一个不是全部已分配（0xFF）的字节、第一个不是全部空闲（0x00）的字节
+_NOT_FULL = re.compile(b"[^\xff]")
+_NOT_EMPTY = re.compile(b"[^\x00]")
+
+
+class AddressBitmap:
+    """
+    一个网段内逐个地址的分配位图
+
+    地址参数可以是IP地址字符串或整数，返回值为IP地址字符串。地址不在可用范围内、
+    重复分配或释放未分配的地址时抛出ValueError；没有足够的空闲地址时allocate和allocate_range返回None
+    """
+
+    __slots__ = (
+        "cidr", "version", "network", "num_addresses", "_bits", "_first", "_last", "_allocated", "_hint"
+    )
+
+    def __init__(self, cidr):
+        """为cidr网段创建空位图，网段无效或超过MAX_BITMAP_ADDRESSES个地址时抛出ValueError"""
+        network, prefixlen, version = parse_network_ints(str(cidr))
+        num_addresses = 1 << ((32 if version == 4 else 128) - prefixlen)
+        if num_addresses > MAX_BITMAP_ADDRESSES:
+            raise ValueError(
+                f"{cidr} 包含{num_addresses}个地址，超过逐个地址记录的上限（{MAX_BITMAP_ADDRESSES}个）"
+            )
+        self.cidr = f"{int_to_ip(network, version)}/{prefixlen}"
+        self.version = version
+        self.network = network
+        self.num_addresses = num_addresses
+        self._bits = bytearray((num_addresses + 7) >> 3)
+        # 可用地址的位置范围[_first, _last]，与network_info的可用主机范围相同
+        if version == 4 and num_addresses > 2:
+            self._first, self._last = 1, num_addresses - 2
+            self._set_range(0, 1)
+            self._set_range(num_addresses - 1, num_addresses)
+        else:
+            self._first, self._last = 0, num_addresses - 1
+        # 末字节中超出网段的位标记为已分配，查找时不会越界
+        self._set_range(num_addresses, len(self._bits) << 3)
+        self._allocated = 0
+        self._hint = self._first
+
+    # ---- 位操作 ----
+
+    def _test(self, index):
+        return self._bits[index >> 3] & (0x80 >> (index & 7))
+
+    def _popcount(self, start, stop):
+        """[start, stop)中已置位的位数"""
+        if start >= stop:
+            return 0
+        first_byte, last_byte = start >> 3, (stop - 1) >> 3
+        value = int.from_bytes(self._bits[first_byte:last_byte + 1], "big")
+        # 去掉首字节中start之前、末字节中stop之后的位
+        value &= (1 << ((last_byte + 1 - first_byte) * 8 - (start & 7))) - 1
+        value >>= 7 - ((stop - 1) & 7)
+        return value.bit_count()
+
+    def _write_range(self, start, stop, fill):
+        """把[start, stop)的位全部置为1（fill为0xFF）或0（fill为0），整字节部分用切片赋值"""
+        bits = self._bits
+        while start < stop and start & 7:
+            mask = 0x80 >> (start & 7)
+            bits[start >> 3] = bits[start >> 3] | mask if fill else bits[start >> 3] & ~mask
+            start += 1
+        full_bytes = (stop - start) >> 3
+        if full_bytes:
+            bits[start >> 3:(start >> 3) + full_bytes] = bytes([fill]) * full_bytes
+            start += full_bytes << 3
+        while start < stop:
+            mask = 0x80 >> (start & 7)
+            bits[start >> 3] = bits[start >> 3] | mask if fill else bits[start >> 3] & ~mask
+            start += 1
+
+    def _set_range(self, start, stop):
+        self._write_range(start, stop, 0xFF)
+
+    def _next_free(self, index):
+        """index及之后第一个空闲位的位置，没有时返回None"""
+        bits = self._bits
+        while index & 7:
+            if index >= self.num_addresses:
+                return None
+            if not self._test(index):
+                return index
+            index += 1
+        match = _NOT_FULL.search(bits, index >> 3)
+        if match is None:
+            return None
+        byte_index = match.start()
+        # 字节内第一个0位：取反后最高的1位
+        index = (byte_index << 3) + 8 - ((~bits[byte_index]) & 0xFF).bit_length()
+        return index if index < self.num_addresses else None
+
+    def _next_used(self, index, limit=None):
+        """index及之后第一个已置位的位置，没有时返回位图总位数；指定limit时只检查到limit所在的字节"""
+        bits = self._bits
+        while index & 7:
+            if self._test(index):
+                return index
+            index += 1
+        end_byte = len(bits) if limit is None else min(len(bits), (limit + 7) >> 3)
+        match = _NOT_EMPTY.search(bits, index >> 3, end_byte)
+        if match is None:
+            return end_byte << 3
+        byte_index = match.start()
+        return (byte_index << 3) + 8 - bits[byte_index].bit_length()
+
+    # ---- 地址与位置的转换 ----
+
+    def _index(self, address):
+        if isinstance(address, int):
+            value = address
+        else:
+            value, prefixlen, version = parse_network_ints(str(address))
+            if version != self.version or prefixlen != (32 if version == 4 else 128):
+                raise ValueError(f"{address} 不是{self.cidr}中的IP地址")
+        index = value - self.network
+        if not self._first <= index <= self._last:
+            raise ValueError(f"{int_to_ip(value, self.version)} 不在 {self.cidr} 的可用地址范围内")
+        return index
+
+    def _address(self, index):
+        return int_to_ip(self.network + index, self.version)
+
+    # ---- 统计 ----
+
+    @property
+    def usable_addresses(self):
+        return self._last - self._first + 1
+
+    @property
+    def allocated_addresses(self):
+        return self._allocated
+
+    @property
+    def free_addresses(self):
+        return self.usable_addresses - self._allocated
+
+    @property
+    def utilization(self):
+        """已分配地址占可用地址的百分比"""
+        return round(self._allocated * 100 / self.usable_addresses, 2)
+
+    @property
+    def memory_bytes(self):
+        """位图占用的字节数"""
+        return len(self._bits)
+
+    # ---- 查询 ----
+
+    def is_allocated(self, address):
+        return bool(self._test(self._index(address)))
+
+    def find_first_free(self, start=None):
+        """返回start（默认为第一个可用地址）及之后第一个空闲地址，没有时返回None，不做分配"""
+        index = self._hint if start is None else max(self._index(start), self._hint)
+        index = self._next_free(index)
+        return None if index is None else self._address(index)
+
+    def iter_free_ranges(self):
+        """按地址顺序生成空闲地址段，每项为(第一个地址, 最后一个地址)"""
+        index = self._next_free(self._hint)
+        while index is not None:
+            end = min(self._next_used(index), self._last + 1)
+            yield self._address(index), self._address(end - 1)
+            index = self._next_free(end)
+
+    # ---- 分配和释放 ----
+
+    def allocate(self, address=None):
+        """
+        分配一个地址：指定address时分配该地址（已分配时抛出ValueError），否则分配最低的空闲地址
+
+        返回分配的地址，没有空闲地址时返回None
+        """
+        if address is None:
+            index = self._next_free(self._hint)
+            if index is None:
+                self._hint = self._last + 1
+                return None
+            self._hint = index + 1
+        else:
+            index = self._index(address)
+            if self._test(index):
+                raise ValueError(f"{self._address(index)} 已分配")
+        self._bits[index >> 3] |= 0x80 >> (index & 7)
+        self._allocated += 1
+        return self._address(index)
+
+    def allocate_range(self, count):
+        """
+        分配最低地址的count个连续空闲地址（首次适配）
+
+        返回(第一个地址, 最后一个地址)，没有足够长的连续空闲地址时返回None
+        """
+        if count < 1:
+            raise ValueError("地址数量必须大于0")
+        # 长度不小于count的空闲段至少包含window个连续的全空字节，先按字节跳过不可能容纳的区域
+        window = max(0, (count - 14) >> 3)
+        zeros = bytes(window)
+        index = self._next_free(self._hint)
+        while index is not None:
+            end = self._next_used(index, index + count)
+            if end - index >= count:
+                self._set_range(index, index + count)
+                self._allocated += count
+                if index == self._hint:
+                    self._hint = index + count
+                return self._address(index), self._address(index + count - 1)
+            if window > 0:
+                byte_index = self._bits.find(zeros, end >> 3)
+                if byte_index < 0:
+                    return None
+                # 包含这个全空字节窗口的空闲段最早从它之前window个字节处开始
+                end = max(end, (byte_index - window) << 3)
+            index = self._next_free(end)
+        return None
+
+    def release(self, address, count=1):
+        """释放从address开始的count个连续地址，其中有未分配的地址时抛出ValueError，不做任何修改"""
+        start = self._index(address)
+        if count < 1 or start + count - 1 > self._last:
+            raise ValueError(f"释放的地址超出 {self.cidr} 的可用地址范围")
+        if self._popcount(start, start + count) != count:
+            raise ValueError(f"{self._address(start)} 开始的{count}个地址中有未分配的地址")
+        self._write_range(start, start + count, 0)
+        self._allocated -= count
+        self._hint = min(self._hint, start)
+
+    # ---- 持久化 ----
+
+    def to_bytes(self):
+        """导出位图（网络地址和广播地址等不可分配的位也置为1）"""
+        return bytes(self._bits)
+
+    @classmethod
+    def from_bytes(cls, cidr, data):
+        """从to_bytes()导出的位图恢复，长度不符时抛出ValueError"""
+        bitmap = cls(cidr)
+        if len(data) != len(bitmap._bits):
+            raise ValueError(f"{cidr} 的位图应为{len(bitmap._bits)}字节，实际为{len(data)}字节")
+        reserved = bitmap._popcount(0, len(bitmap._bits) << 3)
+        bitmap._bits[:] = data
+        # 不可分配的位始终保持为1
+        bitmap._set_range(0, bitmap._first)
+        bitmap._set_range(bitmap._last + 1, len(bitmap._bits) << 3)
+        bitmap._allocated = bitmap._popcount(0, len(bitmap._bits) << 3) - reserved
+        return bitmap
+
+    def __repr__(self):
+        return f"AddressBitmap({self.cidr!r}, 已分配{self._allocated}/{self.usable_addresses})"
+
+
+def plan_address_bitmaps(plan_result, names=None):
+    """
+    为子网规划结果中的已分配子网创建空的地址位图
+
+    参数:
+    plan_result: suggest_subnet_planning等函数返回的规划结果
+    names: 可选，只为这些名称的子网创建位图
+
+    返回:
+    {CIDR: AddressBitmap}，按分配记录的顺序排列，count大于1的分配记录展开为每个子网一个位图。
+    某个子网超过MAX_BITMAP_ADDRESSES个地址时抛出ValueError
+    """
+    names = None if names is None else set(names)
+    bitmaps = {}
+    for subnet in plan_result["allocated_subnets"]:
+        if names is None or subnet["name"] in names:
+            for cidr in iter_allocated_cidrs(subnet):
+                bitmaps[cidr] = AddressBitmap(cidr)
+    return bitmaps
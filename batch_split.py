@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+子网切分批量并行计算
+
+数十万个互不相关的(父网段, 切分网段)任务串行调用split_subnet只能用到一个CPU核心。
+这里把任务列表分片后提交到进程池：
+- 任务按chunk_size分片提交，每个工作进程一次计算一整片，减少进程间通信次数
+- 同时在途的分片数量有上限，输入可以是生成器，内存占用与任务总数无关
+- 结果可按输入顺序返回（ordered=True），也可按完成顺序尽快返回
+- 工作进程只返回整数元组（split_subnet_ints的结果），不生成get_subnet_info字典，
+  进程间序列化的数据量很小；需要详细信息时由调用方按需生成
+
+用法:
+    from batch_split import iter_split_batch
+
+    for index, remaining in iter_split_batch(jobs, workers=4):
+        if isinstance(remaining, str):
+            print(f"任务 {index} 失败: {remaining}")
+"""
+
+import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from ip_subnet_calculator import split_subnet_ints, int_to_ip
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def split_chunk(chunk):
+    """在工作进程中计算一片任务，chunk为(起始序号, [(父网段, 切分网段), ...])"""
+    start, jobs = chunk
+    return start, [split_subnet_ints(parent, split) for parent, split in jobs]
+
+
+def iter_chunks(jobs, chunk_size):
+    """将任务按chunk_size分片，每片附带第一个任务的序号"""
+    jobs = iter(jobs)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(jobs, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def iter_split_batch(jobs, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, ordered=True, max_pending=None):
+    """
+    批量执行子网切分，逐个返回(任务序号, 结果)
+
+    参数:
+    jobs: (父网段, 切分网段)的可迭代对象，可以是生成器
+    workers: 工作进程数，默认CPU核心数；为1时在当前进程中计算
+    chunk_size: 每个分片包含的任务数
+    ordered: 为True时按输入顺序返回结果，否则按完成顺序返回
+    max_pending: 同时提交到进程池的分片数上限，默认为工作进程数的2倍
+
+    返回:
+    生成器，结果为按地址排序的((网络地址整数, 前缀长度), ...)元组，任务出错时为错误信息字符串
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = iter_chunks(jobs, max(1, chunk_size))
+
+    if workers <= 1:
+        for chunk in chunks:
+            start, results = split_chunk(chunk)
+            yield from enumerate(results, start)
+        return
+
+    max_pending = max_pending or workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}  # future -> 分片起始序号
+        finished = {}  # 按顺序返回时暂存提前完成的分片
+        next_start = 0
+        exhausted = False
+
+        while True:
+            # 等待按顺序返回的分片也计入上限，避免前面的分片较慢时暂存的结果无限增长
+            while not exhausted and len(pending) + len(finished) < max_pending:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                pending[executor.submit(split_chunk, chunk)] = chunk[0]
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                del pending[future]
+                start, results = future.result()
+                if not ordered:
+                    yield from enumerate(results, start)
+                else:
+                    finished[start] = results
+
+            # 按顺序返回已经连续完成的分片
+            while next_start in finished:
+                results = finished.pop(next_start)
+                yield from enumerate(results, next_start)
+                next_start += len(results)
+
+
+def split_batch(jobs, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """批量执行子网切分，按输入顺序返回结果列表"""
+    return [result for _, result in iter_split_batch(jobs, workers, chunk_size)]
+
+
+def remaining_to_cidrs(remaining, version=4):
+    """将split_subnet_ints返回的整数元组转换为CIDR字符串列表，IPv6任务需指定version=6"""
+    return [f"{int_to_ip(network, version)}/{prefixlen}" for network, prefixlen in remaining]
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+地址分配位图的内存和吞吐量测试
+
+在一个/8（约1677万个可用地址）上测量：
+- 位图占用的内存，以及用Python集合保存相同数量已分配地址整数时的内存（按抽样估算）
+- 逐个分配地址（allocate）的吞吐量
+- 按连续地址段（allocate_range）把整个/8分配满的耗时
+- 分配满之后释放最后一个地址，从导出的位图恢复后从头查找空闲地址（find_first_free）的耗时
+- 随机释放地址（release）的吞吐量
+
+用法:
+    python benchmarks/bench_address_bitmap.py [--cidr 10.0.0.0/8] [--singles 1000000] [--range-size 256]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from address_bitmap import AddressBitmap
+from ip_subnet_calculator import HostSequence
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def allocate_singles(bitmap, count):
+    for _ in range(count):
+        bitmap.allocate()
+
+
+def fill_by_ranges(bitmap, range_size):
+    while bitmap.allocate_range(range_size) is not None:
+        pass
+    # 末尾不足range_size的地址逐个分配
+    while bitmap.allocate() is not None:
+        pass
+
+
+def set_memory(count):
+    """用Python集合保存count个地址整数时占用的内存（字节）"""
+    tracemalloc.start()
+    addresses = set(range(10 << 24, (10 << 24) + count))
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del addresses
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="地址分配位图的内存和吞吐量测试")
+    parser.add_argument("--cidr", default="10.0.0.0/8", help="测试的网段")
+    parser.add_argument("--singles", type=int, default=1000000, help="逐个分配的地址数")
+    parser.add_argument("--range-size", type=int, default=256, help="按连续地址段分配满时每段的地址数")
+    parser.add_argument("--releases", type=int, default=200000, help="随机释放的地址数")
+    parser.add_argument("--set-sample", type=int, default=1000000, help="估算Python集合内存时的抽样地址数")
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    bitmap = AddressBitmap(args.cidr)
+    bitmap_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    usable = bitmap.usable_addresses
+    print(f"网段: {bitmap.cidr}，可用地址: {usable:,} 个")
+    print(f"位图内存: {bitmap_memory / 1024 / 1024:.2f} MB")
+    if args.set_sample:
+        per_address = set_memory(args.set_sample) / args.set_sample
+        estimated = per_address * usable / 1024 / 1024
+        print(f"Python集合保存全部地址（按{args.set_sample:,}个抽样估算）: {estimated:,.0f} MB")
+
+    singles = min(args.singles, usable)
+    _, elapsed = timed(allocate_singles, bitmap, singles)
+    print(f"逐个分配 {singles:,} 个地址: {elapsed:.2f} 秒（{singles / elapsed:,.0f} 个/秒）")
+
+    _, elapsed = timed(fill_by_ranges, bitmap, args.range_size)
+    print(f"按 {args.range_size} 个地址一段分配满: {elapsed:.2f} 秒，使用率 {bitmap.utilization}%")
+
+    hosts = HostSequence(bitmap.cidr)
+    tail = hosts[-1]
+    bitmap.release(tail)
+    # 从导出的位图恢复，没有顺序分配记录的最低空闲位置，需要从头扫描整个位图
+    restored, elapsed = timed(AddressBitmap.from_bytes, bitmap.cidr, bitmap.to_bytes())
+    print(f"导出并恢复位图: {elapsed * 1000:.2f} 毫秒")
+    found, elapsed = timed(restored.find_first_free)
+    assert found == tail
+    print(f"从头查找唯一的空闲地址（最后一个地址）: {elapsed * 1000:.2f} 毫秒")
+    bitmap.allocate(tail)
+
+    rng = random.Random(1)
+    releases = rng.sample(hosts.ints(), min(args.releases, usable))
+    _, elapsed = timed(lambda: [bitmap.release(address) for address in releases])
+    print(f"随机释放 {len(releases):,} 个地址: {elapsed:.2f} 秒（{len(releases) / elapsed:,.0f} 个/秒）")
+    _, elapsed = timed(allocate_singles, bitmap, len(releases))
+    print(f"重新分配释放的 {len(releases):,} 个地址: {elapsed:.2f} 秒（{len(releases) / elapsed:,.0f} 个/秒）")
+    print(f"使用率: {bitmap.utilization}%")
+
+
+if __name__ == "__main__":
+    main()
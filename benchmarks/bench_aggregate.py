@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CIDR聚合与地址范围转换性能测试
+
+生成大量随机网段（默认100万个），分别测量：
+- ip_subnet_calculator.aggregate_subnets（字符串输入，包含解析）
+- ip_subnet_calculator.aggregate_cidr_ints（整数输入）
+- ipaddress.collapse_addresses（默认只测前10万个网段，全部测试耗时很长）
+- range_to_cidr_ints 对大量随机地址范围的转换吞吐量
+
+用法:
+    python benchmarks/bench_aggregate.py [--prefixes 1000000] [--collapse 100000] [--ranges 100000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import ipaddress
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ip_subnet_calculator import (
+    aggregate_subnets,
+    aggregate_cidr_ints,
+    parse_network_ints,
+    range_to_cidr_ints,
+    int_to_ip,
+)
+
+
+def build_prefixes(count, seed=1):
+    """在10.0.0.0/8中生成count个随机网段，前缀长度26~32，大量网段相邻或重叠以便聚合"""
+    rng = random.Random(seed)
+    prefixes = []
+    for _ in range(count):
+        prefixlen = rng.choice((26, 28, 29, 30, 31, 32, 32, 32))
+        address = (10 << 24 | rng.getrandbits(24)) >> (32 - prefixlen) << (32 - prefixlen)
+        prefixes.append(f"{int_to_ip(address)}/{prefixlen}")
+    return prefixes
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CIDR聚合与地址范围转换性能测试")
+    parser.add_argument("--prefixes", type=int, default=1000000, help="输入网段数量")
+    parser.add_argument("--collapse", type=int, default=100000, help="ipaddress.collapse_addresses对比的网段数量，0表示跳过")
+    parser.add_argument("--ranges", type=int, default=100000, help="地址范围转换测试的范围数量")
+    args = parser.parse_args()
+
+    prefixes = build_prefixes(args.prefixes)
+    print(f"输入网段: {len(prefixes):,} 个")
+
+    result, elapsed = timed(aggregate_subnets, prefixes)
+    print(f"aggregate_subnets: {elapsed:.2f} 秒，{len(prefixes) / elapsed:,.0f} 个/秒，输出 {result['output_count']:,} 个网段")
+
+    blocks = [parse_network_ints(cidr)[:2] for cidr in prefixes]
+    aggregated, elapsed = timed(aggregate_cidr_ints, blocks)
+    print(f"aggregate_cidr_ints（不含解析）: {elapsed:.2f} 秒，{len(blocks) / elapsed:,.0f} 个/秒")
+
+    blocks.sort()
+    _, elapsed = timed(aggregate_cidr_ints, blocks)
+    print(f"aggregate_cidr_ints（已排序输入）: {elapsed:.2f} 秒，{len(blocks) / elapsed:,.0f} 个/秒")
+
+    if args.collapse:
+        sample = prefixes[: args.collapse]
+        expected, elapsed = timed(
+            lambda items: [str(n) for n in ipaddress.collapse_addresses(ipaddress.IPv4Network(c) for c in items)],
+            sample,
+        )
+        ours, ours_elapsed = timed(aggregate_subnets, sample)
+        assert ours["aggregated"] == expected, "聚合结果与ipaddress.collapse_addresses不一致"
+        print(
+            f"ipaddress.collapse_addresses（{len(sample):,}个）: {elapsed:.2f} 秒，"
+            f"aggregate_subnets: {ours_elapsed:.2f} 秒，加速比 {elapsed / ours_elapsed:.1f}，结果一致"
+        )
+
+    rng = random.Random(2)
+    ranges = []
+    for _ in range(args.ranges):
+        a, b = rng.getrandbits(32), rng.getrandbits(32)
+        ranges.append((min(a, b), max(a, b)))
+    start = time.perf_counter()
+    total = sum(len(range_to_cidr_ints(a, b)) for a, b in ranges)
+    elapsed = time.perf_counter() - start
+    print(f"range_to_cidr_ints: {len(ranges) / elapsed:,.0f} 个范围/秒，平均每个范围 {total / len(ranges):.1f} 个网段")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+网段分布图表重绘基准测试
+
+分别使用旧的4方向描边文字和新的"单文字项+底板"标签绘制方式，
+测量1k/5k/20k个网段时完整重绘图表的耗时和Canvas项目数。
+
+用法:
+    python benchmarks/bench_chart_redraw.py [--sizes 1000 5000 20000] [--repeat 3]
+
+需要图形界面环境（Windows桌面或Linux下的X11显示）。
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tkinter as tk
+
+
+def build_chart_data(count):
+    """构造包含count个剩余网段的图表数据（/8父网段内连续的/24网段）"""
+    parent_start = 10 << 24
+    networks = [
+        {
+            "start": parent_start,
+            "end": parent_start + 255,
+            "range": 256,
+            "name": "10.0.0.0/24",
+            "color": "#2196f3",
+            "type": "split",
+        }
+    ]
+    for i in range(1, count + 1):
+        start = parent_start + i * 256
+        networks.append(
+            {
+                "start": start,
+                "end": start + 255,
+                "range": 256,
+                "name": f"10.{(i >> 8) & 0xFF}.{i & 0xFF}.0/24",
+                "color": "#4caf50",
+                "type": "remaining",
+            }
+        )
+    return {
+        "parent": {
+            "start": parent_start,
+            "end": parent_start + (1 << 24) - 1,
+            "range": 1 << 24,
+            "name": "10.0.0.0/8",
+            "color": "#f3e5f5",
+        },
+        "networks": networks,
+    }
+
+
+def stroke_label_row(app):
+    """返回使用旧描边方式绘制整行标签的函数，作为对照组"""
+
+    def draw_label_row(labels, y, font, fill="#ffffff", plate="#000000"):
+        for text, label_x in labels:
+            app.draw_text_with_stroke(text, label_x, y, font, anchor=tk.W, fill=fill)
+
+    return draw_label_row
+
+
+def time_redraw(app, repeat):
+    """多次完整重绘图表，返回最短耗时（秒）和Canvas项目数"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        app.draw_distribution_chart()
+        app.root.update_idletasks()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(app.chart_canvas.find_all())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="网段分布图表重绘基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"无法创建Tk窗口（需要图形界面环境）: {e}")
+        return 1
+
+    from windows_app import IPSubnetSplitterApp
+
+    root.geometry("800x700")
+    app = IPSubnetSplitterApp(root)
+    # 图表标签页是延迟创建的，先切换过去以创建Canvas
+    app.notebook.select_tab(2)
+    root.update()
+
+    renderer = app.chart_label_renderer
+    plate_draw = renderer.draw_label_row
+    stroke_draw = stroke_label_row(app)
+
+    print(f"{'网段数':>8} | {'描边耗时(ms)':>12} | {'描边项目数':>10} | {'底板耗时(ms)':>12} | {'底板项目数':>10} | {'加速比':>6}")
+    print("-" * 80)
+    for size in args.sizes:
+        app.chart_data = build_chart_data(size)
+
+        renderer.draw_label_row = stroke_draw
+        stroke_time, stroke_items = time_redraw(app, args.repeat)
+
+        renderer.draw_label_row = plate_draw
+        renderer.clear_cache()
+        plate_time, plate_items = time_redraw(app, args.repeat)
+
+        speedup = stroke_time / plate_time if plate_time else float("inf")
+        print(
+            f"{size:>8} | {stroke_time * 1000:>12.1f} | {stroke_items:>10} | "
+            f"{plate_time * 1000:>12.1f} | {plate_items:>10} | {speedup:>5.2f}x"
+        )
+
+    root.destroy()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
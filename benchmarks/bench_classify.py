@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+批量IP归属判断的吞吐量测试
+
+在10.0.0.0/8中规划一批子网，生成大量随机IP地址，分别测量：
+- 逐个用ipaddress解析地址并在子网起始地址中二分查找（对比基准，默认只测前10万个地址）
+- SubnetClassifier.classify对IP地址字符串、array("I")整数数组的吞吐量
+- 安装了NumPy时，对NumPy uint32数组的吞吐量（numpy.searchsorted）
+
+用法:
+    python benchmarks/bench_classify.py [--subnets 5000] [--ips 2000000] [--baseline 100000]
+"""
+
+import os
+import sys
+import time
+import random
+import bisect
+import argparse
+import ipaddress
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ip_subnet_calculator import suggest_subnet_planning, int_to_ip
+from ip_classifier import SubnetClassifier, pack_ipv4, load_numpy
+
+
+def build_plan(count, seed=1):
+    rng = random.Random(seed)
+    required = [{"name": f"子网{i}", "hosts": rng.choice([10, 30, 60, 120, 250, 500])} for i in range(count)]
+    return suggest_subnet_planning("10.0.0.0/8", required)
+
+
+def baseline_classify(plan, ips):
+    """逐个地址用ipaddress解析，再在子网列表中二分查找"""
+    networks = sorted(
+        (ipaddress.ip_network(subnet["cidr"]), i) for i, subnet in enumerate(plan["allocated_subnets"])
+    )
+    starts = [int(network.network_address) for network, _ in networks]
+    result = []
+    for ip in ips:
+        address = ipaddress.ip_address(ip)
+        position = bisect.bisect_right(starts, int(address)) - 1
+        if position >= 0 and address in networks[position][0]:
+            result.append(networks[position][1])
+        else:
+            result.append(-1)
+    return result
+
+
+def report(label, count, elapsed):
+    print(f"{label:<36} {elapsed:>8.3f} 秒 {count / elapsed / 1e6:>10.2f} 百万个/秒")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量IP归属判断的吞吐量测试")
+    parser.add_argument("--subnets", type=int, default=5000, help="规划的子网数量")
+    parser.add_argument("--ips", type=int, default=2000000, help="随机IP地址数量")
+    parser.add_argument("--baseline", type=int, default=100000, help="逐个判断对比的地址数量，0表示跳过")
+    args = parser.parse_args()
+
+    plan = build_plan(args.subnets)
+    classifier = SubnetClassifier.from_plan(plan)
+    used = sum(subnet["info"]["num_addresses"] for subnet in plan["allocated_subnets"])
+    rng = random.Random(2)
+    # 大部分地址落在已分配的子网中，少部分未命中
+    span = used + used // 10
+    ints = [(10 << 24) + rng.randrange(span) for _ in range(args.ips)]
+    ips = [int_to_ip(value) for value in ints]
+    print(f"子网: {len(classifier):,} 个，IP地址: {len(ips):,} 个")
+
+    if args.baseline:
+        sample = ips[:args.baseline]
+        start = time.perf_counter()
+        expected = baseline_classify(plan, sample)
+        report("ipaddress逐个判断", len(sample), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    packed = pack_ipv4(ips)
+    report("字符串转换为array(\"I\")", len(ips), time.perf_counter() - start)
+
+    numpy = load_numpy()
+    start = time.perf_counter()
+    indexes = classifier.classify(ips)
+    label = "classify(字符串)" + ("（NumPy）" if numpy else "")
+    report(label, len(ips), time.perf_counter() - start)
+    if args.baseline:
+        assert list(indexes[:args.baseline]) == expected
+
+    start = time.perf_counter()
+    assert classifier.classify(packed) == indexes
+    report("classify(array(\"I\"))" + ("（NumPy）" if numpy else ""), len(ips), time.perf_counter() - start)
+
+    if numpy is not None:
+        values = numpy.frombuffer(packed, dtype=numpy.uint32).copy()
+        start = time.perf_counter()
+        result = classifier.classify(values)
+        report("classify(numpy.uint32数组)", len(ips), time.perf_counter() - start)
+        assert result.tolist() == list(indexes)
+    else:
+        print("未安装NumPy，跳过NumPy数组测试")
+
+    hits = classifier.count_hits(indexes)
+    print(f"命中子网: {len(ips) - hits[-1]:,} 个地址，未命中: {hits[-1]:,} 个地址")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+列式规划结果的内存和耗时测试
+
+在10.0.0.0/8中规划大量子网，分别用suggest_subnet_planning（字典列表）和
+suggest_subnet_planning_compact（列式表格）生成结果，测量：
+- 生成结果的耗时和结果占用的内存（需求列表在测量前创建，不计入）
+- 遍历全部分配记录读取cidr的耗时（列式结果按需生成行字典）
+- 通过buffers()把各列写入内存文件的耗时和字节数
+
+用法:
+    python benchmarks/bench_compact_results.py [--subnets 100000]
+"""
+
+import io
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ip_subnet_calculator import suggest_subnet_planning
+from compact_results import suggest_subnet_planning_compact
+
+
+def build_required(count, seed=1):
+    rng = random.Random(seed)
+    return [{"name": f"子网{i}", "hosts": rng.choice([10, 30, 60, 120, 250])} for i in range(count)]
+
+
+def measure(func, parent, required):
+    """返回(结果, 耗时, 结果占用的内存字节数)"""
+    required = [dict(subnet) for subnet in required]
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(parent, required)
+    elapsed = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="列式规划结果的内存和耗时测试")
+    parser.add_argument("--parent", default="10.0.0.0/8", help="父网段")
+    parser.add_argument("--subnets", type=int, default=100000, help="规划的子网数量")
+    args = parser.parse_args()
+
+    required = build_required(args.subnets)
+    print(f"父网段: {args.parent}，需求: {len(required):,} 个子网")
+
+    plan, elapsed, memory = measure(suggest_subnet_planning, args.parent, required)
+    print(f"{'suggest_subnet_planning':<34} {elapsed:>7.2f} 秒 {memory / 1024 / 1024:>9.1f} MB")
+    expected = [subnet["cidr"] for subnet in plan["allocated_subnets"]]
+    del plan
+
+    compact, elapsed, memory = measure(suggest_subnet_planning_compact, args.parent, required)
+    print(f"{'suggest_subnet_planning_compact':<34} {elapsed:>7.2f} 秒 {memory / 1024 / 1024:>9.1f} MB")
+    allocated = compact.allocated
+    print(f"分配记录的数值列: {allocated.nbytes / 1024 / 1024:.2f} MB（{allocated.nbytes / len(allocated):.0f} 字节/行）")
+
+    start = time.perf_counter()
+    cidrs = [row["cidr"] for row in allocated]
+    print(f"逐行读取cidr（按需生成行字典）: {time.perf_counter() - start:.2f} 秒")
+    assert cidrs == expected
+    start = time.perf_counter()
+    assert allocated.cidrs() == expected
+    print(f"cidrs()一次生成全部CIDR: {time.perf_counter() - start:.2f} 秒")
+
+    stream = io.BytesIO()
+    start = time.perf_counter()
+    for view in allocated.buffers().values():
+        stream.write(view)
+    elapsed = time.perf_counter() - start
+    print(f"buffers()写入各列: {stream.tell():,} 字节，{elapsed * 1000:.2f} 毫秒")
+
+
+if __name__ == "__main__":
+    main()
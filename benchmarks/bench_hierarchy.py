@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+多级子网规划的性能测试
+
+生成"区域 → 站点 → VLAN"三级随机需求树，分别测量：
+- 逐个节点调用suggest_subnet_planning（先规划区域，再在每个区域内规划站点，最后在每个站点内规划VLAN）的耗时
+- hierarchical_plan.plan_hierarchy在1到N个工作进程下的耗时和相对1个进程的加速比
+
+用法:
+    python benchmarks/bench_hierarchy.py [--regions 16] [--sites 64] [--vlans 48] [--workers 1 2 4 8]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ip_subnet_calculator import suggest_subnet_planning
+from hierarchical_plan import plan_hierarchy
+
+PARENT = "10.0.0.0/8"
+
+
+def build_tree(regions, sites, vlans, seed=1):
+    """生成三级需求树，每个站点包含1到vlans个VLAN"""
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"区域{r}",
+            "children": [
+                {
+                    "name": f"站点{s}",
+                    "children": [
+                        {"name": f"VLAN{v}", "hosts": rng.choice([10, 30, 60, 120, 250, 500])}
+                        for v in range(rng.randint(1, vlans))
+                    ],
+                }
+                for s in range(sites)
+            ],
+        }
+        for r in range(regions)
+    ]
+
+
+def count_nodes(nodes):
+    return sum(1 + count_nodes(node.get("children", [])) for node in nodes)
+
+
+def measure_per_node(tree, headroom):
+    """按节点逐级调用suggest_subnet_planning：子节点需要的大小由其下一级的规划结果估算"""
+
+    def node_hosts(node):
+        # 以子节点全部分配后占用的地址数（含余量）作为中间节点的主机数
+        if not node.get("children"):
+            return node["hosts"]
+        plan = suggest_subnet_planning("0.0.0.0/0", [dict(child, hosts=node_hosts(child)) for child in node["children"]])
+        used = sum(subnet["info"]["num_addresses"] for subnet in plan["allocated_subnets"])
+        return int(used * (1 + headroom)) - 2
+
+    start = time.perf_counter()
+    pending = [(PARENT, tree)]
+    while pending:
+        parent, nodes = pending.pop()
+        requirements = [{"name": node["name"], "hosts": node_hosts(node)} for node in nodes]
+        plan = suggest_subnet_planning(parent, requirements)
+        if "error" in plan:
+            raise RuntimeError(plan["error"])
+        by_name = {node["name"]: node for node in nodes}
+        for subnet in plan["allocated_subnets"]:
+            children = by_name[subnet["name"]].get("children")
+            if children:
+                pending.append((subnet["cidr"], children))
+    return time.perf_counter() - start
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, cpu_count} & set(range(1, cpu_count + 1)))
+    parser = argparse.ArgumentParser(description="多级子网规划的性能测试")
+    parser.add_argument("--regions", type=int, default=16, help="区域数")
+    parser.add_argument("--sites", type=int, default=64, help="每个区域的站点数")
+    parser.add_argument("--vlans", type=int, default=48, help="每个站点最多的VLAN数")
+    parser.add_argument("--headroom", type=float, default=0.25, help="中间节点的余量比例")
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers, help="要测试的工作进程数")
+    parser.add_argument("--skip-per-node", action="store_true", help="跳过逐个节点规划的对比测试")
+    args = parser.parse_args()
+
+    tree = build_tree(args.regions, args.sites, args.vlans)
+    print(f"节点数: {count_nodes(tree)}，CPU核心数: {cpu_count}")
+
+    if not args.skip_per_node:
+        elapsed = measure_per_node(tree, args.headroom)
+        print(f"逐个节点调用suggest_subnet_planning: {elapsed:.2f} 秒")
+
+    baseline = None
+    print(f"{'进程数':>6} {'耗时(秒)':>10} {'加速比':>8}")
+    for workers in args.workers:
+        start = time.perf_counter()
+        result = plan_hierarchy(PARENT, tree, args.headroom, workers)
+        elapsed = time.perf_counter() - start
+        if "error" in result:
+            raise RuntimeError(result["error"])
+        baseline = baseline or elapsed
+        print(f"{workers:>6} {elapsed:>10.2f} {baseline / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+子网切分批量并行计算的扩展性测试
+
+生成大量随机的(父网段, 切分网段)任务，分别测量：
+- 逐个调用split_subnet（生成全部网段详细信息）的串行耗时
+- batch_split.iter_split_batch在1到N个工作进程下的耗时、吞吐量和相对1个进程的加速比
+
+用法:
+    python benchmarks/bench_split_batch.py [--jobs 200000] [--workers 1 2 4 8] [--chunk-size 2000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ip_subnet_calculator import split_subnet, int_to_ip
+from batch_split import iter_split_batch
+
+
+def build_jobs(count, seed=1):
+    """生成count个随机任务：父网段前缀8~24，切分网段比父网段长1~8位"""
+    rng = random.Random(seed)
+    jobs = []
+    for _ in range(count):
+        parent_prefix = rng.randint(8, 24)
+        split_prefix = min(32, parent_prefix + rng.randint(1, 8))
+        address = rng.getrandbits(32)
+        parent = f"{int_to_ip(address >> (32 - parent_prefix) << (32 - parent_prefix))}/{parent_prefix}"
+        split = f"{int_to_ip(address >> (32 - split_prefix) << (32 - split_prefix))}/{split_prefix}"
+        jobs.append((parent, split))
+    return jobs
+
+
+def measure_serial(jobs):
+    start = time.perf_counter()
+    for parent, split in jobs:
+        split_subnet(parent, split)
+    return time.perf_counter() - start
+
+
+def measure_batch(jobs, workers, chunk_size, ordered):
+    start = time.perf_counter()
+    count = 0
+    for _ in iter_split_batch(jobs, workers, chunk_size, ordered):
+        count += 1
+    assert count == len(jobs)
+    return time.perf_counter() - start
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, cpu_count} & set(range(1, cpu_count + 1)))
+    parser = argparse.ArgumentParser(description="子网切分批量并行计算的扩展性测试")
+    parser.add_argument("--jobs", type=int, default=200000, help="任务数量")
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers, help="要测试的工作进程数")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="每个分片的任务数")
+    parser.add_argument("--unordered", action="store_true", help="按完成顺序返回结果")
+    parser.add_argument("--serial-jobs", type=int, default=20000, help="split_subnet串行测试的任务数，0表示跳过")
+    args = parser.parse_args()
+
+    jobs = build_jobs(args.jobs)
+    print(f"任务数: {len(jobs)}，CPU核心数: {cpu_count}，分片大小: {args.chunk_size}")
+
+    if args.serial_jobs:
+        sample = jobs[: args.serial_jobs]
+        elapsed = measure_serial(sample)
+        print(f"split_subnet 串行: {len(sample) / elapsed:,.0f} 个/秒（{len(sample)}个任务 {elapsed:.2f} 秒）")
+
+    baseline = None
+    print(f"{'进程数':>6} {'耗时(秒)':>10} {'吞吐量(个/秒)':>14} {'加速比':>8}")
+    for workers in args.workers:
+        elapsed = measure_batch(jobs, workers, args.chunk_size, not args.unordered)
+        baseline = baseline or elapsed
+        print(f"{workers:>6} {elapsed:>10.2f} {len(jobs) / elapsed:>14,.0f} {baseline / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+桌面版启动耗时基准测试
+
+对比以下三种启动方式的冷启动和热启动耗时：
+1. python windows_app.py（源码运行）
+2. dist/IP子网分割工具.exe（单文件版本，每次启动都会解压到临时目录）
+3. dist/IP子网分割工具/IP子网分割工具.exe（目录版本）
+
+每次启动都通过环境变量NETSUB_STARTUP_REPORT/NETSUB_STARTUP_EXIT让程序在可交互后
+写入启动耗时报告并立即退出；脚本同时记录从创建进程到进程退出的总耗时
+（单文件版本的解压耗时只体现在总耗时中）。每种启动方式的第一次运行记为冷启动，
+其余运行取中位数记为热启动；如需真正的冷启动数据，请在重启系统后运行本脚本。
+
+源码运行方式还会通过 -X importtime 统计导入耗时最多的模块。
+
+用法:
+    python simple_pack.py --mode both
+    python benchmarks/bench_startup.py [--runs 5] [--json startup_bench.json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from simple_pack import get_exe_path, get_bundle_size
+
+
+def get_targets(dist_dir):
+    """返回可测量的启动方式列表：[(名称, 命令, 打包大小), ...]"""
+    targets = [("python", [sys.executable, os.path.join(ROOT_DIR, "windows_app.py")], None)]
+    for pack_type in ("onefile", "onedir"):
+        exe_path = get_exe_path(pack_type, dist_dir)
+        if os.path.exists(exe_path):
+            targets.append((pack_type, [exe_path], get_bundle_size(pack_type, dist_dir)))
+        else:
+            print(f"跳过 {pack_type}: 未找到 {exe_path}（请先运行 python simple_pack.py --mode both）")
+    return targets
+
+
+def run_once(cmd, timeout):
+    """启动一次程序，返回(总耗时毫秒, 程序内启动报告)；超时时返回(None, {})，不影响其余运行"""
+    fd, report_path = tempfile.mkstemp(suffix=".jsonl", prefix="netsub_startup_")
+    os.close(fd)
+    env = dict(os.environ, NETSUB_STARTUP_REPORT=report_path, NETSUB_STARTUP_EXIT="1")
+    try:
+        start = time.perf_counter()
+        try:
+            subprocess.run(cmd, cwd=ROOT_DIR, env=env, timeout=timeout, check=False)
+        except subprocess.TimeoutExpired:
+            print(f"  启动超时（超过{timeout}秒），本次运行不计入统计")
+            return None, {}
+        wall_ms = (time.perf_counter() - start) * 1000
+
+        report = {}
+        with open(report_path, "r", encoding="utf-8") as f:
+            lines = [line for line in f if line.strip()]
+        if lines:
+            report = json.loads(lines[-1])
+        return wall_ms, report
+    finally:
+        os.remove(report_path)
+
+
+def summarize(runs):
+    """汇总多次运行结果：第一次为冷启动，其余取中位数为热启动"""
+    keys = ("wall_ms", "import_ms", "app_init_ms", "first_paint_ms", "interactive_ms")
+
+    def pick(run_list):
+        result = {}
+        for key in keys:
+            values = [run[key] for run in run_list if run.get(key) is not None]
+            result[key] = round(statistics.median(values), 1) if values else None
+        return result
+
+    return {
+        "cold": pick(runs[:1]),
+        "warm": pick(runs[1:]) if len(runs) > 1 else None,
+        "timeouts": sum(1 for run in runs if run["wall_ms"] is None),
+    }
+
+
+def import_time_breakdown(top):
+    """使用 -X importtime 统计导入windows_app时耗时最多的顶级模块（累计微秒）"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import windows_app"],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    totals = {}
+    for line in proc.stderr.splitlines():
+        # 格式: import time:   self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        try:
+            _, self_us, cumulative_us, name = [part.strip() for part in line.replace("import time:", "|", 1).split("|")]
+        except ValueError:
+            continue
+        # 只统计不带点号的顶级模块，同名模块取最大累计耗时
+        top_name = name.split(".")[0]
+        if name == top_name:
+            totals[top_name] = max(totals.get(top_name, 0), int(cumulative_us))
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="桌面版启动耗时基准测试")
+    parser.add_argument("--runs", type=int, default=5, help="每种启动方式的运行次数（默认5次）")
+    parser.add_argument("--dist", default=os.path.join(ROOT_DIR, "dist"), help="打包输出目录")
+    parser.add_argument("--timeout", type=float, default=60, help="单次启动超时时间（秒）")
+    parser.add_argument("--top", type=int, default=15, help="导入耗时排行显示的模块数")
+    parser.add_argument("--json", help="将结果保存为JSON文件，便于跨版本对比")
+    args = parser.parse_args()
+
+    results = {}
+    for name, cmd, bundle_size in get_targets(args.dist):
+        print(f"测量 {name}: {' '.join(cmd)}")
+        runs = []
+        for _ in range(args.runs):
+            wall_ms, report = run_once(cmd, args.timeout)
+            run = {key: report.get(key) for key in ("import_ms", "app_init_ms", "first_paint_ms", "interactive_ms")}
+            run["wall_ms"] = wall_ms
+            runs.append(run)
+        results[name] = summarize(runs)
+        if bundle_size is not None:
+            results[name]["bundle_mb"] = round(bundle_size / (1024 * 1024), 2)
+
+    print()
+    print(f"{'启动方式':<10} {'阶段':<6} {'总耗时':>10} {'导入':>10} {'初始化':>10} {'首次绘制':>10} {'可交互':>10}")
+    print("-" * 72)
+    for name, summary in results.items():
+        for phase in ("cold", "warm"):
+            data = summary.get(phase)
+            if not data:
+                continue
+            cells = [
+                f"{data[key]:>10.1f}" if data[key] is not None else f"{'-':>10}"
+                for key in ("wall_ms", "import_ms", "app_init_ms", "first_paint_ms", "interactive_ms")
+            ]
+            print(f"{name:<10} {phase:<6} {' '.join(cells)}")
+        if summary["timeouts"]:
+            print(f"{name:<10} 超时: {summary['timeouts']} 次")
+        if "bundle_mb" in summary:
+            print(f"{name:<10} 打包大小: {summary['bundle_mb']} MB")
+    print("（单位：毫秒；程序内各阶段时间从windows_app模块开始执行时计起，不包含解释器启动和单文件解压）")
+
+    print(f"\n导入耗时排行（python -X importtime，累计耗时前{args.top}名）:")
+    breakdown = import_time_breakdown(args.top)
+    for module, cumulative_us in breakdown:
+        print(f"  {module:<30} {cumulative_us / 1000:>8.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {"results": results, "import_time": dict(breakdown)}, f, ensure_ascii=False, indent=2
+            )
+        print(f"\n结果已保存到 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
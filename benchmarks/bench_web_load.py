@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Web版负载测试
+
+两种模式：
+1. 进程内模式（默认）：使用Flask测试客户端，对比每次请求调用render_template_string
+   （旧方式，以整个模板字符串为键查找缓存，CSS/JS内联在页面中）与导入时预编译模板
+   （新方式，CSS/JS作为可缓存的静态资源）的每秒请求数和每次页面访问传输的字节数
+2. 在线模式（--url）：使用多线程对正在运行的服务发起请求，报告每秒请求数和延迟分位数
+3. 启动服务模式（--serve）：依次以指定的工作进程数启动serve_web.py，对每种配置运行在线模式测试，
+   启动的服务关闭了结果缓存，测得的是实际计算耗时
+
+用法:
+    python benchmarks/bench_web_load.py [--requests 500]
+    python benchmarks/bench_web_load.py --url http://127.0.0.1:5000/ --concurrency 8 --requests 2000
+    python benchmarks/bench_web_load.py --serve 1 4 --scenario 子网切分 子网规划 --requests 1000
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import threading
+import subprocess
+import urllib.parse
+import urllib.request
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+# 测试场景：(名称, 请求方法, 表单数据)
+SCENARIOS = [
+    ("首页", "GET", None),
+    ("子网切分", "POST", {"action": "split", "parent": "10.0.0.0/8", "split": "10.21.60.0/23"}),
+    (
+        "子网规划",
+        "POST",
+        {
+            "action": "plan",
+            "plan-parent": "192.168.0.0/16",
+            "subnet-name[]": ["办公区", "服务器区", "研发部", "测试环境"],
+            "subnet-hosts[]": ["200", "50", "100", "30"],
+        },
+    ),
+]
+
+
+def percentile(sorted_values, pct):
+    """计算已排序列表的百分位数"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_in_process(requests_per_scenario):
+    """进程内对比旧的render_template_string方式和预编译模板方式"""
+    import web_app
+    from flask import render_template_string
+
+    app = web_app.app
+    client = app.test_client()
+
+    # 静态资源大小：旧方式下每次页面访问都内联传输
+    static_bytes = 0
+    for filename in web_app.STATIC_FILES:
+        static_bytes += os.path.getsize(os.path.join(app.static_folder, filename))
+
+    original_render = web_app.render_template
+
+    def legacy_render(template, **context):
+        # 旧方式：每次请求以模板字符串为键查找编译缓存
+        return render_template_string(web_app.HTML_TEMPLATE, **context)
+
+    print(f"{'场景':<8} {'方式':<8} {'请求/秒':>10} {'平均(ms)':>10} {'每次访问字节':>12}")
+    print("-" * 56)
+    for name, method, data in SCENARIOS:
+        for label, render in (("旧方式", legacy_render), ("预编译", original_render)):
+            web_app.render_template = render
+            try:
+                size = 0
+                start = time.perf_counter()
+                for _ in range(requests_per_scenario):
+                    if method == "GET":
+                        response = client.get("/")
+                    else:
+                        response = client.post("/", data=data)
+                    size = len(response.data)
+                elapsed = time.perf_counter() - start
+            finally:
+                web_app.render_template = original_render
+            # 旧方式的页面内联了全部CSS/JS；新方式浏览器缓存静态资源后只传输HTML
+            page_bytes = size + static_bytes if label == "旧方式" else size
+            rps = requests_per_scenario / elapsed
+            print(
+                f"{name:<8} {label:<8} {rps:>10.1f} {elapsed / requests_per_scenario * 1000:>10.2f} {page_bytes:>12}"
+            )
+
+
+def run_against_server(url, total_requests, concurrency, scenario_names=None):
+    """对正在运行的服务发起并发请求，报告每秒请求数和延迟分位数"""
+    scenarios = [s for s in SCENARIOS if not scenario_names or s[0] in scenario_names]
+
+    print(f"{'场景':<8} {'请求/秒':>10} {'p50(ms)':>10} {'p99(ms)':>10} {'失败':>6}")
+    print("-" * 50)
+    for name, method, data in scenarios:
+        body = urllib.parse.urlencode(data, doseq=True).encode("utf-8") if data else None
+        latencies = []
+        failures = [0]
+        lock = threading.Lock()
+        counter = [0]
+
+        def worker():
+            while True:
+                with lock:
+                    if counter[0] >= total_requests:
+                        return
+                    counter[0] += 1
+                start = time.perf_counter()
+                try:
+                    req = urllib.request.Request(url, data=body, method=method)
+                    with urllib.request.urlopen(req, timeout=60) as response:
+                        response.read()
+                    elapsed = (time.perf_counter() - start) * 1000
+                    with lock:
+                        latencies.append(elapsed)
+                except Exception:
+                    with lock:
+                        failures[0] += 1
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - start
+
+        latencies.sort()
+        rps = len(latencies) / wall if wall else 0.0
+        print(
+            f"{name:<8} {rps:>10.1f} {percentile(latencies, 50):>10.2f} "
+            f"{percentile(latencies, 99):>10.2f} {failures[0]:>6}"
+        )
+
+
+def find_free_port():
+    """获取一个空闲端口"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    """等待服务开始监听端口"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def run_with_server(worker_counts, server, total_requests, concurrency, scenario_names=None):
+    """依次以不同的工作进程数启动serve_web.py并进行负载测试"""
+    for workers in worker_counts:
+        port = find_free_port()
+        cmd = [
+            sys.executable,
+            os.path.join(ROOT_DIR, "serve_web.py"),
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--server",
+            server,
+        ]
+        env = dict(os.environ, NETSUB_CACHE_BACKEND="off")
+        proc = subprocess.Popen(cmd, cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            if not wait_for_port(port):
+                print(f"服务启动失败: {' '.join(cmd)}")
+                continue
+            print(f"\n{server} 服务器，{workers} 个工作进程/线程:")
+            run_against_server(f"http://127.0.0.1:{port}/", total_requests, concurrency, scenario_names)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Web版负载测试")
+    parser.add_argument("--url", help="正在运行的服务地址，例如 http://127.0.0.1:5000/")
+    parser.add_argument("--requests", type=int, default=500, help="每个场景的请求数")
+    parser.add_argument("--concurrency", type=int, default=8, help="在线模式的并发线程数")
+    parser.add_argument("--scenario", nargs="*", help="在线模式只测试指定场景（首页/子网切分/子网规划）")
+    parser.add_argument("--serve", type=int, nargs="+", metavar="WORKERS", help="依次以指定的工作进程数启动服务并测试")
+    parser.add_argument("--server", default="auto", help="--serve模式使用的服务器类型（见serve_web.py）")
+    args = parser.parse_args()
+
+    if args.serve:
+        run_with_server(args.serve, args.server, args.requests, args.concurrency, args.scenario)
+    elif args.url:
+        run_against_server(args.url, args.requests, args.concurrency, args.scenario)
+    else:
+        run_in_process(args.requests)
+
+
+if __name__ == "__main__":
+    main()
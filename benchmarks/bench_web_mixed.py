@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Web版混合负载测试：大规模子网规划对小请求延迟的影响
+
+分别在关闭和开启重计算进程池（NETSUB_POOL_WORKERS=0 / 默认）的情况下启动serve_web.py，
+后台持续提交大规模子网规划请求，同时测量子网切分请求的p50/p99延迟。
+启动的服务关闭了结果缓存，每个请求都会实际计算。
+
+用法:
+    python benchmarks/bench_web_mixed.py [--heavy-clients 2] [--plan-subnets 2000] [--requests 300]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+import urllib.request
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from bench_web_load import find_free_port, wait_for_port, percentile
+
+
+def post_json(url, data, timeout=120):
+    """提交JSON请求，返回(耗时毫秒, HTTP状态码)"""
+    body = json.dumps(data).encode("utf-8")
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return (time.perf_counter() - start) * 1000, status
+
+
+def run_mixed(base_url, heavy_clients, plan_subnets, split_requests, concurrency):
+    """后台持续提交大规模规划，同时测量子网切分的延迟"""
+    plan_body = {
+        "parent": "10.0.0.0/8",
+        "subnets": [{"name": f"子网{i + 1}", "hosts": 1 + (i % 5) * 3} for i in range(plan_subnets)],
+        "detail": False,
+    }
+    split_body = {"parent": "10.0.0.0/8", "split": "10.21.60.0/23"}
+    stop = threading.Event()
+    plan_latencies = []
+    plan_statuses = {}
+    lock = threading.Lock()
+
+    def heavy_worker():
+        while not stop.is_set():
+            elapsed, status = post_json(base_url + "api/v1/plan", plan_body)
+            with lock:
+                plan_latencies.append(elapsed)
+                plan_statuses[status] = plan_statuses.get(status, 0) + 1
+
+    split_latencies = []
+    counter = [0]
+
+    def split_worker():
+        while True:
+            with lock:
+                if counter[0] >= split_requests:
+                    return
+                counter[0] += 1
+            elapsed, _ = post_json(base_url + "api/v1/split", split_body)
+            with lock:
+                split_latencies.append(elapsed)
+
+    heavy_threads = [threading.Thread(target=heavy_worker) for _ in range(heavy_clients)]
+    for thread in heavy_threads:
+        thread.start()
+    time.sleep(1)  # 等待大规模规划开始计算
+    split_threads = [threading.Thread(target=split_worker) for _ in range(concurrency)]
+    for thread in split_threads:
+        thread.start()
+    for thread in split_threads:
+        thread.join()
+    stop.set()
+    for thread in heavy_threads:
+        thread.join()
+
+    split_latencies.sort()
+    plan_latencies.sort()
+    return {
+        "split_p50": percentile(split_latencies, 50),
+        "split_p99": percentile(split_latencies, 99),
+        "plan_count": len(plan_latencies),
+        "plan_p50": percentile(plan_latencies, 50),
+        "plan_statuses": plan_statuses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Web版混合负载测试")
+    parser.add_argument("--heavy-clients", type=int, default=2, help="持续提交大规模规划的客户端数")
+    parser.add_argument("--plan-subnets", type=int, default=2000, help="每个大规模规划的子网需求数")
+    parser.add_argument("--requests", type=int, default=300, help="子网切分请求总数")
+    parser.add_argument("--concurrency", type=int, default=4, help="子网切分请求的并发数")
+    parser.add_argument("--workers", type=int, default=8, help="Web服务器线程数")
+    args = parser.parse_args()
+
+    print(f"{'进程池':<6} {'切分p50(ms)':>12} {'切分p99(ms)':>12} {'完成规划数':>10} {'规划p50(ms)':>12}  规划状态码")
+    print("-" * 80)
+    for label, pool_workers in (("关闭", "0"), ("开启", str(os.cpu_count() or 1))):
+        port = find_free_port()
+        env = dict(os.environ, NETSUB_CACHE_BACKEND="off", NETSUB_POOL_WORKERS=pool_workers)
+        cmd = [
+            sys.executable,
+            os.path.join(ROOT_DIR, "serve_web.py"),
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(args.workers),
+            "--server",
+            "threaded",
+        ]
+        proc = subprocess.Popen(cmd, cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            if not wait_for_port(port):
+                print(f"服务启动失败: {' '.join(cmd)}")
+                continue
+            result = run_mixed(
+                f"http://127.0.0.1:{port}/", args.heavy_clients, args.plan_subnets, args.requests, args.concurrency
+            )
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+        print(
+            f"{label:<6} {result['split_p50']:>12.2f} {result['split_p99']:>12.2f} "
+            f"{result['plan_count']:>10} {result['plan_p50']:>12.1f}  {result['plan_statuses']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Web版结果页面大小与渲染耗时测试
+
+使用Flask测试客户端提交子网切分和子网规划表单，统计响应字节数、服务器端平均耗时，
+以及扣除计算引擎耗时后的页面渲染耗时，用于对比结果数据在页面中的嵌入方式。
+
+用法:
+    python benchmarks/bench_web_payload.py [--repeat 5] [--plan-sizes 100 1000 5000]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def build_plan_form(count):
+    """构造包含count个子网需求的规划表单，主机数交替变化以产生大量剩余网段"""
+    hosts = [str(1 + (i % 5) * 3) for i in range(count)]
+    return {
+        "action": "plan",
+        "plan-parent": "10.0.0.0/12",
+        "subnet-name[]": [f"子网{i + 1}" for i in range(count)],
+        "subnet-hosts[]": hosts,
+    }
+
+
+def measure(client, data, repeat):
+    """提交表单repeat次，返回(响应字节数, 平均耗时毫秒)"""
+    size = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.post("/", data=data)
+        size = len(response.data)
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    return size, elapsed
+
+
+def run_engine(web_app, data, repeat):
+    """直接调用计算引擎repeat次，返回(结果, 平均耗时毫秒)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        if data["action"] == "split":
+            result = web_app.split_subnet(data["parent"], data["split"])
+        else:
+            required = [
+                {"name": n, "hosts": int(h)} for n, h in zip(data["subnet-name[]"], data["subnet-hosts[]"])
+            ]
+            result = web_app.suggest_subnet_planning(data["plan-parent"], required)
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Web版结果页面大小与渲染耗时测试")
+    parser.add_argument("--repeat", type=int, default=5, help="每个场景的请求次数")
+    parser.add_argument("--plan-sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    args = parser.parse_args()
+
+    import web_app
+
+    client = web_app.app.test_client()
+    scenarios = [("子网切分 /8 - /32", {"action": "split", "parent": "10.0.0.0/8", "split": "10.21.60.7/32"})]
+    for count in args.plan_sizes:
+        scenarios.append((f"子网规划 {count} 个需求", build_plan_form(count)))
+
+    print(f"{'场景':<20} {'结果行数':>8} {'响应字节':>12} {'平均耗时(ms)':>14} {'渲染耗时(ms)':>14}")
+    print("-" * 76)
+    for name, data in scenarios:
+        result, engine_ms = run_engine(web_app, data, args.repeat)
+        rows = len(result["remaining_subnets"]) + len(result.get("allocated_subnets", []))
+        size, elapsed = measure(client, data, args.repeat)
+        print(f"{name:<20} {rows:>8} {size:>12} {elapsed:>14.2f} {elapsed - engine_ms:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
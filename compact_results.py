@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+列式保存的子网切分和子网规划结果
+
+split_subnet和suggest_subnet_planning的结果是由字符串组成的字典列表，每个网段约1KB，10万个网段就要上百MB。
+这里按列保存结果：网络地址为array("I")（IPv6每行4个32位字，高位在前），前缀长度为array("B")，
+规划结果另有名称、数量和主机数列，每个网段只占十几个字节：
+- 表格支持len、下标、切片（仍是同类型的表格）和迭代
+- 下标和迭代得到SubnetRow，是只读的字典视图，第一次访问时才生成与原来相同的字典（network_info或分配记录）
+- buffers()返回各列的memoryview，可以直接写入文件或套接字，不复制数据；from_buffers()按列恢复
+  （IPv6中数量超过64位的分配记录表不能按缓冲区导出，buffers()抛出ValueError）
+- to_dict()生成与split_subnet、suggest_subnet_planning完全相同的结果，兼容已有的导出函数
+
+用法:
+    from compact_results import suggest_subnet_planning_compact
+
+    plan = suggest_subnet_planning_compact("10.0.0.0/8", required_subnets)
+    len(plan.allocated), plan.allocated[0]["cidr"], plan.allocated.cidr(-1)
+    first_page = plan.remaining[:100]
+    for name, view in plan.allocated.buffers().items():
+        stream.write(view)
+"""
+
+import array
+from collections.abc import Mapping
+
+from ip_subnet_calculator import (
+    parse_network,
+    int_to_ip,
+    network_info,
+    get_subnet_info,
+    allocation_record,
+    split_subnet_ints,
+    plan_subnet_ints,
+)
+
+_WORD_MASK = 0xFFFFFFFF
+
+
+class SubnetRow(Mapping):
+    """表格中一行的只读字典视图，第一次访问时才生成字典"""
+
+    __slots__ = ("_table", "_index", "_data")
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+        self._data = None
+
+    def _dict(self):
+        if self._data is None:
+            self._data = self._table._row_dict(self._index)
+        return self._data
+
+    def __getitem__(self, key):
+        return self._dict()[key]
+
+    def __iter__(self):
+        return iter(self._dict())
+
+    def __len__(self):
+        return len(self._dict())
+
+    def __repr__(self):
+        return f"SubnetRow({self._table.cidr(self._index)!r})"
+
+
+class SubnetTable:
+    """
+    列式网段表，每行为(网络地址, 前缀长度)，可选名称列
+
+    行视图为network_info格式的字典。表格创建后只应追加，不要修改已有的行
+    """
+
+    def __init__(self, version=4, names=False):
+        self.version = version
+        self._stride = 1 if version == 4 else 4
+        self.networks = array.array("I")
+        self.prefixes = array.array("B")
+        self.names = [] if names else None
+
+    @classmethod
+    def from_cidr_ints(cls, blocks, version=4, names=None):
+        """从(网络地址整数, 前缀长度)序列创建，names为可选的名称列表"""
+        table = cls(version, names is not None)
+        blocks = list(blocks)
+        if version == 4:
+            table.networks = array.array("I", [network for network, _ in blocks])
+        else:
+            for network, _ in blocks:
+                table._append_network(network)
+        table.prefixes = array.array("B", [prefix_len for _, prefix_len in blocks])
+        if names is not None:
+            table.names = list(names)
+        return table
+
+    def _append_network(self, network):
+        if self._stride == 1:
+            self.networks.append(network)
+        else:
+            self.networks.extend(
+                (network >> 96, (network >> 64) & _WORD_MASK, (network >> 32) & _WORD_MASK, network & _WORD_MASK)
+            )
+
+    def append(self, network, prefix_len, name=None):
+        """追加一行"""
+        self._append_network(network)
+        self.prefixes.append(prefix_len)
+        if self.names is not None:
+            self.names.append(name)
+
+    def _position(self, index):
+        # 支持负数下标，越界时抛出IndexError
+        try:
+            return range(len(self.prefixes))[index]
+        except IndexError:
+            raise IndexError(f"下标 {index} 超出范围（共{len(self.prefixes)}行）") from None
+
+    def network_int(self, index):
+        """第index行的网络地址整数"""
+        index = self._position(index)
+        if self._stride == 1:
+            return self.networks[index]
+        high, upper, lower, low = self.networks[index * 4:index * 4 + 4]
+        return high << 96 | upper << 64 | lower << 32 | low
+
+    def cidr(self, index):
+        """第index行的CIDR字符串"""
+        index = self._position(index)
+        return f"{int_to_ip(self.network_int(index), self.version)}/{self.prefixes[index]}"
+
+    def cidrs(self):
+        """全部行的CIDR字符串列表"""
+        if self._stride == 1:
+            return [f"{int_to_ip(network)}/{prefix_len}" for network, prefix_len in zip(self.networks, self.prefixes)]
+        return [f"{int_to_ip(self.network_int(i), 6)}/{self.prefixes[i]}" for i in range(len(self))]
+
+    def _row_dict(self, index):
+        return network_info(self.network_int(index), self.prefixes[index], self.version)
+
+    def _take(self, rows):
+        """按切片复制出一个同类型的表格，子类在这里一并复制额外的列"""
+        table = self.__class__.__new__(self.__class__)
+        table.version = self.version
+        table._stride = self._stride
+        if self._stride == 1:
+            table.networks = self.networks[rows]
+        else:
+            positions = range(len(self))[rows]
+            if positions.step == 1:
+                table.networks = self.networks[positions.start * 4:positions.stop * 4]
+            else:
+                table.networks = array.array("I")
+                for i in positions:
+                    table.networks.extend(self.networks[i * 4:i * 4 + 4])
+        table.prefixes = self.prefixes[rows]
+        table.names = None if self.names is None else self.names[rows]
+        return table
+
+    def __len__(self):
+        return len(self.prefixes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._take(index)
+        return SubnetRow(self, self._position(index))
+
+    def __iter__(self):
+        return (SubnetRow(self, i) for i in range(len(self)))
+
+    @property
+    def nbytes(self):
+        """数值列占用的字节数（不含名称列和退回列表的列）"""
+        return sum(
+            len(column) * column.itemsize
+            for column in self._numeric_columns().values()
+            if isinstance(column, array.array)
+        )
+
+    def _numeric_columns(self):
+        return {"network": self.networks, "prefix": self.prefixes}
+
+    def buffers(self):
+        """
+        返回{列名: memoryview}，不复制数据；字节序为本机字节序（sys.byteorder），
+        名称列不是定长数据，需要另外保存（见self.names）
+
+        有列因超过64位而退回Python整数列表时（见AllocationTable.append）无法按缓冲区导出，抛出ValueError
+        """
+        columns = self._numeric_columns()
+        for name, column in columns.items():
+            if not isinstance(column, array.array):
+                raise ValueError(f"{name} 列有超过64位的值，不能导出为缓冲区")
+        return {name: memoryview(column) for name, column in columns.items()}
+
+    @classmethod
+    def from_buffers(cls, version, buffers, names=None):
+        """从buffers()导出的各列数据（任意bytes-like对象）恢复表格，各列行数不一致时抛出ValueError"""
+        table = cls(version, names is not None)
+        for name, column in table._numeric_columns().items():
+            column.frombytes(buffers[name])
+        if names is not None:
+            table.names = list(names)
+        rows = len(table.prefixes)
+        if len(table.networks) != rows * table._stride or any(
+            len(column) != rows for column in table._numeric_columns().values() if column is not table.networks
+        ) or (table.names is not None and len(table.names) != rows):
+            raise ValueError("各列的行数不一致")
+        return table
+
+    def __repr__(self):
+        shown = ", ".join(repr(self.cidr(i)) for i in range(min(len(self), 4)))
+        if len(self) > 4:
+            shown += f", ... 共{len(self)}行"
+        return f"{self.__class__.__name__}([{shown}])"
+
+
+class AllocationTable(SubnetTable):
+    """
+    子网规划的分配记录表，在SubnetTable的基础上增加名称、数量和需求主机数列
+
+    行视图与allocation_record生成的分配记录相同。需求主机数为0表示需求只指定了前缀长度
+    """
+
+    def __init__(self, version=4, names=True):
+        # 分配记录总是有名称列，names参数只为与SubnetTable的构造方式一致
+        super().__init__(version, names=True)
+        self.counts = array.array("Q")
+        self.hosts = array.array("Q")
+
+    def append(self, network, prefix_len, name=None, count=1, hosts=0):
+        super().append(network, prefix_len, name)
+        for column_name, value in (("counts", count), ("hosts", hosts)):
+            column = getattr(self, column_name)
+            try:
+                column.append(value)
+            except OverflowError:
+                # 超过64位的数量（IPv6中极大的count）：这一列退回Python整数列表
+                column = list(column) + [value]
+                setattr(self, column_name, column)
+
+    def _row_dict(self, index):
+        hosts = self.hosts[index]
+        required = {"name": self.names[index], "hosts": hosts} if hosts else {"name": self.names[index]}
+        return allocation_record(
+            required, self.network_int(index), self.prefixes[index], self.counts[index], self.version
+        )
+
+    def _take(self, rows):
+        table = super()._take(rows)
+        table.counts = self.counts[rows]
+        table.hosts = self.hosts[rows]
+        return table
+
+    def _numeric_columns(self):
+        columns = super()._numeric_columns()
+        columns.update(count=self.counts, hosts=self.hosts)
+        return columns
+
+    @classmethod
+    def from_buffers(cls, version, buffers, names=None):
+        """从buffers()导出的各列数据恢复分配记录表，names（与行数相同的名称列表）必须提供"""
+        if names is None:
+            raise ValueError("分配记录表需要names名称列")
+        return super().from_buffers(version, buffers, names)
+
+
+class SplitResult:
+    """列式保存的子网切分结果，remaining为剩余网段的SubnetTable"""
+
+    def __init__(self, parent_cidr, split_cidr, version, remaining):
+        self.parent = parent_cidr
+        self.split = split_cidr
+        self.version = version
+        self.remaining = remaining
+
+    def to_dict(self):
+        """生成与split_subnet相同的字典"""
+        return {
+            "parent": self.parent,
+            "split": self.split,
+            "remaining_subnets": self.remaining.cidrs(),
+            "parent_info": get_subnet_info(self.parent),
+            "split_info": get_subnet_info(self.split),
+            "remaining_subnets_info": [dict(row) for row in self.remaining],
+        }
+
+
+class PlanResult:
+    """列式保存的子网规划结果，allocated为AllocationTable，remaining为剩余网段的SubnetTable"""
+
+    def __init__(self, parent_cidr, required_subnets, version, allocated, remaining, reserved_subnets=None):
+        self.parent_cidr = parent_cidr
+        self.required_subnets = required_subnets
+        self.version = version
+        self.allocated = allocated
+        self.remaining = remaining
+        self.reserved_subnets = reserved_subnets
+
+    def to_dict(self):
+        """生成与suggest_subnet_planning相同的字典"""
+        result = {
+            "parent_cidr": self.parent_cidr,
+            "required_subnets": self.required_subnets,
+            "allocated_subnets": [dict(row) for row in self.allocated],
+            "remaining_subnets": self.remaining.cidrs(),
+            "remaining_subnets_info": [dict(row) for row in self.remaining],
+        }
+        if self.reserved_subnets is not None:
+            result["reserved_subnets"] = self.reserved_subnets
+        return result
+
+
+def split_subnet_compact(parent_cidr, split_cidr):
+    """与split_subnet相同，返回SplitResult；出错时返回包含error的字典"""
+    remaining = split_subnet_ints(parent_cidr, split_cidr)
+    if isinstance(remaining, str):
+        return {"error": remaining}
+    version = parse_network(parent_cidr).version
+    return SplitResult(parent_cidr, split_cidr, version, SubnetTable.from_cidr_ints(remaining, version))
+
+
+def suggest_subnet_planning_compact(parent_cidr, required_subnets, reserved_subnets=None):
+    """与suggest_subnet_planning相同，返回PlanResult；出错时返回包含error的字典"""
+    plan = plan_subnet_ints(parent_cidr, required_subnets, reserved_subnets)
+    if isinstance(plan, str):
+        return {"error": plan}
+    parent_net, _, allocations, remaining, reserved = plan
+    version = parent_net.version
+    allocated = AllocationTable(version)
+    for required, network, prefix_len, count in allocations:
+        allocated.append(network, prefix_len, required["name"], count, required.get("hosts", 0))
+    return PlanResult(
+        parent_cidr,
+        required_subnets,
+        version,
+        allocated,
+        SubnetTable.from_cidr_ints(remaining, version),
+        reserved if reserved_subnets else None,
+    )
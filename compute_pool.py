@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+重计算进程池
+
+大规模子网规划会长时间占用Web工作线程，并因GIL拖慢同一进程中的其他请求。
+这里把耗时的计算放到独立的工作进程中执行：
+- 进程池大小有上限，排队和运行中的任务总数也有上限，超出时立即返回"服务器繁忙"
+- 每个请求有超时时间，超时后立即返回错误，不再占用Web工作线程
+- 工作进程使用spawn方式启动，避免在多线程的Web服务器中fork
+
+出错时与计算模块一样返回 {"error": ...} 字典，并附带建议的HTTP状态码 "status"。
+
+每个Web工作进程各有一个进程池。多进程部署时默认把CPU核心数平均分给各个Web工作进程，
+整台机器上的计算进程总数约为CPU核心数，而不是Web工作进程数×CPU核心数。
+
+通过环境变量配置：
+    NETSUB_POOL_WORKERS      每个Web工作进程的进程池大小，默认为 CPU核心数 // NETSUB_WEB_WORKERS（至少1）；
+                             为0时不使用进程池，直接在请求线程中计算
+    NETSUB_WEB_WORKERS       同一台机器上的Web工作进程数，serve_web.py按--workers自动设置；
+                             未设置时使用gunicorn的WEB_CONCURRENCY，都未设置时为1
+    NETSUB_POOL_MAX_PENDING  排队和运行中的任务总数上限，默认为进程池大小的4倍
+    NETSUB_PLAN_TIMEOUT      单个请求的计算超时时间（秒），默认30
+"""
+
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+
+class ComputePool:
+    """有界进程池，提交任务并在超时时间内等待结果"""
+
+    def __init__(self, max_workers=None, max_pending=None, timeout=30):
+        self.max_workers = max_workers or default_pool_workers()
+        self.max_pending = max_pending or self.max_workers * 4
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.failures = 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _reset_executor(self):
+        """工作进程异常退出后丢弃进程池，下次提交时重新创建"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def run(self, fn, *args, timeout=None):
+        """在进程池中执行fn(*args)并返回结果
+
+        fn必须是可以被pickle的模块级函数。超时返回后任务仍在工作进程中运行至结束，
+        期间继续占用排队名额，因此持续超时的请求不会让进程池无限堆积
+        """
+        timeout = timeout or self.timeout
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            return {"error": "服务器繁忙，请稍后重试", "status": 503}
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except (BrokenProcessPool, RuntimeError):
+            self._slots.release()
+            self._reset_executor()
+            self._count("failures")
+            return {"error": "计算进程不可用，请稍后重试", "status": 503}
+        self._count("submitted")
+        # 任务真正结束（完成、失败或被取消）后才释放名额
+        future.add_done_callback(lambda f: self._slots.release())
+
+        try:
+            result = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()  # 还在排队的任务直接取消
+            self._count("timeouts")
+            return {"error": f"计算超时（超过{timeout}秒），请减少子网数量后重试", "status": 504}
+        except BrokenProcessPool:
+            self._reset_executor()
+            self._count("failures")
+            return {"error": "计算进程异常退出，请减少子网数量后重试", "status": 500}
+        self._count("completed")
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "timeout": self.timeout,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "timeouts": self.timeouts,
+                "rejected": self.rejected,
+                "failures": self.failures,
+            }
+
+
+def default_pool_workers():
+    """默认进程池大小：CPU核心数平均分给同一台机器上的各个Web工作进程，至少为1"""
+    web_workers = int(os.environ.get("NETSUB_WEB_WORKERS") or os.environ.get("WEB_CONCURRENCY") or "1")
+    return max(1, (os.cpu_count() or 1) // max(1, web_workers))
+
+
+def create_compute_pool():
+    """根据环境变量创建进程池，NETSUB_POOL_WORKERS为0时返回None"""
+    workers = int(os.environ.get("NETSUB_POOL_WORKERS") or default_pool_workers())
+    if workers <= 0:
+        return None
+    max_pending = int(os.environ.get("NETSUB_POOL_MAX_PENDING", "0")) or None
+    timeout = float(os.environ.get("NETSUB_PLAN_TIMEOUT", "30"))
+    return ComputePool(workers, max_pending, timeout)
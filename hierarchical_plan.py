@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+多级子网规划（区域 → 站点 → VLAN）
+
+地址规划通常是一棵树：/8按区域划分，区域再按站点划分，站点内再分配VLAN。
+逐个节点调用suggest_subnet_planning需要自底向上手工计算每个节点的大小，并反复解析网段。
+这里一次完成整棵树的规划：
+- 自底向上计算每个节点的大小：叶子节点按主机数（或prefix）计算，中间节点为子节点地址块之和
+  再加上预留余量（headroom），向上取整到2的幂
+- 自顶向下分配地址：与suggest_subnet_planning相同，子节点按地址块从大到小在父节点内连续分配，
+  全程使用整数运算，只解析一次父网段
+- 各节点内未使用的空间（余量）作为该节点的剩余网段返回
+- workers大于1时，互不相关的子树分配给多个进程并行生成结果
+
+用法:
+    from hierarchical_plan import plan_hierarchy
+
+    tree = [
+        {"name": "华东", "headroom": 0.5, "children": [
+            {"name": "上海", "children": [{"name": "办公", "hosts": 200}, {"name": "服务器", "hosts": 50}]},
+        ]},
+    ]
+    result = plan_hierarchy("10.0.0.0/8", tree, headroom=0.25)
+"""
+
+import math
+from fractions import Fraction
+from concurrent.futures import ProcessPoolExecutor
+
+from ip_subnet_calculator import (
+    parse_network,
+    required_prefix_len,
+    allocation_record,
+    range_to_cidr_ints,
+    int_to_ip,
+)
+
+# 节点路径中各级名称的分隔符
+PATH_SEPARATOR = "/"
+
+# 树的最大层数；size_tree按层递归，限制层数后不会因嵌套过深触发RecursionError
+MAX_TREE_DEPTH = 32
+
+
+def size_tree(nodes, parent_net, headroom, parent_path="", level=1):
+    """
+    自底向上计算每个节点的前缀长度和占用的地址数，返回规范化后的节点列表
+
+    每个节点为{"name", "path", "level", "prefix_len", "count", "size", "hosts", "total_hosts", "children"}，
+    size为节点（含count个相同子网）占用的地址数；hosts与子网需求的hosts相同，用于排序和分配记录，
+    中间节点为其下所有叶子节点的主机数之和；total_hosts为节点（含count）的主机数之和。
+    输入无效或层数超过MAX_TREE_DEPTH时抛出ValueError
+    """
+    if level > MAX_TREE_DEPTH:
+        raise ValueError(f"{parent_path} 的层级超过上限（最多{MAX_TREE_DEPTH}级）")
+    if not isinstance(nodes, list):
+        raise ValueError(f"{parent_path or '父网段'} 的children必须是节点列表")
+    bits = parent_net.max_prefixlen
+    sized = []
+    for i, node in enumerate(nodes, 1):
+        if not isinstance(node, dict):
+            raise ValueError(f"{parent_path or '父网段'} 的第{i}个子节点格式错误")
+        name = str(node.get("name") or f"节点{i}")
+        path = f"{parent_path}{PATH_SEPARATOR}{name}" if parent_path else name
+        children = node.get("children")
+        try:
+            count = int(node.get("count", 1))
+            node_headroom = Fraction(str(node.get("headroom", headroom)))
+            prefix = None if node.get("prefix") is None else int(node["prefix"])
+            hosts = None if node.get("hosts") is None else int(node["hosts"])
+        except (TypeError, ValueError):
+            raise ValueError(f"{path} 的hosts、prefix、count和headroom必须是数字") from None
+        if count < 1:
+            raise ValueError(f"{path} 的子网数量必须大于0")
+        if node_headroom < 0:
+            raise ValueError(f"{path} 的余量不能小于0")
+
+        if children:
+            if count != 1:
+                raise ValueError(f"{path} 是中间节点，不支持count")
+            sized_children = size_tree(children, parent_net, headroom, path, level + 1)
+            need = sum(child["size"] for child in sized_children)
+            need += math.ceil(need * node_headroom)
+            prefix_len = bits - (need - 1).bit_length()
+            if prefix is not None:
+                if prefix > prefix_len:
+                    raise ValueError(f"{path} 的子节点需要 /{prefix_len}，超过了指定的 /{prefix}")
+                prefix_len = prefix
+            hosts = total_hosts = sum(child["total_hosts"] for child in sized_children)
+        else:
+            if hosts is None and prefix is None:
+                raise ValueError(f"{path} 缺少主机数（hosts）或前缀长度（prefix）")
+            if hosts is not None and hosts <= 0:
+                raise ValueError(f"{path} 的主机数必须大于0")
+            sized_children = []
+            prefix_len = required_prefix_len({"hosts": hosts, "prefix": prefix}, parent_net)
+            total_hosts = (1 << (bits - prefix_len) if hosts is None else hosts) * count
+        if not 0 <= prefix_len <= bits:
+            raise ValueError(f"{path} 的前缀长度无效: /{prefix_len}")
+
+        sized.append(
+            {
+                "name": name,
+                "path": path,
+                "level": level,
+                "prefix_len": prefix_len,
+                "count": count,
+                "size": count << (bits - prefix_len),
+                "hosts": hosts,
+                "total_hosts": total_hosts,
+                "children": sized_children,
+            }
+        )
+    # 与suggest_subnet_planning相同：地址块从大到小，地址块相同时按主机数从大到小，其余保持输入顺序
+    sized.sort(key=lambda x: (x["prefix_len"], -(x["hosts"] or 0)))
+    return sized
+
+
+def place_children(children, start):
+    """将已排序的子节点从start开始连续排列，返回[(子节点, 起始地址), ...]和排列后的结束位置"""
+    placed = []
+    for child in children:
+        placed.append((child, start))
+        start += child["size"]
+    return placed, start
+
+
+def allocate_subtree(node, start, bits, version, split_level=None):
+    """
+    自顶向下分配一棵子树，返回(分配记录列表, 剩余网段列表)
+
+    剩余网段每项为(网络地址整数, 前缀长度, 所属节点路径)。
+    split_level不为None时，到达该层级的子树不在这里展开，而是在分配记录列表中留下(节点, 起始地址)占位，
+    由调用方交给其他进程计算
+    """
+    records = []
+    remaining = []
+    stack = [(node, start)]
+    while stack:
+        node, start = stack.pop()
+        if split_level is not None and node["level"] == split_level and node["children"]:
+            records.append((node, start))
+            continue
+        required = {"name": node["name"]}
+        if node["hosts"] is not None:
+            required["hosts"] = node["hosts"]
+        record = allocation_record(required, start, node["prefix_len"], node["count"], version)
+        record["path"] = node["path"]
+        record["level"] = node["level"]
+        records.append(record)
+        if not node["children"]:
+            continue
+        placed, end = place_children(node["children"], start)
+        block_end = start + (1 << (bits - node["prefix_len"])) - 1
+        if end <= block_end:
+            free_blocks = range_to_cidr_ints(end, block_end, bits)
+            remaining.extend((network, prefix_len, node["path"]) for network, prefix_len in free_blocks)
+        # 逆序入栈，出栈顺序即按地址排列的深度优先顺序
+        stack.extend(reversed(placed))
+    return records, remaining
+
+
+def allocate_subtree_task(task):
+    """在工作进程中分配一棵子树，必须是模块级函数以便多进程调用"""
+    node, start, bits, version = task
+    return allocate_subtree(node, start, bits, version)
+
+
+def choose_split_level(nodes, workers):
+    """选择并行拆分的层级：从上往下第一个中间节点数不少于workers*2的层级"""
+    level_nodes = nodes
+    level = 1
+    while level_nodes:
+        interior = [node for node in level_nodes if node["children"]]
+        if len(interior) >= workers * 2 or not interior:
+            return level
+        level_nodes = [child for node in interior for child in node["children"]]
+        level += 1
+    return level
+
+
+def plan_hierarchy(parent_cidr, tree, headroom=0, workers=1):
+    """
+    多级子网规划
+
+    参数:
+    parent_cidr: 父网段，例如"10.0.0.0/8"
+    tree: 第一级节点列表。每个节点包含name，叶子节点与suggest_subnet_planning的子网需求相同
+        （hosts或prefix，可选count），中间节点包含children子节点列表，可选prefix（固定大小）和headroom
+    headroom: 默认余量比例，中间节点在子节点地址之和的基础上额外预留的比例，例如0.25表示多留25%
+    workers: 并行进程数，大于1时把互不相关的子树分配给多个进程
+
+    返回:
+    包含parent_cidr、allocated_subnets和remaining_subnets的字典。allocated_subnets按深度优先、地址从小到大排列，
+    每项在suggest_subnet_planning分配记录的基础上增加path（以"/"连接的节点路径）和level（层级，从1开始），
+    中间节点的required_hosts为其下所有叶子节点的主机数之和；remaining_subnets每项为{"path", "cidr"}，
+    是父网段或各中间节点内未使用的空间。出错时返回包含error的字典
+    """
+    try:
+        headroom = Fraction(str(headroom))
+    except ValueError:
+        return {"error": "headroom 必须是数字"}
+    if headroom < 0:
+        return {"error": "headroom 不能小于0"}
+    try:
+        parent_net = parse_network(parent_cidr)
+        nodes = size_tree(tree, parent_net, headroom)
+    except ValueError as e:
+        return {"error": str(e)}
+    if not nodes:
+        return {"error": "缺少需要规划的节点"}
+
+    version = parent_net.version
+    bits = parent_net.max_prefixlen
+    parent_start = int(parent_net.network_address)
+    placed, end = place_children(nodes, parent_start)
+    parent_end = parent_start + parent_net.num_addresses - 1
+    if end - 1 > parent_end:
+        need = end - parent_start
+        return {"error": f"父网段空间不足：需要 {need} 个地址，{parent_cidr} 只有 {parent_net.num_addresses} 个"}
+
+    free_blocks = range_to_cidr_ints(end, parent_end, bits)
+    remaining = [(network, prefix_len, "") for network, prefix_len in free_blocks]
+    records = []
+    if workers > 1:
+        split_level = choose_split_level(nodes, workers)
+        for node, start in placed:
+            node_records, node_remaining = allocate_subtree(node, start, bits, version, split_level)
+            records.extend(node_records)
+            remaining.extend(node_remaining)
+        tasks = [(item[0], item[1], bits, version) for item in records if isinstance(item, tuple)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            subtree_results = iter(list(executor.map(allocate_subtree_task, tasks, chunksize=chunksize)))
+        merged = []
+        for item in records:
+            if isinstance(item, tuple):
+                subtree_records, subtree_remaining = next(subtree_results)
+                merged.extend(subtree_records)
+                remaining.extend(subtree_remaining)
+            else:
+                merged.append(item)
+        records = merged
+    else:
+        for node, start in placed:
+            node_records, node_remaining = allocate_subtree(node, start, bits, version)
+            records.extend(node_records)
+            remaining.extend(node_remaining)
+
+    remaining.sort()
+    return {
+        "parent_cidr": parent_cidr,
+        "allocated_subnets": records,
+        "remaining_subnets": [
+            {"path": path, "cidr": f"{int_to_ip(network, version)}/{prefix_len}"}
+            for network, prefix_len, path in remaining
+        ],
+    }
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+批量判断IP地址属于规划结果中的哪个子网
+
+核对防火墙日志等场景需要为数百万个IP地址找出命中的已分配子网。SubnetClassifier把子网转换为一个有序的
+边界数组：每个子网贡献起始地址和结束地址+1两个边界，IP地址在边界数组中的插入位置为奇数时命中第
+(位置-1)//2个子网，为偶数时不在任何子网中。因此每个地址只需一次二分查找，不需要逐个比较子网：
+- IPv4地址字符串用socket.inet_pton批量转换为打包的字节串，再一次性转换为整数数组
+- 安装了NumPy时用numpy.searchsorted对整个数组一次完成查找，否则用map(bisect_right)在C层逐个查找
+- IPv6地址超过64位，用socket.inet_pton逐个转换后始终使用bisect
+- 地址字符串的IP版本必须与子网相同，IPv6子网中混入IPv4地址（或相反）时抛出ValueError
+
+用法:
+    from ip_classifier import SubnetClassifier
+
+    classifier = SubnetClassifier.from_plan(suggest_subnet_planning("10.0.0.0/16", required_subnets))
+    indexes = classifier.classify(["10.0.3.7", "192.168.1.1"])   # array("i", [2, -1])
+    classifier.labels[indexes[0]]                                 # 命中的子网名称
+"""
+
+import array
+import bisect
+import collections
+import socket
+import sys
+import functools
+
+from ip_subnet_calculator import parse_network_ints, iter_overlap_ints
+
+# 结果数组的类型码，每项为子网序号，未命中为-1
+INDEX_TYPECODE = "i"
+
+
+def load_numpy():
+    """NumPy是可选依赖，未安装时返回None"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def pack_ipv4(ips):
+    """
+    把IPv4地址字符串列表转换为array("I")整数数组（本机字节序）
+
+    先用socket.inet_pton在C层逐个转换并拼接为大端字节串，再一次性读入数组，避免为每个地址做Python整数运算。
+    无效地址抛出ValueError
+    """
+    pton = functools.partial(socket.inet_pton, socket.AF_INET)
+    try:
+        packed = b"".join(map(pton, ips))
+    except (OSError, TypeError):
+        for ip in ips:
+            try:
+                pton(ip)
+            except (OSError, TypeError):
+                raise ValueError(f"无效的IPv4地址: {ip}") from None
+        raise
+    values = array.array("I")
+    values.frombytes(packed)
+    if sys.byteorder == "little":
+        values.byteswap()
+    return values
+
+
+def parse_ipv6(ips):
+    """
+    把IPv6地址字符串列表转换为整数列表
+
+    与pack_ipv4一样用socket.inet_pton转换，IPv4地址和其他无效地址抛出ValueError
+    """
+    pton = functools.partial(socket.inet_pton, socket.AF_INET6)
+    values = []
+    for ip in ips:
+        try:
+            values.append(int.from_bytes(pton(ip), "big"))
+        except (OSError, TypeError):
+            raise ValueError(f"无效的IPv6地址: {ip}") from None
+    return values
+
+
+class SubnetClassifier:
+    """
+    按子网的起始地址建立有序边界数组，批量查找IP地址命中的子网
+
+    子网之间不能重叠（规划结果中的已分配子网总是互不重叠），可以相邻。
+    labels保存每个子网的名称，classify返回的序号可以直接用作labels的下标
+    """
+
+    def __init__(self, cidrs, labels=None):
+        """
+        参数:
+        cidrs: CIDR字符串列表
+        labels: 可选，与cidrs一一对应的名称，默认为CIDR本身
+
+        网段无效、IP版本不一致或互相重叠时抛出ValueError
+        """
+        cidrs = [str(cidr).strip() for cidr in cidrs]
+        intervals = []
+        version = None
+        for cidr in cidrs:
+            network, prefixlen, cidr_version = parse_network_ints(cidr)
+            if version is None:
+                version = cidr_version
+            elif cidr_version != version:
+                raise ValueError(f"{cidr} 与其他子网的IP版本不同")
+            bits = 32 if cidr_version == 4 else 128
+            intervals.append((network, network + (1 << (bits - prefixlen)) - 1))
+        self._build(intervals, version or 4, cidrs if labels is None else list(labels))
+
+    @classmethod
+    def from_intervals(cls, intervals, labels, version=4):
+        """从(起始地址整数, 结束地址整数)区间创建，区间之间不能重叠"""
+        classifier = cls.__new__(cls)
+        classifier._build(list(intervals), version, list(labels))
+        return classifier
+
+    @classmethod
+    def from_plan(cls, plan_result):
+        """
+        从suggest_subnet_planning等函数返回的规划结果创建，classify返回allocated_subnets中的记录序号
+
+        count大于1的分配记录按一个连续区间处理（从cidr到last_cidr），labels为每条记录的name
+        """
+        intervals = []
+        labels = []
+        version = 4
+        for subnet in plan_result["allocated_subnets"]:
+            network, prefixlen, version = parse_network_ints(subnet["cidr"])
+            size = 1 << ((32 if version == 4 else 128) - prefixlen)
+            intervals.append((network, network + size * subnet.get("count", 1) - 1))
+            labels.append(subnet["name"])
+        return cls.from_intervals(intervals, labels, version)
+
+    def _build(self, intervals, version, labels):
+        if len(labels) != len(intervals):
+            raise ValueError("labels 的数量与子网数量不同")
+        overlap = next(iter_overlap_ints(intervals), None)
+        if overlap:
+            first, second = overlap
+            raise ValueError(f"{labels[second]} 与 {labels[first]} 重叠")
+        self.version = version
+        self.labels = labels
+        order = sorted(range(len(intervals)), key=lambda i: intervals[i][0])
+        # 边界数组[起始0, 结束0+1, 起始1, 结束1+1, ...]；插入位置k为奇数时命中slot_index[k]
+        self._boundaries = []
+        self._slot_index = [-1]
+        for i in order:
+            start, end = intervals[i]
+            self._boundaries.extend((start, end + 1))
+            self._slot_index.extend((i, -1))
+        self._numpy_tables = None
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _parse(self, ips):
+        """把输入转换为整数序列：字符串列表、整数列表、array或NumPy数组"""
+        numpy = sys.modules.get("numpy")
+        if numpy is not None and isinstance(ips, numpy.ndarray):
+            return ips
+        if isinstance(ips, array.array):
+            return ips
+        ips = ips if isinstance(ips, (list, tuple)) else list(ips)
+        if not ips or isinstance(ips[0], int):
+            return ips
+        return pack_ipv4(ips) if self.version == 4 else parse_ipv6(ips)
+
+    def classify(self, ips):
+        """
+        返回每个IP地址命中的子网序号，未命中任何子网时为-1
+
+        参数:
+        ips: IP地址字符串列表（或可迭代对象）、整数列表、array("I")或NumPy整数数组
+
+        返回:
+        输入为NumPy数组时返回NumPy int32数组，否则返回array("i")
+        """
+        values = self._parse(ips)
+        numpy_input = type(values).__module__ == "numpy"
+        if self.version == 4 and len(values):
+            numpy = load_numpy() if not numpy_input else sys.modules["numpy"]
+            if numpy is not None:
+                result = self._classify_numpy(numpy, values)
+                if numpy_input:
+                    return result
+                indexes = array.array(INDEX_TYPECODE)
+                indexes.frombytes(result.astype(numpy.int32).tobytes())
+                return indexes
+        if numpy_input:
+            values = values.tolist()
+        locate = functools.partial(bisect.bisect_right, self._boundaries)
+        return array.array(INDEX_TYPECODE, map(self._slot_index.__getitem__, map(locate, values)))
+
+    def _classify_numpy(self, numpy, values):
+        if self._numpy_tables is None:
+            # 只有最后一个子网结束于255.255.255.255时边界为2**32，没有地址能越过它，去掉后全部按uint32比较
+            boundaries = [value for value in self._boundaries if value < 1 << 32]
+            self._numpy_tables = (
+                numpy.array(boundaries, dtype=numpy.uint32),
+                numpy.array(self._slot_index, dtype=numpy.int32),
+            )
+        boundaries, slot_index = self._numpy_tables
+        if isinstance(values, array.array):
+            values = numpy.frombuffer(values, dtype=numpy.uint32)
+        values = numpy.asarray(values, dtype=numpy.uint32)
+        return slot_index[numpy.searchsorted(boundaries, values, side="right")]
+
+    def classify_one(self, ip):
+        """返回单个IP地址命中的子网序号，未命中时为-1；地址无效或IP版本与子网不同时抛出ValueError"""
+        value = ip if isinstance(ip, int) else self._parse([str(ip)])[0]
+        return self._slot_index[bisect.bisect_right(self._boundaries, value)]
+
+    def count_hits(self, indexes):
+        """统计classify结果中每个子网的命中次数，返回列表，最后一项为未命中的次数"""
+        numpy = sys.modules.get("numpy")
+        if numpy is not None and isinstance(indexes, numpy.ndarray):
+            # 序号整体加1，未命中的-1计入第0项，再移到最后
+            counts = numpy.bincount(indexes + 1, minlength=len(self.labels) + 1).tolist()
+            return counts[1:] + counts[:1]
+        hits = collections.Counter(indexes)
+        return [hits.get(i, 0) for i in range(len(self.labels))] + [hits.get(-1, 0)]
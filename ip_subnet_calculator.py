@@ -17,6 +17,11 @@ import os
 import json
 import csv
 import io
+import array
+import bisect
+import heapq
+import itertools
+import socket
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from version import get_version
@@ -28,201 +33,1388 @@ import ipaddress
 
 def ip_to_int(ip_str):
     """
-    将IP地址字符串转换为整数
+    将IP地址字符串转换为整数，支持IPv4和IPv6
     """
+    if ":" in ip_str:
+        return int(ipaddress.IPv6Address(ip_str))
     parts = ip_str.split(".")
     return int(parts[0]) << 24 | int(parts[1]) << 16 | int(parts[2]) << 8 | int(parts[3])
 
 
-def int_to_ip(ip_int):
+def int_to_ip(ip_int, version=4):
     """
-    将整数转换为IP地址字符串
+    将整数转换为IP地址字符串，version为6时返回压缩格式的IPv6地址
     """
+    if version == 6:
+        return str(ipaddress.IPv6Address(ip_int))
     return f"{ip_int >> 24}.{(ip_int >> 16) & 0xFF}.{(ip_int >> 8) & 0xFF}.{ip_int & 0xFF}"
 
 
+def parse_network(network_str):
+    """
+    解析IPv4或IPv6网段，主机位不为0时自动对齐到网络地址
+    """
+    network_str = str(network_str).strip()
+    # 按地址格式选择IPv4或IPv6解析，出错时得到更具体的错误信息
+    if ":" in network_str:
+        return ipaddress.IPv6Network(network_str, strict=False)
+    return ipaddress.IPv4Network(network_str, strict=False)
+
+
 def get_subnet_info(network_str):
     """
     获取子网的详细信息
+
+    IPv6没有广播地址，broadcast为网段的最后一个地址，全部地址均可分配给主机
     """
     try:
-        network = ipaddress.IPv4Network(network_str, strict=False)
-
-        # 计算通配符掩码：子网掩码的反码
-        wildcard = ~int(network.netmask) & 0xFFFFFFFF
-        wildcard_mask = int_to_ip(wildcard)
-        
-        # 计算可用主机范围
-        host_range_start = str(network.network_address + 1) if network.num_addresses > 2 else str(network.network_address)
-        host_range_end = str(network.broadcast_address - 1) if network.num_addresses > 2 else str(network.broadcast_address)
-        
-        # 获取可用主机数量
-        number_of_hosts = network.num_addresses - 2 if network.num_addresses > 2 else network.num_addresses
-
-        return {
-            "network": str(network.network_address),
-            "netmask": str(network.netmask),
-            "wildcard": wildcard_mask,
-            "broadcast": str(network.broadcast_address),
-            "cidr": str(network.with_prefixlen),
-            "prefixlen": network.prefixlen,
-            "num_addresses": network.num_addresses,
-            "usable_addresses": number_of_hosts,
-            # 以下是为了兼容导出函数添加的键
-            "network_address": str(network.network_address),
-            "subnet_mask": str(network.netmask),
-            "prefix_length": network.prefixlen,
-            "broadcast_address": str(network.broadcast_address),
-            "host_range_start": host_range_start,
-            "host_range_end": host_range_end,
-            "number_of_hosts": number_of_hosts
-        }
+        network = parse_network(network_str)
+        return network_info(int(network.network_address), network.prefixlen, network.version)
     except ValueError as e:
         return {"error": str(e)}
 
 
+def network_info(network_int, prefixlen, version=4):
+    """
+    根据网络地址整数和前缀长度生成get_subnet_info格式的网段信息
+    """
+    bits = 32 if version == 4 else 128
+    num_addresses = 1 << (bits - prefixlen)
+    last_int = network_int + num_addresses - 1
+    # 计算通配符掩码：子网掩码的反码
+    wildcard = num_addresses - 1
+    netmask = ((1 << bits) - 1) ^ wildcard
+
+    network_address = int_to_ip(network_int, version)
+    netmask_str = int_to_ip(netmask, version)
+    broadcast = int_to_ip(last_int, version)
+
+    # 计算可用主机范围和可用主机数量：IPv4扣除网络地址和广播地址
+    if version == 4 and num_addresses > 2:
+        host_range_start = int_to_ip(network_int + 1)
+        host_range_end = int_to_ip(last_int - 1)
+        number_of_hosts = num_addresses - 2
+    else:
+        host_range_start = network_address
+        host_range_end = broadcast
+        number_of_hosts = num_addresses
+
+    return {
+        "network": network_address,
+        "netmask": netmask_str,
+        "wildcard": int_to_ip(wildcard, version),
+        "broadcast": broadcast,
+        "cidr": f"{network_address}/{prefixlen}",
+        "prefixlen": prefixlen,
+        "num_addresses": num_addresses,
+        "usable_addresses": number_of_hosts,
+        # 以下是为了兼容导出函数添加的键
+        "network_address": network_address,
+        "subnet_mask": netmask_str,
+        "prefix_length": prefixlen,
+        "broadcast_address": broadcast,
+        "host_range_start": host_range_start,
+        "host_range_end": host_range_end,
+        "number_of_hosts": number_of_hosts
+    }
+
+
 def split_subnet(parent_cidr, split_cidr):
     """
-    将split_cidr从parent_cidr中切分出来，返回剩余的子网列表
+    将split_cidr从parent_cidr中切分出来，返回剩余的子网列表，支持IPv4和IPv6
+    """
+    remaining = split_subnet_ints(parent_cidr, split_cidr)
+    if isinstance(remaining, str):
+        return {"error": remaining}
+
+    version = parse_network(parent_cidr).version
+    return {
+        "parent": parent_cidr,
+        "split": split_cidr,
+        "remaining_subnets": [f"{int_to_ip(network, version)}/{prefixlen}" for network, prefixlen in remaining],
+        "parent_info": get_subnet_info(parent_cidr),
+        "split_info": get_subnet_info(split_cidr),
+        "remaining_subnets_info": [network_info(network, prefixlen, version) for network, prefixlen in remaining],
+    }
+
+
+def split_subnet_ints(parent_cidr, split_cidr):
+    """
+    子网切分的整数版本：只返回剩余网段，不生成网段详细信息
+
+    切分就是集合差：父网段减去切分网段后转换为最少的CIDR网段，剩余网段数等于两者前缀长度之差，
+    IPv6的大网段也不会枚举子网
+
+    返回:
+    按地址排序的剩余网段元组，每项为(网络地址整数, 前缀长度)；出错时返回错误信息字符串
     """
     try:
-        parent_net = ipaddress.IPv4Network(parent_cidr, strict=False)
-        split_net = ipaddress.IPv4Network(split_cidr, strict=False)
-
-        # 检查split_net是否是parent_net的子网
-        if not split_net.subnet_of(parent_net):
-            return {"error": f"{split_cidr} 不是 {parent_cidr} 的子网"}
-
-        # 如果父网段和切分网段相同，直接返回空列表
-        if parent_net == split_net:
-            return {
-            "parent": parent_cidr,
-            "split": split_cidr,
-            "remaining_subnets": [],
-            "parent_info": get_subnet_info(parent_cidr),
-            "split_info": get_subnet_info(split_cidr),
-            "remaining_subnets_info": [],
-        }
-
-        # 使用Python ipaddress模块的address_exclude方法获取剩余网段
-        # 这个方法会自动生成最简洁的剩余网段列表
-        remaining = list(parent_net.address_exclude(split_net))
-
-        # 对剩余网段按CIDR进行排序
-        remaining.sort()
-
-        return {
-            "parent": parent_cidr,
-            "split": split_cidr,
-            "remaining_subnets": [str(subnet) for subnet in remaining],
-            "parent_info": get_subnet_info(parent_cidr),
-            "split_info": get_subnet_info(split_cidr),
-            "remaining_subnets_info": [get_subnet_info(str(subnet)) for subnet in remaining],
-        }
+        parent, split = CIDRSet([parent_cidr]), CIDRSet([split_cidr])
+    except ValueError as e:
+        return str(e)
+    if parent.version != split.version or not split <= parent:
+        return f"{split_cidr} 不是 {parent_cidr} 的子网"
+    return tuple((parent - split).cidr_ints())
+
+
+def parse_network_ints(network_str):
+    """
+    将网段解析为(网络地址整数, 前缀长度, 版本)，主机位不为0时自动对齐到网络地址
+
+    常见的IPv4写法交给socket.inet_pton解析（与ipaddress一样严格，不接受前导零），
+    比构造IPv4Network快得多；其他写法交给ipaddress处理，无效输入抛出ValueError
+    """
+    address, slash, prefix = network_str.strip().partition("/")
+    if ":" not in address and (not slash or (prefix.isascii() and prefix.isdigit() and int(prefix) <= 32)):
+        try:
+            value = int.from_bytes(socket.inet_pton(socket.AF_INET, address), "big")
+        except OSError:
+            pass
+        else:
+            prefixlen = int(prefix) if slash else 32
+            return value >> (32 - prefixlen) << (32 - prefixlen), prefixlen, 4
+    network = parse_network(network_str)
+    return int(network.network_address), network.prefixlen, network.version
+
+
+def range_to_cidr_ints(start, end, bits=32):
+    """
+    将地址范围[start, end]（包含两端）转换为最少的CIDR网段
+
+    从起始地址开始，每次取受地址对齐和剩余长度共同限制的最大网段，网段数不超过2*bits
 
+    返回:
+    按地址排序的(网络地址整数, 前缀长度)列表
+    """
+    blocks = []
+    while start <= end:
+        # 起始地址对齐允许的最大网段，和剩余地址数允许的最大网段，取较小者
+        size = start & -start or 1 << bits
+        remaining = end - start + 1
+        if size > remaining:
+            size = 1 << (remaining.bit_length() - 1)
+        blocks.append((start, bits - size.bit_length() + 1))
+        start += size
+    return blocks
+
+
+def merge_interval_ints(intervals):
+    """
+    合并地址区间：重叠或相邻的[start, end]区间合并为一个
+
+    输入先排序，已排序的输入排序耗时为线性，合并过程只扫描一遍
+
+    返回:
+    按地址排序、互不重叠也不相邻的(起始地址, 结束地址)列表
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def aggregate_cidr_ints(blocks, bits=32):
+    """
+    CIDR聚合的整数版本：将(网络地址整数, 前缀长度)列表合并为覆盖相同地址的最少网段
+
+    返回:
+    按地址排序的(网络地址整数, 前缀长度)列表
+    """
+    intervals = ((network, network + (1 << (bits - prefixlen)) - 1) for network, prefixlen in blocks)
+    aggregated = []
+    for start, end in merge_interval_ints(intervals):
+        aggregated.extend(range_to_cidr_ints(start, end, bits))
+    return aggregated
+
+
+def range_to_cidrs(start_ip, end_ip):
+    """
+    将起止IP地址之间的地址范围（包含两端）转换为最少的CIDR网段，支持IPv4和IPv6
+
+    返回:
+    包含start、end和cidrs（CIDR字符串列表）的字典，出错时返回包含error的字典
+    """
+    try:
+        start = ipaddress.ip_address(str(start_ip).strip())
+        end = ipaddress.ip_address(str(end_ip).strip())
     except ValueError as e:
         return {"error": str(e)}
+    if start.version != end.version:
+        return {"error": "起始地址和结束地址必须同为IPv4或IPv6"}
+    if start > end:
+        return {"error": f"起始地址 {start} 大于结束地址 {end}"}
+
+    version = start.version
+    bits = start.max_prefixlen
+    blocks = range_to_cidr_ints(int(start), int(end), bits)
+    return {
+        "start": str(start),
+        "end": str(end),
+        "cidrs": [f"{int_to_ip(network, version)}/{prefixlen}" for network, prefixlen in blocks],
+    }
+
+
+def aggregate_subnets(cidrs):
+    """
+    CIDR聚合（汇总）：将网段列表合并为覆盖相同地址的最少网段，是子网切分的逆操作
 
+    与ipaddress.collapse_addresses结果相同，但直接在排序后的整数区间上合并，耗时与网段数成正比。
+    IPv4和IPv6网段可以混合输入，分别聚合，结果中IPv4在前
 
-def suggest_subnet_planning(parent_cidr, required_subnets):
+    返回:
+    包含aggregated（CIDR字符串列表）、input_count和output_count的字典，出错时返回包含error的字典
     """
-    子网规划智能建议功能
+    blocks = {4: [], 6: []}
+    for cidr in cidrs:
+        try:
+            network, prefixlen, version = parse_network_ints(str(cidr))
+        except ValueError as e:
+            return {"error": f"{cidr}: {e}"}
+        blocks[version].append((network, prefixlen))
+
+    aggregated = []
+    for version, bits in ((4, 32), (6, 128)):
+        for network, prefixlen in aggregate_cidr_ints(blocks[version], bits):
+            aggregated.append(f"{int_to_ip(network, version)}/{prefixlen}")
+    return {
+        "aggregated": aggregated,
+        "input_count": len(blocks[4]) + len(blocks[6]),
+        "output_count": len(aggregated),
+    }
+
+
+class HostSequence:
+    """
+    网段中可用主机地址的惰性序列，不生成地址列表
+
+    可用地址的范围与network_info相同：IPv4扣除网络地址和广播地址（/31和/32除外），IPv6为全部地址。
+    内部只保存一个整数range，下标、带步长的切片、逆序迭代和in判断都是O(1)，/8或/64也不占用额外内存。
+    下标和迭代得到IP地址字符串，ints()得到整数range，chunks()按块生成整数数组，便于批量写入文件或数据库
+
+    用法:
+        hosts = HostSequence("10.0.0.0/8")
+        len(hosts), hosts[0], hosts[-1]
+        dhcp_pool = hosts[100:200]         # 仍是HostSequence
+        for block in hosts.chunks(65536):  # IPv4每块为array("I")
+            ...
+    """
+
+    __slots__ = ("version", "_range")
+
+    def __init__(self, cidr):
+        """从CIDR字符串创建序列，无效网段抛出ValueError"""
+        network, prefixlen, version = parse_network_ints(str(cidr))
+        num_addresses = 1 << ((32 if version == 4 else 128) - prefixlen)
+        if version == 4 and num_addresses > 2:
+            self._range = range(network + 1, network + num_addresses - 1)
+        else:
+            self._range = range(network, network + num_addresses)
+        self.version = version
+
+    @classmethod
+    def _from_range(cls, int_range, version):
+        hosts = cls.__new__(cls)
+        hosts._range = int_range
+        hosts.version = version
+        return hosts
+
+    @property
+    def size(self):
+        """主机地址数；IPv6的大网段超过len()能返回的上限（2**63 - 1）时使用"""
+        r = self._range
+        if r.step > 0:
+            return max(0, (r.stop - r.start + r.step - 1) // r.step)
+        return max(0, (r.start - r.stop - r.step - 1) // -r.step)
+
+    def ints(self):
+        """返回主机地址整数的range"""
+        return self._range
+
+    def chunks(self, chunk_size=65536):
+        """
+        按顺序每次生成最多chunk_size个主机地址整数
+
+        IPv4每块为array("I")（每个地址4字节，可直接tobytes()写出），IPv6地址超过64位，每块为整数列表
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size 必须大于0")
+        r = self._range
+        for offset in range(0, self.size, chunk_size):
+            block = r[offset:offset + chunk_size]
+            yield array.array("I", block) if self.version == 4 else list(block)
+
+    def index(self, address):
+        """返回地址在序列中的位置，不在序列中时抛出ValueError"""
+        value = self._address_int(address)
+        if value is None or value not in self._range:
+            raise ValueError(f"{address} 不在主机地址序列中")
+        return self._range.index(value)
+
+    def _address_int(self, address):
+        # 地址字符串转换为整数，版本不同或不是单个地址时返回None
+        if isinstance(address, int):
+            return address
+        value, prefixlen, version = parse_network_ints(str(address))
+        if version != self.version or prefixlen != (32 if version == 4 else 128):
+            return None
+        return value
+
+    def __len__(self):
+        return len(self._range)
+
+    def __bool__(self):
+        return bool(self._range)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return HostSequence._from_range(self._range[item], self.version)
+        try:
+            return int_to_ip(self._range[item], self.version)
+        except IndexError:
+            raise IndexError(f"主机地址下标 {item} 超出范围（共{self.size}个）") from None
+
+    def __iter__(self):
+        version = self.version
+        return (int_to_ip(value, version) for value in self._range)
+
+    def __reversed__(self):
+        version = self.version
+        return (int_to_ip(value, version) for value in reversed(self._range))
+
+    def __contains__(self, address):
+        try:
+            value = self._address_int(address)
+        except ValueError:
+            return False
+        return value is not None and value in self._range
+
+    def __eq__(self, other):
+        if not isinstance(other, HostSequence):
+            return NotImplemented
+        return (self.version, self._range) == (other.version, other._range)
+
+    def __hash__(self):
+        return hash((self.version, self._range))
+
+    def __repr__(self):
+        r = self._range
+        if not r:
+            return "HostSequence([])"
+        step = f", step={r.step}" if r.step != 1 else ""
+        return f"HostSequence({self[0]!r} .. {self[-1]!r}{step}, 共{self.size}个地址)"
+
+
+def nth_subnet(parent_cidr, prefix_len, index):
+    """
+    O(1)计算父网段中第index个（从0开始，可以为负数表示从末尾数）前缀长度为prefix_len的子网
+
+    返回CIDR字符串；前缀长度不在父网段前缀长度到最大前缀长度之间时抛出ValueError，index超出范围时抛出IndexError
+    """
+    network, parent_prefix, version = parse_network_ints(str(parent_cidr))
+    bits = 32 if version == 4 else 128
+    if not parent_prefix <= prefix_len <= bits:
+        raise ValueError(f"前缀长度必须在{parent_prefix}到{bits}之间")
+    count = 1 << (prefix_len - parent_prefix)
+    if not -count <= index < count:
+        raise IndexError(f"{parent_cidr} 中只有{count}个/{prefix_len}子网，下标 {index} 超出范围")
+    return f"{int_to_ip(network + ((index % count) << (bits - prefix_len)), version)}/{prefix_len}"
+
+
+class CIDRSet:
+    """
+    不可变的网段集合，内部保存按地址排序、互不重叠也不相邻的整数区间
+
+    并集、交集、差集都是对两组已排序区间的一次线性扫描，结果仍是CIDRSet，
+    可以组合表达"地址池 - 已分配 + 预留"这类运算；to_cidrs()转换回最少的CIDR网段。
+    一个集合只包含一种IP版本，空集合的版本为None，可以与任意版本的集合运算
+
+    用法:
+        free = CIDRSet(["10.0.0.0/16"]) - CIDRSet(["10.0.1.0/24", "10.0.8.0/21"])
+        free.to_cidrs()
+        "10.0.2.1" in free
+    """
+
+    __slots__ = ("version", "_starts", "_ends")
+
+    def __init__(self, cidrs=(), version=None):
+        """从CIDR字符串（或单个IP地址）列表创建集合，无效网段或版本不一致时抛出ValueError"""
+        intervals = []
+        for cidr in cidrs:
+            network, prefixlen, cidr_version = parse_network_ints(str(cidr))
+            if version is None:
+                version = cidr_version
+            elif cidr_version != version:
+                raise ValueError(f"{cidr} 与集合中其他网段的IP版本不同")
+            bits = 32 if cidr_version == 4 else 128
+            intervals.append((network, network + (1 << (bits - prefixlen)) - 1))
+        self._set(merge_interval_ints(intervals), version)
+
+    def _set(self, merged, version):
+        self.version = version if merged else None
+        self._starts = tuple(start for start, _ in merged)
+        self._ends = tuple(end for _, end in merged)
+
+    @classmethod
+    def from_intervals(cls, intervals, version=4):
+        """从(起始地址整数, 结束地址整数)区间创建集合，区间可以无序、重叠"""
+        return cls._from_merged(merge_interval_ints(intervals), version)
+
+    @classmethod
+    def from_cidr_ints(cls, blocks, version=4):
+        """从(网络地址整数, 前缀长度)列表创建集合"""
+        bits = 32 if version == 4 else 128
+        return cls.from_intervals([(network, network + (1 << (bits - prefixlen)) - 1) for network, prefixlen in blocks], version)
+
+    @property
+    def bits(self):
+        return 128 if self.version == 6 else 32
+
+    @property
+    def num_addresses(self):
+        return sum(end - start + 1 for start, end in zip(self._starts, self._ends))
+
+    def intervals(self):
+        """返回按地址排序的(起始地址整数, 结束地址整数)列表"""
+        return list(zip(self._starts, self._ends))
+
+    def cidr_ints(self):
+        """返回覆盖集合的最少网段，每项为(网络地址整数, 前缀长度)"""
+        blocks = []
+        for start, end in zip(self._starts, self._ends):
+            blocks.extend(range_to_cidr_ints(start, end, self.bits))
+        return blocks
+
+    def to_cidrs(self):
+        """返回覆盖集合的最少CIDR字符串列表"""
+        return [f"{int_to_ip(network, self.version)}/{prefixlen}" for network, prefixlen in self.cidr_ints()]
+
+    def _result_version(self, other):
+        if not isinstance(other, CIDRSet):
+            other = CIDRSet(other)
+        if self.version is not None and other.version is not None and self.version != other.version:
+            raise ValueError("IPv4和IPv6网段集合不能互相运算")
+        return other, self.version or other.version
+
+    @classmethod
+    def _from_merged(cls, merged, version):
+        cidr_set = cls.__new__(cls)
+        cidr_set._set(merged, version)
+        return cidr_set
+
+    def union(self, other):
+        """并集：两组区间都已排序，合并排序和合并区间都是线性的"""
+        other, version = self._result_version(other)
+        return self._from_merged(merge_interval_ints(self.intervals() + other.intervals()), version)
+
+    def intersection(self, other):
+        """交集：双指针扫描两组区间，保留重叠部分"""
+        other, version = self._result_version(other)
+        a_starts, a_ends, b_starts, b_ends = self._starts, self._ends, other._starts, other._ends
+        merged = []
+        i = j = 0
+        while i < len(a_starts) and j < len(b_starts):
+            start = max(a_starts[i], b_starts[j])
+            end = min(a_ends[i], b_ends[j])
+            if start <= end:
+                merged.append((start, end))
+            # 结束较早的区间不会再与对方后面的区间重叠
+            if a_ends[i] < b_ends[j]:
+                i += 1
+            else:
+                j += 1
+        return self._from_merged(merged, version)
+
+    def difference(self, other):
+        """差集：双指针扫描，从每个区间中扣除与对方重叠的部分"""
+        other, version = self._result_version(other)
+        b_starts, b_ends = other._starts, other._ends
+        merged = []
+        j = 0
+        for start, end in zip(self._starts, self._ends):
+            # 跳过完全位于当前区间之前的扣除区间
+            while j < len(b_starts) and b_ends[j] < start:
+                j += 1
+            k = j
+            while k < len(b_starts) and b_starts[k] <= end:
+                if b_starts[k] > start:
+                    merged.append((start, b_starts[k] - 1))
+                start = b_ends[k] + 1
+                if start > end:
+                    break
+                k += 1
+            if start <= end:
+                merged.append((start, end))
+        return self._from_merged(merged, version)
+
+    def issubset(self, other):
+        other, _ = self._result_version(other)
+        return not self.difference(other)
+
+    def contains(self, item):
+        """判断IP地址、网段或CIDRSet是否完全包含在集合中，地址查找为二分查找"""
+        if isinstance(item, CIDRSet):
+            return item.issubset(self)
+        if isinstance(item, int):
+            start = end = item
+            version = self.version
+        else:
+            network, prefixlen, version = parse_network_ints(str(item))
+            start, end = network, network + (1 << ((32 if version == 4 else 128) - prefixlen)) - 1
+        if version != self.version:
+            return False
+        index = bisect.bisect_right(self._starts, start) - 1
+        return index >= 0 and end <= self._ends[index]
+
+    __contains__ = contains
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __le__ = issubset
+
+    def __iter__(self):
+        return iter(self.to_cidrs())
+
+    def __bool__(self):
+        return bool(self._starts)
+
+    def __eq__(self, other):
+        if not isinstance(other, CIDRSet):
+            return NotImplemented
+        return (self.version, self._starts, self._ends) == (other.version, other._starts, other._ends)
+
+    def __hash__(self):
+        return hash((self.version, self._starts, self._ends))
+
+    def __repr__(self):
+        cidrs = self.to_cidrs()
+        shown = ", ".join(repr(cidr) for cidr in cidrs[:8])
+        if len(cidrs) > 8:
+            shown += f", ... 共{len(cidrs)}个网段"
+        return f"CIDRSet([{shown}])"
+
+
+def iter_overlap_ints(intervals):
+    """
+    扫描线冲突检测：找出所有互相重叠的区间对，避免两两比较的O(n²)耗时
+
+    区间按起始地址排序后依次扫描，最小堆中保存尚未结束的区间，先弹出在新区间开始前已结束的区间，
+    堆中剩下的区间都与新区间重叠。耗时为O(n log n + k)，k为冲突对数
 
     参数:
-    parent_cidr: 父网段，格式为CIDR (例如: "10.0.0.0/8")
-    required_subnets: 需要的子网列表，每个子网包含name和hosts两个字段
+    intervals: (起始地址整数, 结束地址整数)列表，包含两端
+
+    返回:
+    生成器，每项为(先开始的区间序号, 后开始的区间序号)；起始地址相同时较大的区间在前，
+    因此对于网段来说前者总是包含后者
+    """
+    active = []  # 最小堆，每项为(结束地址, 序号)
+    for start, negative_end, index in sorted((start, -end, i) for i, (start, end) in enumerate(intervals)):
+        while active and active[0][0] < start:
+            heapq.heappop(active)
+        for _, other in active:
+            yield other, index
+        heapq.heappush(active, (-negative_end, index))
+
+
+def iter_nested_ints(intervals):
+    """
+    找出被其他区间包含（或与其相同）的区间，每个区间只与包含它的最外层区间配对
+
+    适用于网段区间：两个网段要么互不重叠，要么一个包含另一个。区间按起始地址排序后扫描一次，
+    只记录当前最外层区间的结束地址，重复或层层嵌套的区间再多，耗时也是O(n log n)
 
     返回:
-    包含建议子网规划的字典
+    生成器，每项为(最外层区间序号, 被包含的区间序号)；起始地址和结束地址都相同时序号小的作为外层
+    """
+    outer, outer_end = None, -1
+    for start, negative_end, index in sorted((start, -end, i) for i, (start, end) in enumerate(intervals)):
+        if start <= outer_end:
+            yield outer, index
+        else:
+            outer, outer_end = index, -negative_end
+
+
+def iter_subnet_conflicts(cidrs):
+    """
+    检查网段列表中重复或互相包含的网段，适合数十万条已有分配的批量检查
+
+    所有网段先解析为整数区间（无效网段立即抛出ValueError），冲突在迭代时逐个生成，
+    只需要前几条冲突时不必计算全部结果。IPv4和IPv6网段分别检查
+
+    返回:
+    生成器，每项为字典：type为duplicate（重复）或overlap（包含），cidr和index为较大的网段及其在输入中的序号，
+    conflict_cidr和conflict_index为被包含的网段
+    """
+    cidrs = [str(cidr).strip() for cidr in cidrs]
+    intervals = {4: [], 6: []}
+    indexes = {4: [], 6: []}
+    for index, cidr in enumerate(cidrs):
+        try:
+            network, prefixlen, version = parse_network_ints(cidr)
+        except ValueError as e:
+            raise ValueError(f"{cidr}: {e}") from None
+        bits = 32 if version == 4 else 128
+        intervals[version].append((network, network + (1 << (bits - prefixlen)) - 1))
+        indexes[version].append(index)
+
+    def iter_conflicts():
+        for version in (4, 6):
+            version_intervals, version_indexes = intervals[version], indexes[version]
+            for first, second in iter_overlap_ints(version_intervals):
+                yield {
+                    "type": "duplicate" if version_intervals[first] == version_intervals[second] else "overlap",
+                    "cidr": cidrs[version_indexes[first]],
+                    "index": version_indexes[first],
+                    "conflict_cidr": cidrs[version_indexes[second]],
+                    "conflict_index": version_indexes[second],
+                }
+
+    return iter_conflicts()
+
+
+def find_subnet_conflicts(cidrs, limit=1000):
+    """
+    检查网段列表中重复或互相包含的网段，最多返回limit条冲突
+
+    返回:
+    包含conflicts（冲突列表）、conflict_count、checked_count和truncated（是否因超过limit而截断）的字典，
+    出错时返回包含error的字典
+    """
+    cidrs = list(cidrs)
+    try:
+        conflicts = list(itertools.islice(iter_subnet_conflicts(cidrs), limit + 1))
+    except ValueError as e:
+        return {"error": str(e)}
+    return {
+        "conflicts": conflicts[:limit],
+        "conflict_count": min(len(conflicts), limit),
+        "checked_count": len(cidrs),
+        "truncated": len(conflicts) > limit,
+    }
+
+
+class SubnetAllocator:
+    """
+    按前缀长度索引的空闲网段（伙伴分配），供在已有空闲空间中增量分配子网
+
+    每个前缀长度保存一组空闲网段和按地址排序的最小堆。分配时选择能容纳所需子网的最小空闲网段（最佳适配），
+    相同大小时取最低地址，只需检查最多bits+1个前缀长度，每次分配耗时O(bits + log n)。
+    在完整的父网段上按地址块从大到小分配时，结果与plan_subnet_ints的连续分配完全相同。
+    释放子网时与空闲的"伙伴"网段逐级合并，空闲网段始终是覆盖空闲地址的最少网段
+    """
+
+    def __init__(self, free_blocks=(), version=4):
+        """free_blocks为互不重叠的空闲网段，每项为(网络地址整数, 前缀长度)"""
+        self.version = version
+        self.bits = 32 if version == 4 else 128
+        self._free = [set() for _ in range(self.bits + 1)]
+        self._heaps = [[] for _ in range(self.bits + 1)]
+        for network, prefix_len in free_blocks:
+            self._release_block(network, prefix_len)
+
+    def _push(self, network, prefix_len):
+        self._free[prefix_len].add(network)
+        heapq.heappush(self._heaps[prefix_len], network)
+
+    def _pop(self, prefix_len):
+        # 合并伙伴网段时只从集合中删除，堆中留下的过期项在这里跳过
+        free, heap = self._free[prefix_len], self._heaps[prefix_len]
+        while True:
+            network = heapq.heappop(heap)
+            if network in free:
+                free.remove(network)
+                return network
+
+    def _merge_limit(self, network):
+        # 释放的网段最多向上合并到的前缀长度
+        return 0
+
+    def _release_block(self, network, prefix_len):
+        limit = self._merge_limit(network)
+        while prefix_len > limit:
+            buddy = network ^ (1 << (self.bits - prefix_len))
+            if buddy not in self._free[prefix_len]:
+                break
+            self._free[prefix_len].remove(buddy)
+            network &= ~(1 << (self.bits - prefix_len))
+            prefix_len -= 1
+        self._push(network, prefix_len)
+
+    def _best_level(self, prefix_len):
+        # 能容纳所需子网的最小空闲网段所在的前缀长度
+        return next(q for q in range(prefix_len, -1, -1) if self._free[q])
+
+    def capacity(self, prefix_len):
+        """当前最多还能分配多少个前缀长度为prefix_len的子网"""
+        return sum(len(self._free[q]) << (prefix_len - q) for q in range(prefix_len + 1))
+
+    @property
+    def num_free_addresses(self):
+        return sum(len(free) << (self.bits - q) for q, free in enumerate(self._free))
+
+    def allocate(self, prefix_len, count=1):
+        """
+        分配count个前缀长度为prefix_len的子网
+
+        每次从能容纳子网的最小空闲网段中尽量多取，不够时再取下一个，地址相邻的部分合并为一段
+
+        返回:
+        按分配顺序排列的连续段列表，每项为(网络地址整数, 前缀长度, 数量)；空间不足时返回None，不做任何分配
+        """
+        if not 0 <= prefix_len <= self.bits or count < 1 or self.capacity(prefix_len) < count:
+            return None
+        size = 1 << (self.bits - prefix_len)
+        runs = []
+        while count:
+            level = self._best_level(prefix_len)
+            network = self._pop(level)
+            block_count = 1 << (prefix_len - level)
+            taken = min(count, block_count)
+            if taken < block_count:
+                # 空闲网段中未分配的部分重新拆分为对齐网段
+                for free_network, free_prefix in range_to_cidr_ints(
+                    network + taken * size, network + block_count * size - 1, self.bits
+                ):
+                    self._push(free_network, free_prefix)
+            if runs and runs[-1][0] + runs[-1][2] * size == network:
+                runs[-1][2] += taken
+            else:
+                runs.append([network, prefix_len, taken])
+            count -= taken
+        return [tuple(run) for run in runs]
+
+    def release(self, network, prefix_len, count=1):
+        """释放从network开始的count个连续子网，调用方需保证这些地址当前已分配"""
+        size = 1 << (self.bits - prefix_len)
+        for block_network, block_prefix in range_to_cidr_ints(network, network + count * size - 1, self.bits):
+            self._release_block(block_network, block_prefix)
+
+    def free_blocks(self):
+        """返回按地址排序的空闲网段列表，每项为(网络地址整数, 前缀长度)"""
+        return sorted((network, q) for q, free in enumerate(self._free) for network in free)
+
+
+class MultiPoolAllocator(SubnetAllocator):
+    """
+    跨多个父网段（地址池）的空闲网段索引
+
+    全部地址池的空闲网段放在同一个按前缀长度索引的结构中，每个前缀长度的最小堆按(优先级, 地址)排序。
+    分配时先选优先级最高（数值最小）的地址池，同一优先级中选能容纳子网的最小空闲网段（最佳适配），
+    相同大小时取最低地址，只需查看最多bits+1个堆顶，每次分配耗时仍为O(bits + log n)。
+    合并伙伴网段时不会越过地址池的边界，相邻的两个地址池不会被合并成一个更大的空闲网段
+    """
+
+    def __init__(self, pools, version=4):
+        """pools为互不重叠的地址池，每项为(网络地址整数, 前缀长度, 优先级)"""
+        self.pools = sorted(pools)
+        self._pool_starts = [network for network, _, _ in self.pools]
+        super().__init__((), version)
+        for network, prefix_len, _ in self.pools:
+            self._release_block(network, prefix_len)
+
+    def pool_index(self, network):
+        """地址network所在地址池在self.pools（按地址排序）中的序号"""
+        return bisect.bisect_right(self._pool_starts, network) - 1
+
+    def _merge_limit(self, network):
+        return self.pools[self.pool_index(network)][1]
+
+    def _push(self, network, prefix_len):
+        self._free[prefix_len].add(network)
+        priority = self.pools[self.pool_index(network)][2]
+        heapq.heappush(self._heaps[prefix_len], (priority, network))
+
+    def _top(self, prefix_len):
+        # 跳过已合并或已分配的过期项，返回堆顶的(优先级, 地址)
+        free, heap = self._free[prefix_len], self._heaps[prefix_len]
+        while heap[0][1] not in free:
+            heapq.heappop(heap)
+        return heap[0]
+
+    def _pop(self, prefix_len):
+        network = self._top(prefix_len)[1]
+        heapq.heappop(self._heaps[prefix_len])
+        self._free[prefix_len].remove(network)
+        return network
+
+    def _best_level(self, prefix_len):
+        # 优先级最高的地址池中能容纳所需子网的最小空闲网段：按(优先级, -前缀长度)取最小
+        best = None
+        for q in range(prefix_len, -1, -1):
+            if self._free[q]:
+                key = (self._top(q)[0], -q)
+                if best is None or key < best:
+                    best = key
+        return -best[1]
+
+    def pool_free_addresses(self):
+        """返回每个地址池（按self.pools的顺序）当前的空闲地址数"""
+        free = [0] * len(self.pools)
+        for q, networks in enumerate(self._free):
+            for network in networks:
+                free[self.pool_index(network)] += 1 << (self.bits - q)
+        return free
+
+
+def required_prefix_len(subnet, parent_net):
+    """
+    计算子网需求对应的前缀长度：指定了prefix时直接使用，否则按主机数计算
+
+    IPv4的主机数需要扣除网络地址和广播地址，IPv6按地址数计算
+    """
+    bits = parent_net.max_prefixlen
+    if subnet.get("prefix") is not None:
+        return int(subnet["prefix"])
+    hosts = subnet["hosts"]
+    if parent_net.version == 4:
+        # 计算需要的地址数量（包括网络地址和广播地址）
+        prefix_len = bits - (hosts + 1).bit_length()
+    else:
+        prefix_len = bits - (max(hosts, 1) - 1).bit_length()
+    # 确保前缀长度在有效范围内且不小于父网段的前缀长度
+    return min(max(prefix_len, parent_net.prefixlen, 0), bits)
+
+
+def reserved_interval_int(parent_net, cidr):
+    """
+    解析一个预留网段，返回(起始地址整数, 结束地址整数, 前缀长度)，
+    IP版本不同或与父网段没有重叠时返回None，无效网段抛出ValueError
     """
     try:
-        parent_net = ipaddress.IPv4Network(parent_cidr, strict=False)
-
-        # 按所需主机数量从大到小排序，优先分配大的子网
-        sorted_subnets = sorted(required_subnets, key=lambda x: x["hosts"], reverse=True)
-
-        # 计算每个子网需要的CIDR前缀长度
-        for subnet in sorted_subnets:
-            # 计算需要的地址数量（包括网络地址和广播地址）
-            required_addresses = subnet["hosts"] + 2
-            # 计算合适的前缀长度
-            prefix_len = 32 - (required_addresses - 1).bit_length()
-            # 确保前缀长度在有效范围内（0-32）且不小于父网段的前缀长度
-            prefix_len = max(prefix_len, parent_net.prefixlen)
-            prefix_len = min(prefix_len, 32)  # 确保前缀长度不超过32
-            prefix_len = max(prefix_len, 0)   # 确保前缀长度不小于0
-            subnet["prefix_len"] = prefix_len
-
-        # 开始分配子网
-        available_subnets = [parent_net]
-        allocated_subnets = []
+        network, prefixlen, version = parse_network_ints(cidr)
+    except ValueError as e:
+        raise ValueError(f"预留网段 {cidr}: {e}") from None
+    end = network + (1 << ((32 if version == 4 else 128) - prefixlen)) - 1
+    parent_start = int(parent_net.network_address)
+    if version != parent_net.version or end < parent_start or network > parent_start + parent_net.num_addresses - 1:
+        return None
+    return network, end, prefixlen
+
+
+def classify_reserved_subnets(parent_net, reserved_subnets):
+    """
+    检查规划时的预留网段，返回(预留的整数区间列表, 预留结果列表)
+
+    与父网段有重叠的预留网段都会被扣除（超出父网段的部分忽略），不在父网段内的预留网段不扣除；
+    预留网段之间重复或互相包含时只扣除一次，由扫描线一次找出（每个预留网段只标注包含它的最外层预留网段），
+    耗时为O(n log n)。无效网段抛出ValueError
+
+    预留结果每项为{"cidr": 预留网段, "honored": 是否已扣除, "note": 说明}
+    """
+    reserved = []
+    intervals = []
+    interval_indexes = []
+    for cidr in reserved_subnets:
+        cidr = str(cidr).strip()
+        interval = reserved_interval_int(parent_net, cidr)
+        if interval is None:
+            reserved.append({"cidr": cidr, "honored": False, "note": f"不在父网段 {parent_net} 内"})
+            continue
+        network, end, prefixlen = interval
+        note = "大于父网段，整个父网段被预留" if prefixlen < parent_net.prefixlen else ""
+        reserved.append({"cidr": cidr, "honored": True, "note": note})
+        interval_indexes.append(len(reserved) - 1)
+        intervals.append((network, end))
+
+    for first, second in iter_nested_ints(intervals):
+        inner = reserved[interval_indexes[second]]
+        if not inner["note"]:
+            outer = reserved[interval_indexes[first]]["cidr"]
+            same = intervals[first] == intervals[second]
+            inner["note"] = f"与预留网段 {outer} 重复" if same else f"包含在预留网段 {outer} 中"
+    return intervals, reserved
+
+
+def plan_subnet_ints(parent_cidr, required_subnets, reserved_subnets=None):
+    """
+    子网规划的整数版本：只计算分配结果，不生成网段详细信息
+
+    子网需求按所需地址块从大到小排序后依次从最低地址分配，已分配的地址总是连续排列，
+    因此每个需求的位置可以直接由已分配地址数算出，不需要枚举候选子网。
+    需求中的count表示需要多少个相同大小的子网（例如65536个/64），只记录起始地址和数量。
+
+    指定reserved_subnets（已使用或预留的网段）时，先用一次集合差从父网段中扣除全部预留网段，
+    再在剩余的空闲网段中按同样的顺序最佳适配分配（SubnetAllocator），空闲空间不连续时
+    count大于1的需求可能被分成多段
 
+    返回:
+    (父网段, 排序后的子网需求, 分配结果, 剩余网段, 预留结果)，分配结果每项为(子网需求, 网络地址整数, 前缀长度, 数量)，
+    按排序后的子网需求顺序排列；剩余网段每项为(网络地址整数, 前缀长度)；预留结果见classify_reserved_subnets，
+    没有预留网段时为空列表；出错时返回错误信息字符串
+    """
+    try:
+        parent_net = parse_network(parent_cidr)
+    except ValueError as e:
+        return str(e)
+
+    bits = parent_net.max_prefixlen
+    for subnet in required_subnets:
+        subnet["prefix_len"] = required_prefix_len(subnet, parent_net)
+        if subnet.get("count", 1) < 1:
+            return f"{subnet['name']} 的子网数量必须大于0"
+
+    # 优先分配大的子网：地址块从大到小，地址块相同时按主机数从大到小，其余保持输入顺序
+    sorted_subnets = sorted(
+        required_subnets, key=lambda x: (x["prefix_len"], -x.get("hosts", 0))
+    )
+
+    parent_int = int(parent_net.network_address)
+    parent_size = parent_net.num_addresses
+    if reserved_subnets:
+        try:
+            intervals, reserved = classify_reserved_subnets(parent_net, reserved_subnets)
+        except ValueError as e:
+            return str(e)
+        version = parent_net.version
+        free = CIDRSet.from_intervals([(parent_int, parent_int + parent_size - 1)], version)
+        free = free - CIDRSet.from_intervals(intervals, version)
+        allocator = SubnetAllocator(free.cidr_ints(), version)
+        allocations = []
         for required in sorted_subnets:
-            allocated = False
-
-            # 尝试在可用子网中找到合适的网段
-            for i, available in enumerate(available_subnets):
-                # 检查可用子网是否有足够的空间
-                if available.prefixlen <= required["prefix_len"]:
-                    # 创建所需的子网
-                    # 确保新前缀长度在有效范围内
-                    new_prefix = required["prefix_len"]
-                    new_prefix = max(new_prefix, 0)
-                    new_prefix = min(new_prefix, 32)
-                    
-                    # 验证是否可以使用该前缀长度创建子网
-                    try:
-                        subnets_list = list(available.subnets(new_prefix=new_prefix))
-                        if not subnets_list:
-                            return {"error": f"无法为 {required['name']} 创建前缀长度为 {new_prefix} 的子网"}
-                        
-                        new_subnet = subnets_list[0]
-                        
-                        # 确保生成的子网有有效的前缀长度
-                        if not (0 <= new_subnet.prefixlen <= 32):
-                            return {"error": f"生成了无效的子网前缀长度: {new_subnet.prefixlen}"}
-                    except ValueError as e:
-                        return {"error": f"创建子网失败: {str(e)}"}
-
-                    # 分配该子网
-                    allocated_subnets.append(
-                        {
-                            "name": required["name"],
-                            "cidr": str(new_subnet),
-                            "required_hosts": required["hosts"],
-                            "available_hosts": (
-                                new_subnet.num_addresses - 2
-                                if new_subnet.num_addresses > 2
-                                else new_subnet.num_addresses
-                            ),
-                            "info": get_subnet_info(str(new_subnet)),
-                        }
-                    )
-
-                    # 更新可用子网列表
-                    remaining = list(available.address_exclude(new_subnet))
-                    available_subnets.pop(i)
-                    available_subnets.extend(remaining)
-                    available_subnets.sort()  # 保持排序
-
-                    allocated = True
-                    break
+            runs = allocator.allocate(required["prefix_len"], required.get("count", 1))
+            if runs is None:
+                return f"无法为 {required['name']} 分配足够大的子网空间"
+            allocations.extend((required, network, prefix_len, count) for network, prefix_len, count in runs)
+        return parent_net, sorted_subnets, allocations, tuple(allocator.free_blocks()), reserved
+
+    used = 0
+    allocations = []
+    for required in sorted_subnets:
+        prefix_len = required["prefix_len"]
+        count = required.get("count", 1)
+        if not parent_net.prefixlen <= prefix_len <= bits:
+            return f"无法为 {required['name']} 分配足够大的子网空间"
+        block_size = 1 << (bits - prefix_len)
+        # 前面分配的地址块都不小于当前地址块，used总是当前地址块大小的整数倍
+        if used + block_size * count > parent_size:
+            return f"无法为 {required['name']} 分配足够大的子网空间"
+        allocations.append((required, parent_int + used, prefix_len, count))
+        used += block_size * count
+
+    # 剩余空间按地址顺序拆分为尽可能大的对齐网段
+    remaining = []
+    while used < parent_size:
+        block_size = used & -used or parent_size
+        remaining.append((parent_int + used, bits - block_size.bit_length() + 1))
+        used += block_size
+    return parent_net, sorted_subnets, allocations, tuple(remaining), []
+
+
+def allocation_record(required, network, prefix_len, count=1, version=4):
+    """生成一条分配记录，count大于1时附带数量和最后一个子网"""
+    info = network_info(network, prefix_len, version)
+    subnet = {
+        "name": required["name"],
+        "cidr": info["cidr"],
+        "required_hosts": required.get("hosts", info["usable_addresses"]),
+        "available_hosts": info["usable_addresses"],
+        "info": info,
+    }
+    if count > 1:
+        bits = 32 if version == 4 else 128
+        last = network + (count - 1) * (1 << (bits - prefix_len))
+        subnet["count"] = count
+        subnet["last_cidr"] = f"{int_to_ip(last, version)}/{prefix_len}"
+    return subnet
+
+
+def suggest_subnet_planning(parent_cidr, required_subnets, reserved_subnets=None):
+    """
+    子网规划智能建议功能
+
+    参数:
+    parent_cidr: 父网段，格式为CIDR (例如: "10.0.0.0/8" 或 "2001:db8::/32")
+    required_subnets: 需要的子网列表，每个子网包含name和hosts两个字段；
+        也可以用prefix字段直接指定前缀长度，用count字段指定相同子网的数量（默认1）
+    reserved_subnets: 可选，父网段中已使用或需要预留的网段列表，规划时不会分配这些地址
 
-            if not allocated:
-                return {"error": f"无法为 {required['name']} 分配足够大的子网空间"}
+    返回:
+    包含建议子网规划的字典。count大于1的需求通常只返回一条分配记录，
+    cidr为第一个子网，last_cidr为最后一个子网，可用iter_allocated_cidrs逐个生成。
+    指定了预留网段时另外包含reserved_subnets，列出每个预留网段是否已扣除（honored）及说明
+    """
+    plan = plan_subnet_ints(parent_cidr, required_subnets, reserved_subnets)
+    if isinstance(plan, str):
+        return {"error": plan}
+
+    parent_net, sorted_subnets, allocations, remaining, reserved = plan
+    version = parent_net.version
+    allocated_subnets = [
+        allocation_record(required, network, prefix_len, count, version)
+        for required, network, prefix_len, count in allocations
+    ]
 
-        return {
-            "parent_cidr": parent_cidr,
-            "required_subnets": required_subnets,
-            "allocated_subnets": allocated_subnets,
-            "remaining_subnets": [str(subnet) for subnet in available_subnets],
-            "remaining_subnets_info": [
-                get_subnet_info(str(subnet)) for subnet in available_subnets
-            ],
-        }
+    result = {
+        "parent_cidr": parent_cidr,
+        "required_subnets": required_subnets,
+        "allocated_subnets": allocated_subnets,
+        "remaining_subnets": [f"{int_to_ip(network, version)}/{prefixlen}" for network, prefixlen in remaining],
+        "remaining_subnets_info": [network_info(network, prefixlen, version) for network, prefixlen in remaining],
+    }
+    if reserved_subnets:
+        result["reserved_subnets"] = reserved
+    return result
 
+
+def suggest_multi_pool_planning(parent_pools, required_subnets):
+    """
+    多地址池子网规划：在多个不连续的父网段（地址池）中分配子网需求
+
+    子网需求仍按地址块从大到小依次分配，全部地址池的空闲网段放在同一个MultiPoolAllocator中，
+    每个需求放入优先级最高的地址池中能容纳它的最小空闲网段，同一优先级的地址池之间按最佳适配选择。
+    某个地址池放不下时自动使用其他地址池，不需要逐个地址池调用suggest_subnet_planning重试
+
+    参数:
+    parent_pools: 地址池列表，每项为CIDR字符串，或{"cidr": ..., "priority": ...}；
+        priority为整数，数值越小越优先，默认0（全部地址池之间只按最佳适配选择）
+    required_subnets: 需要的子网列表，格式与suggest_subnet_planning相同
+
+    返回:
+    与suggest_subnet_planning格式相同的规划结果（parent_cidr为地址池CIDR列表），每条分配记录另有pool字段；
+    count大于1的需求跨越多个地址池时分成多条分配记录。另外包含parent_pools，按输入顺序列出每个地址池的
+    cidr、priority、total_addresses、allocated_addresses和utilization（已分配地址的百分比）。
+    出错时返回包含error的字典
+    """
+    if not parent_pools:
+        return {"error": "缺少地址池"}
+    pools = []
+    for pool in parent_pools:
+        cidr, priority = (pool.get("cidr"), pool.get("priority", 0)) if isinstance(pool, dict) else (pool, 0)
+        cidr = str(cidr or "").strip()
+        try:
+            network, prefix_len, version = parse_network_ints(cidr)
+        except ValueError as e:
+            return {"error": f"地址池 {cidr}: {e}"}
+        try:
+            priority = int(priority)
+        except (TypeError, ValueError):
+            return {"error": f"地址池 {cidr} 的优先级必须是整数"}
+        cidr = f"{int_to_ip(network, version)}/{prefix_len}"
+        pools.append(
+            {"cidr": cidr, "priority": priority, "network": network, "prefix_len": prefix_len, "version": version}
+        )
+    version = pools[0]["version"]
+    if any(pool["version"] != version for pool in pools):
+        return {"error": "地址池不能同时包含IPv4和IPv6网段"}
+    bits = 32 if version == 4 else 128
+    intervals = [(pool["network"], pool["network"] + (1 << (bits - pool["prefix_len"])) - 1) for pool in pools]
+    overlap = next(iter_overlap_ints(intervals), None)
+    if overlap:
+        return {"error": f"地址池 {pools[overlap[1]]['cidr']} 与 {pools[overlap[0]]['cidr']} 重叠"}
+
+    # 按主机数计算前缀长度时不以某个地址池为上限，超过所有地址池的需求在分配时报告空间不足
+    whole_space = parse_network("0.0.0.0/0" if version == 4 else "::/0")
+    for subnet in required_subnets:
+        subnet["prefix_len"] = required_prefix_len(subnet, whole_space)
+        if subnet.get("count", 1) < 1:
+            return {"error": f"{subnet['name']} 的子网数量必须大于0"}
+    sorted_subnets = sorted(required_subnets, key=lambda x: (x["prefix_len"], -x.get("hosts", 0)))
+
+    allocator = MultiPoolAllocator(
+        [(pool["network"], pool["prefix_len"], pool["priority"]) for pool in pools], version
+    )
+    # allocator.pools按地址排序，地址池互不重叠，网络地址可以唯一确定地址池
+    by_network = {pool["network"]: pool for pool in pools}
+    ordered_pools = [by_network[network] for network, _, _ in allocator.pools]
+    allocated_subnets = []
+    for required in sorted_subnets:
+        runs = allocator.allocate(required["prefix_len"], required.get("count", 1))
+        if runs is None:
+            return {"error": f"无法为 {required['name']} 分配足够大的子网空间"}
+        for network, prefix_len, count in runs:
+            size = 1 << (bits - prefix_len)
+            # 相邻地址池中的分配会被合并为一段，按地址池边界拆开
+            while count:
+                pool = ordered_pools[allocator.pool_index(network)]
+                pool_end = pool["network"] + (1 << (bits - pool["prefix_len"]))
+                taken = min(count, (pool_end - network) // size)
+                record = allocation_record(required, network, prefix_len, taken, version)
+                record["pool"] = pool["cidr"]
+                allocated_subnets.append(record)
+                network += taken * size
+                count -= taken
+
+    free_addresses = dict(zip((network for network, _, _ in allocator.pools), allocator.pool_free_addresses()))
+    parent_pools = []
+    for pool in pools:
+        total = 1 << (bits - pool["prefix_len"])
+        allocated = total - free_addresses[pool["network"]]
+        parent_pools.append(
+            {
+                "cidr": pool["cidr"],
+                "priority": pool["priority"],
+                "total_addresses": total,
+                "allocated_addresses": allocated,
+                "utilization": round(allocated * 100 / total, 2),
+            }
+        )
+    remaining = allocator.free_blocks()
+    return {
+        "parent_cidr": [pool["cidr"] for pool in pools],
+        "required_subnets": required_subnets,
+        "allocated_subnets": allocated_subnets,
+        "remaining_subnets": [f"{int_to_ip(network, version)}/{prefixlen}" for network, prefixlen in remaining],
+        "remaining_subnets_info": [network_info(network, prefixlen, version) for network, prefixlen in remaining],
+        "parent_pools": parent_pools,
+    }
+
+
+def iter_allocated_cidrs(allocated_subnet):
+    """
+    逐个生成一条分配记录包含的全部子网CIDR，count很大时也不会一次性生成列表
+    """
+    first = parse_network(allocated_subnet["cidr"])
+    step = first.num_addresses
+    start = int(first.network_address)
+    for i in range(allocated_subnet.get("count", 1)):
+        yield f"{int_to_ip(start + i * step, first.version)}/{first.prefixlen}"
+
+
+def check_previous_plan(previous_plan, parent_net):
+    """
+    检查客户端提交的规划结果：剩余网段和已分配子网都必须在父网段内，且互不重叠
+
+    返回错误信息，没有问题时返回None。网段无效时抛出ValueError
+    """
+    bits = parent_net.max_prefixlen
+    parent_start = int(parent_net.network_address)
+    parent_end = int(parent_net.broadcast_address)
+    labels = []
+    intervals = []
+    for cidr in previous_plan["remaining_subnets"]:
+        labels.append(f"剩余网段 {cidr}")
+        intervals.append((cidr, 1))
+    for subnet in previous_plan["allocated_subnets"]:
+        labels.append(f"{subnet['name']}（{subnet['cidr']}）")
+        intervals.append((subnet["cidr"], subnet.get("count", 1)))
+    for i, (cidr, count) in enumerate(intervals):
+        network, prefix_len, version = parse_network_ints(cidr)
+        if version != parent_net.version:
+            return f"{labels[i]} 与父网段 {parent_net} 的IP版本不同"
+        if count < 1:
+            return f"{labels[i]} 的子网数量必须大于0"
+        end = network + (count << (bits - prefix_len)) - 1
+        if network < parent_start or end > parent_end:
+            return f"{labels[i]} 不在父网段 {parent_net} 内"
+        intervals[i] = (network, end)
+    overlap = next(iter_overlap_ints(intervals), None)
+    if overlap:
+        first, second = overlap
+        return f"{labels[second]} 与 {labels[first]} 重叠，规划结果无效"
+    return None
+
+
+def update_subnet_planning(previous_plan, added_subnets=(), removed_names=()):
+    """
+    增量子网规划：在已有规划结果上删除和新增子网需求，已有的分配保持不变
+
+    以上一次规划的剩余网段作为空闲空间，先释放被删除的子网（与相邻的空闲网段合并），
+    再按地址块从大到小只为新增需求分配子网。不重新排序和分配已有需求，也不重新生成已有记录的详细信息，
+    耗时主要与变更的需求数成正比。空闲空间不连续时，count大于1的新增需求可能被分成多条分配记录
+
+    参数:
+    previous_plan: suggest_subnet_planning或本函数返回的规划结果（已分配子网可以不含info）
+    added_subnets: 新增的子网需求列表，格式与suggest_subnet_planning相同
+    removed_names: 要删除的子网名称，同名的分配记录全部删除
+
+    返回:
+    与suggest_subnet_planning格式相同的规划结果，新增的分配记录排在最后，
+    另外包含added_subnets和removed_subnets两个字段；出错时返回包含error的字典，previous_plan不会被修改
+    """
+    parent_cidr = previous_plan["parent_cidr"]
+    try:
+        parent_net = parse_network(parent_cidr)
+        free_blocks = [parse_network_ints(cidr)[:2] for cidr in previous_plan["remaining_subnets"]]
+    except ValueError as e:
+        return {"error": str(e)}
+    error = check_previous_plan(previous_plan, parent_net)
+    if error:
+        return {"error": error}
+    version = parent_net.version
+    allocator = SubnetAllocator(free_blocks, version)
+
+    removed_names = set(removed_names)
+    missing = removed_names - {subnet["name"] for subnet in previous_plan["allocated_subnets"]}
+    if missing:
+        return {"error": f"规划中没有名为 {'、'.join(sorted(missing))} 的子网"}
+    allocated_subnets = []
+    removed_subnets = []
+    for subnet in previous_plan["allocated_subnets"]:
+        if subnet["name"] not in removed_names:
+            allocated_subnets.append(subnet)
+            continue
+        network, prefix_len, _ = parse_network_ints(subnet["cidr"])
+        allocator.release(network, prefix_len, subnet.get("count", 1))
+        removed_subnets.append(subnet)
+
+    added_subnets = [dict(subnet) for subnet in added_subnets]
+    for subnet in added_subnets:
+        subnet["prefix_len"] = required_prefix_len(subnet, parent_net)
+        if subnet.get("count", 1) < 1:
+            return {"error": f"{subnet['name']} 的子网数量必须大于0"}
+    new_records = []
+    for required in sorted(added_subnets, key=lambda x: (x["prefix_len"], -x.get("hosts", 0))):
+        runs = allocator.allocate(required["prefix_len"], required.get("count", 1))
+        if runs is None:
+            return {"error": f"无法为 {required['name']} 分配足够大的子网空间"}
+        new_records.extend(
+            allocation_record(required, network, prefix_len, count, version) for network, prefix_len, count in runs
+        )
+
+    remaining = allocator.free_blocks()
+    result = {
+        "parent_cidr": parent_cidr,
+        "required_subnets": [
+            subnet for subnet in previous_plan.get("required_subnets", []) if subnet["name"] not in removed_names
+        ]
+        + added_subnets,
+        "allocated_subnets": allocated_subnets + new_records,
+        "remaining_subnets": [f"{int_to_ip(network, version)}/{prefixlen}" for network, prefixlen in remaining],
+        "remaining_subnets_info": [network_info(network, prefixlen, version) for network, prefixlen in remaining],
+        "added_subnets": new_records,
+        "removed_subnets": removed_subnets,
+    }
+    # 预留网段已不在剩余网段中，原样保留预留结果
+    if "reserved_subnets" in previous_plan:
+        result["reserved_subnets"] = previous_plan["reserved_subnets"]
+    return result
+
+
+# 计算量估算使用的单条结果平均JSON大小（字节），按get_subnet_info结果实测取整
+ESTIMATED_SUBNET_INFO_BYTES = 420
+ESTIMATED_ALLOCATED_SUBNET_BYTES = 500
+
+# 默认计算量上限：计算步数约对应数秒计算，剩余网段数和响应大小限制结果展示的规模
+DEFAULT_COST_LIMITS = {
+    "steps": 2000000,
+    "remaining_blocks": 100000,
+    "response_bytes": 50 * 1024 * 1024,
+}
+
+
+def estimate_split_cost(parent_cidr, split_cidr):
+    """
+    估算子网切分的计算量，不执行实际切分
+
+    返回:
+    包含remaining_blocks（剩余网段数）、steps（计算步数）和response_bytes（结果JSON大小）的字典，
+    输入无效时返回包含error的字典
+    """
+    try:
+        parent_net = parse_network(parent_cidr)
+        split_net = parse_network(split_cidr)
     except ValueError as e:
         return {"error": str(e)}
+    if parent_net.version != split_net.version or not split_net.subnet_of(parent_net):
+        return {"error": f"{split_cidr} 不是 {parent_cidr} 的子网"}
+
+    # 从父网段中排除一个子网，前缀长度每相差1位产生一个剩余网段
+    remaining_blocks = split_net.prefixlen - parent_net.prefixlen
+    return {
+        "remaining_blocks": remaining_blocks,
+        "steps": remaining_blocks + 2,
+        "response_bytes": (remaining_blocks + 2) * ESTIMATED_SUBNET_INFO_BYTES,
+    }
+
+
+def estimate_planning_cost(parent_cidr, required_subnets, reserved_subnets=None):
+    """
+    估算子网规划的计算量，不执行实际规划，耗时与子网需求数量成正比
+
+    suggest_subnet_planning按地址块从大到小依次从最低地址分配，已分配的子网总是连续排列，
+    每条需求（无论count多大）生成一条分配记录，剩余网段数等于未分配地址数的二进制中1的个数。
+    指定预留网段时只解析并合并预留区间（排序加一次扫描，O(n log n)），不生成逐条的预留说明，
+    重复或被包含的预留网段另计入计算步数；剩余网段数按扣除后的空闲网段数加分配记录数估算，
+    fits只比较地址总数，是必要条件
+
+    返回:
+    包含allocated_blocks（分配记录数）、remaining_blocks（剩余网段数）、steps（计算步数）、
+    response_bytes（结果JSON大小）和fits（父网段空间是否足够）的字典，输入无效时返回包含error的字典
+    """
+    try:
+        parent_net = parse_network(parent_cidr)
+        blocks = sorted(
+            (
+                required_prefix_len(subnet, parent_net),
+                int(subnet.get("count", 1)),
+            )
+            for subnet in required_subnets
+        )
+        reserved_intervals = [
+            interval[:2]
+            for interval in (reserved_interval_int(parent_net, str(cidr).strip()) for cidr in reserved_subnets or ())
+            if interval is not None
+        ]
+    except (ValueError, TypeError, KeyError) as e:
+        return {"error": str(e)}
+
+    bits = parent_net.max_prefixlen
+    parent_size = parent_net.num_addresses
+    free_blocks = None
+    if reserved_subnets:
+        parent_int = int(parent_net.network_address)
+        free = CIDRSet.from_intervals([(parent_int, parent_int + parent_size - 1)], parent_net.version)
+        free = free - CIDRSet.from_intervals(reserved_intervals, parent_net.version)
+        parent_size = free.num_addresses
+        free_blocks = len(free.cidr_ints())
+
+    used = 0
+    fits = True
+    for prefix_len, count in blocks:
+        if not parent_net.prefixlen <= prefix_len <= bits:
+            fits = False
+            break
+        used += (1 << (bits - prefix_len)) * count
+        if used > parent_size:
+            fits = False
+            break
+
+    allocated_blocks = len(blocks)
+    if not fits:
+        remaining_blocks = 0
+    elif free_blocks is None:
+        remaining_blocks = bin(parent_size - used).count("1")
+    else:
+        remaining_blocks = free_blocks + allocated_blocks
+    reserved_steps = 0
+    if reserved_subnets:
+        reserved_steps = len(reserved_subnets) + sum(1 for _ in iter_nested_ints(reserved_intervals))
+    steps = allocated_blocks + remaining_blocks + reserved_steps
+    return {
+        "allocated_blocks": allocated_blocks,
+        "remaining_blocks": remaining_blocks,
+        "steps": steps,
+        "response_bytes": allocated_blocks * ESTIMATED_ALLOCATED_SUBNET_BYTES
+        + remaining_blocks * ESTIMATED_SUBNET_INFO_BYTES,
+        "fits": fits,
+    }
+
+
+def check_cost_limits(estimate, limits=None):
+    """
+    检查估算的计算量是否超过上限
+
+    参数:
+    estimate: estimate_split_cost或estimate_planning_cost的返回值
+    limits: 上限字典，键与DEFAULT_COST_LIMITS相同，缺省的键使用默认值
+
+    返回:
+    超过上限时返回错误信息，否则返回None
+    """
+    limits = dict(DEFAULT_COST_LIMITS, **(limits or {}))
+    if estimate["steps"] > limits["steps"]:
+        return f"预计计算量过大（约{estimate['steps']:,}步，上限{limits['steps']:,}步），请缩小父网段或合并子网需求"
+    if estimate["remaining_blocks"] > limits["remaining_blocks"]:
+        return f"预计剩余网段过多（{estimate['remaining_blocks']:,}个，上限{limits['remaining_blocks']:,}个）"
+    if estimate["response_bytes"] > limits["response_bytes"]:
+        size_mb = estimate["response_bytes"] / (1024 * 1024)
+        limit_mb = limits["response_bytes"] / (1024 * 1024)
+        return f"预计结果数据过大（约{size_mb:.1f}MB，上限{limit_mb:.0f}MB）"
+    return None
 
 
 # 测试示例
@@ -273,13 +1465,14 @@ if __name__ == "__main__":
             print(f"\n网段 {i}: {subnet['cidr']}")
 
 
-def export_to_csv(data, delimiter=","):
+def export_to_csv(data, delimiter=",", extra_fields=None):
     """
     将子网信息导出为CSV格式
 
     Args:
         data (list): 子网信息列表，每个元素为get_subnet_info返回的字典
         delimiter (str): CSV分隔符
+        extra_fields (list): 附加在子网信息列之前的列名，例如批量处理时的任务编号
 
     Returns:
         str: CSV格式的子网信息
@@ -299,8 +1492,12 @@ def export_to_csv(data, delimiter=","):
         "cidr",
     ]
 
+    if extra_fields:
+        fieldnames = list(extra_fields) + fieldnames
+
     output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=fieldnames, delimiter=delimiter)
+    # get_subnet_info返回的字典还包含其他键，只导出上面列出的列
+    writer = csv.DictWriter(output, fieldnames=fieldnames, delimiter=delimiter, extrasaction="ignore")
 
     writer.writeheader()
     for item in data:
@@ -0,0 +1,8 @@
+@echo off
+rem Command-line batch tool for subnet calculation (netsub.py)
+rem   netsub.bat info 192.168.1.0/24
+rem   netsub.bat split -i jobs.csv -o result.csv -j 4
+rem   netsub.bat plan 192.168.0.0/16 office=200 servers=50
+
+python "%~dp0netsub.py" %*
+exit /b %errorlevel%
@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+命令行批处理工具
+
+不需要GUI或Web服务即可批量执行子网计算，适合在计划任务（cron）中运行：
+
+    python netsub.py info 192.168.1.0/24
+    python netsub.py split 10.0.0.0/8 10.21.60.0/23
+    python netsub.py plan 192.168.0.0/16 办公区=200 服务器区=50
+    python netsub.py plan 2001:db8::/32 vlan=/64*65536
+    python netsub.py split -i jobs.csv -o result.csv -j 4
+
+批量输入支持以下格式（-i指定文件，"-"表示标准输入，按扩展名识别格式，也可用--format指定）：
+- text：每行一个任务，空行和#开头的行忽略
+    info:  192.168.1.0/24
+    split: 10.0.0.0/8 10.21.60.0/23
+    plan:  192.168.0.0/16 办公区=200 服务器区=50 vlan=/28*16
+- csv：带表头，info使用cidr列，split使用parent、split列，
+  plan使用parent、name、hosts列（可选prefix、count列），相邻且job列（没有job列时为parent列）相同的行属于同一个任务
+- ndjson：每行一个JSON对象，info为{"cidr": ...}，split为{"parent": ..., "split": ...}，
+  plan为{"parent": ..., "subnets": [{"name": ..., "hosts": ...}]}，可选"reserved"为预留网段列表
+- json：由上述对象组成的JSON数组
+
+任务逐条读取、计算和写出，内存占用与任务数量无关；-j大于1时使用多进程并行计算，输出顺序与输入顺序一致。
+结果通过计算模块的导出函数写出，格式为csv、json、ndjson、text、excel或pdf（后两种需要-o指定文件）。
+任一任务失败时错误信息写到标准错误，退出码为1。
+"""
+
+import os
+import sys
+import csv
+import json
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+from ip_subnet_calculator import (
+    get_subnet_info,
+    split_subnet,
+    suggest_subnet_planning,
+    estimate_split_cost,
+    estimate_planning_cost,
+    check_cost_limits,
+    export_to_csv,
+    export_to_json,
+    export_to_text,
+    export_to_pdf,
+    export_to_excel,
+)
+from version import __version__
+
+COMMANDS = ["info", "split", "plan"]
+INPUT_FORMATS = ["auto", "text", "csv", "json", "ndjson"]
+OUTPUT_FORMATS = ["csv", "json", "ndjson", "text", "excel", "pdf"]
+INPUT_EXTENSIONS = {
+    ".txt": "text",
+    ".csv": "csv",
+    ".json": "json",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+}
+OUTPUT_EXTENSIONS = {
+    ".csv": "csv",
+    ".json": "json",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".txt": "text",
+    ".xlsx": "excel",
+    ".pdf": "pdf",
+}
+
+# csv输出中每行子网信息前附加的列，用于区分所属任务
+CSV_EXTRA_FIELDS = {
+    "info": ["job"],
+    "split": ["job", "parent", "role"],
+    "plan": ["job", "parent", "role", "name", "required_hosts", "count"],
+}
+
+# 多进程模式下每个工作进程一次领取的任务数
+DEFAULT_CHUNK_SIZE = 64
+
+
+# ---------------------------------------------------------------------------
+# 输入解析：每个任务解析为一个字典，格式错误的任务解析为包含error的字典
+# ---------------------------------------------------------------------------
+
+
+def parse_requirement(token, index):
+    """解析子网需求，只有数字时自动命名
+
+    格式为 名称=主机数 或 名称=/前缀长度，末尾可加 *数量 表示多个相同的子网，例如 vlan=/64*65536
+    """
+    for separator in ("=", ":"):
+        if separator in token:
+            name, size = token.rsplit(separator, 1)
+            break
+    else:
+        name, size = f"子网{index}", token
+    size, _, count = size.partition("*")
+    try:
+        if size.startswith("/"):
+            requirement = {"prefix": int(size[1:])}
+        else:
+            requirement = {"hosts": int(size)}
+        if count:
+            requirement["count"] = int(count)
+    except ValueError:
+        raise ValueError(f"子网需求格式错误: {token}（应为 名称=主机数 或 名称=/前缀长度）")
+    if requirement.get("hosts", 1) <= 0 or requirement.get("count", 1) <= 0:
+        raise ValueError(f"子网需求的主机数和数量必须大于0: {token}")
+    return dict(requirement, name=name.strip() or f"子网{index}")
+
+
+def normalize_requirements(subnets):
+    """规范化JSON输入中的子网需求列表"""
+    if not isinstance(subnets, list) or not subnets:
+        raise ValueError("subnets 必须是非空的子网需求列表")
+    requirements = []
+    for i, subnet in enumerate(subnets, 1):
+        if isinstance(subnet, str):
+            requirements.append(parse_requirement(subnet, i))
+            continue
+        if not isinstance(subnet, dict):
+            raise ValueError(f"第{i}个子网需求格式错误，应包含name和hosts字段")
+        requirement = {"name": str(subnet.get("name") or f"子网{i}")}
+        # csv输入中未使用的列为空字符串
+        for key, label in (("hosts", "主机数"), ("prefix", "前缀长度"), ("count", "子网数量")):
+            if subnet.get(key) in (None, ""):
+                continue
+            try:
+                requirement[key] = int(subnet[key])
+            except (TypeError, ValueError):
+                raise ValueError(f"第{i}个子网需求的{label}必须是整数")
+        if "hosts" not in requirement and "prefix" not in requirement:
+            raise ValueError(f"第{i}个子网需求缺少主机数（hosts）或前缀长度（prefix）")
+        if requirement.get("hosts", 1) <= 0 or requirement.get("count", 1) <= 0:
+            raise ValueError(f"第{i}个子网需求的主机数和数量必须大于0")
+        requirements.append(requirement)
+    return requirements
+
+
+def job_from_tokens(command, tokens):
+    """由一行文本（已按空白或逗号分隔）生成任务"""
+    try:
+        if command == "info":
+            if len(tokens) != 1:
+                raise ValueError("每行应只包含一个网段")
+            return {"cidr": tokens[0]}
+        if command == "split":
+            if len(tokens) != 2:
+                raise ValueError("每行应包含父网段和切分网段")
+            return {"parent": tokens[0], "split": tokens[1]}
+        if len(tokens) < 2:
+            raise ValueError("每行应包含父网段和至少一个子网需求")
+        subnets = [parse_requirement(token, i) for i, token in enumerate(tokens[1:], 1)]
+        return {"parent": tokens[0], "subnets": subnets}
+    except ValueError as e:
+        return {"error": str(e)}
+
+
+def job_from_object(command, item):
+    """由JSON对象生成任务，info任务也可以直接是网段字符串"""
+    if command == "info" and isinstance(item, str):
+        return {"cidr": item}
+    if not isinstance(item, dict):
+        return {"error": "任务格式错误，应为JSON对象"}
+    try:
+        if command == "info":
+            return {"cidr": str(item["cidr"])}
+        if command == "split":
+            return {"parent": str(item["parent"]), "split": str(item["split"])}
+        job = {"parent": str(item["parent"]), "subnets": normalize_requirements(item.get("subnets"))}
+        reserved = item.get("reserved")
+        if reserved:
+            if not isinstance(reserved, list):
+                raise ValueError("reserved 必须是网段列表")
+            job["reserved"] = [str(cidr) for cidr in reserved]
+        return job
+    except KeyError as e:
+        return {"error": f"缺少字段: {e.args[0]}"}
+    except ValueError as e:
+        return {"error": str(e)}
+
+
+def read_text_jobs(command, lines):
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        yield job_from_tokens(command, line.replace(",", " ").split())
+
+
+def read_ndjson_jobs(command, lines):
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            yield {"error": f"JSON格式错误: {e}"}
+            continue
+        yield job_from_object(command, item)
+
+
+def read_json_jobs(command, stream):
+    """JSON数组需要整体解析，数据量很大时建议使用ndjson格式"""
+    data = json.load(stream)
+    if not isinstance(data, list):
+        data = [data]
+    for item in data:
+        yield job_from_object(command, item)
+
+
+def read_csv_jobs(command, lines):
+    reader = csv.DictReader(lines)
+    if command != "plan":
+        for row in reader:
+            yield job_from_object(command, row)
+        return
+
+    # 子网规划：相邻且属于同一任务的行合并为一个任务
+    def group_key(row):
+        return row.get("job") or row.get("parent")
+
+    for _, rows in itertools.groupby(reader, key=group_key):
+        rows = list(rows)
+        item = {"subnets": rows}
+        if rows[0].get("parent"):
+            item["parent"] = rows[0]["parent"]
+        yield job_from_object(command, item)
+
+
+JOB_READERS = {
+    "text": read_text_jobs,
+    "csv": read_csv_jobs,
+    "json": read_json_jobs,
+    "ndjson": read_ndjson_jobs,
+}
+
+
+def detect_format(path, formats, default):
+    """按文件扩展名识别格式"""
+    return formats.get(os.path.splitext(path or "")[1].lower(), default)
+
+
+def iter_jobs(command, args, stream=None):
+    """按输入来源逐个生成任务"""
+    if args.input is None:
+        if command == "info":
+            jobs = (job_from_tokens(command, [item]) for item in args.items)
+        else:
+            jobs = iter([job_from_tokens(command, args.items)])
+    else:
+        input_format = args.format
+        if input_format == "auto":
+            input_format = detect_format(args.input, INPUT_EXTENSIONS, "text")
+        jobs = JOB_READERS[input_format](command, stream)
+
+    reserved = [cidr for value in getattr(args, "reserve", None) or [] for cidr in value.replace(",", " ").split()]
+    if command == "plan" and reserved:
+        # 命令行指定的预留网段用于所有没有单独指定预留网段的任务
+        jobs = (job if "error" in job or "reserved" in job else dict(job, reserved=reserved) for job in jobs)
+    return jobs
+
+
+# ---------------------------------------------------------------------------
+# 计算：在主进程或工作进程中执行单个任务
+# ---------------------------------------------------------------------------
+
+
+def run_job(task):
+    """执行单个任务，task为(命令, 任务, 是否检查计算量上限)，必须是模块级函数以便多进程调用"""
+    command, job, check_limits = task
+    if "error" in job:
+        return job
+    if command == "info":
+        return get_subnet_info(job["cidr"])
+    if command == "split":
+        if check_limits:
+            error = cost_limit_error(estimate_split_cost(job["parent"], job["split"]))
+            if error:
+                return {"error": error}
+        return split_subnet(job["parent"], job["split"])
+    if check_limits:
+        error = cost_limit_error(estimate_planning_cost(job["parent"], job["subnets"], job.get("reserved")))
+        if error:
+            return {"error": error}
+    return suggest_subnet_planning(job["parent"], job["subnets"], job.get("reserved"))
+
+
+def cost_limit_error(estimate):
+    if "error" in estimate:
+        return None
+    return check_cost_limits(estimate)
+
+
+def iter_results(command, jobs, workers=1, check_limits=True, chunk_size=DEFAULT_CHUNK_SIZE):
+    """按输入顺序逐个返回(任务, 结果)
+
+    多进程模式下每次只读取一批任务提交给进程池，输入很大时内存占用也保持稳定
+    """
+    tasks = ((command, job, check_limits) for job in jobs)
+    if workers <= 1:
+        for task in tasks:
+            yield task[1], run_job(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            batch = list(itertools.islice(tasks, chunk_size * workers * 2))
+            if not batch:
+                break
+            for task, result in zip(batch, executor.map(run_job, batch, chunksize=chunk_size)):
+                yield task[1], result
+
+
+# ---------------------------------------------------------------------------
+# 输出：将结果转换为子网信息行后交给导出函数
+# ---------------------------------------------------------------------------
+
+
+def result_rows(command, index, result):
+    """将单个任务的结果转换为子网信息列表，每行附加所属任务等字段"""
+    if command == "info":
+        return [dict(result, job=index)]
+    if command == "split":
+        parent = result["parent"]
+        rows = [dict(result["split_info"], job=index, parent=parent, role="split")]
+        rows.extend(
+            dict(info, job=index, parent=parent, role="remaining")
+            for info in result["remaining_subnets_info"]
+        )
+        return rows
+    parent = result["parent_cidr"]
+    rows = [
+        dict(
+            subnet["info"],
+            job=index,
+            parent=parent,
+            role="allocated",
+            name=subnet["name"],
+            required_hosts=subnet["required_hosts"],
+            count=subnet.get("count", 1),
+        )
+        for subnet in result["allocated_subnets"]
+    ]
+    rows.extend(
+        dict(info, job=index, parent=parent, role="remaining", name="", required_hosts="", count="")
+        for info in result["remaining_subnets_info"]
+    )
+    return rows
+
+
+def job_label(command, job):
+    if command == "info":
+        return job.get("cidr", "")
+    if command == "split":
+        return f"{job.get('parent', '')} - {job.get('split', '')}"
+    return job.get("parent", "")
+
+
+class ResultWriter:
+    """将计算结果逐个写入输出流，excel和pdf格式在结束时一次写入文件"""
+
+    def __init__(self, command, output_format, stream=None, file_path=None):
+        self.command = command
+        self.output_format = output_format
+        self.stream = stream
+        self.file_path = file_path
+        self.count = 0
+        self.rows = []
+
+    def write(self, index, job, result):
+        if self.output_format in ("json", "ndjson"):
+            # JSON输出保留失败的任务，便于按job字段对应输入
+            self._write_json(dict(result, job=index))
+            return
+        if "error" in result:
+            return
+
+        rows = result_rows(self.command, index, result)
+        if self.output_format == "csv":
+            text = export_to_csv(rows, extra_fields=CSV_EXTRA_FIELDS[self.command])
+            if self.count:
+                # 只保留第一个任务的表头
+                text = text.split("\n", 1)[1]
+            self.stream.write(text)
+        elif self.output_format == "text":
+            self.stream.write(f"# 任务 {index}: {job_label(self.command, job)}\n")
+            self.stream.write(export_to_text(rows))
+        else:
+            self.rows.extend(rows)
+        self.count += 1
+
+    def _write_json(self, data):
+        if self.output_format == "ndjson":
+            self.stream.write(export_to_json(data, indent=None) + "\n")
+        else:
+            self.stream.write("[\n" if not self.count else ",\n")
+            self.stream.write(export_to_json(data))
+        self.count += 1
+
+    def close(self):
+        """结束输出，返回是否成功"""
+        if self.output_format == "json":
+            self.stream.write("[\n" if not self.count else "\n")
+            self.stream.write("]\n")
+        elif self.output_format == "excel":
+            return export_to_excel(self.rows, self.file_path)
+        elif self.output_format == "pdf":
+            return export_to_pdf(self.rows, self.file_path)
+        return True
+
+
+# ---------------------------------------------------------------------------
+# 命令行入口
+# ---------------------------------------------------------------------------
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="netsub",
+        description="IP子网计算命令行工具：查询网段信息、子网切分和子网规划，支持批量处理输入文件",
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    usages = {
+        "info": ("查询网段信息", "网段，可以有多个"),
+        "split": ("子网切分", "父网段和切分网段"),
+        "plan": ("子网规划", "父网段和子网需求（名称=主机数 或 名称=/前缀长度，可加*数量）"),
+    }
+    for command in COMMANDS:
+        help_text, items_help = usages[command]
+        sub = subparsers.add_parser(command, help=help_text, description=help_text)
+        sub.add_argument("items", nargs="*", help=items_help)
+        sub.add_argument("-i", "--input", help='批量任务输入文件，"-"表示标准输入')
+        sub.add_argument("--format", choices=INPUT_FORMATS, default="auto", help="输入文件格式")
+        sub.add_argument("-o", "--output", help="输出文件，默认写到标准输出")
+        sub.add_argument("-t", "--to", choices=OUTPUT_FORMATS, help="输出格式，默认按输出文件扩展名识别，否则为text")
+        sub.add_argument("-j", "--jobs", type=int, default=1, help="并行计算的进程数，默认1")
+        sub.add_argument(
+            "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="多进程模式下每个进程一次领取的任务数"
+        )
+        sub.add_argument("--no-limit", action="store_true", help="不检查计算量上限")
+        sub.add_argument("-q", "--quiet", action="store_true", help="不输出处理进度和统计信息")
+        if command == "plan":
+            sub.add_argument(
+                "-r", "--reserve", action="append", metavar="CIDR", help="预留网段，可重复指定或用逗号分隔，规划时不分配这些地址"
+            )
+    return parser
+
+
+def open_input(path):
+    if path == "-":
+        return sys.stdin
+    # csv模块要求以newline=""打开文件，其他格式按行读取时效果相同
+    return open(path, "r", encoding="utf-8-sig", newline="")
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    command = args.command
+
+    if args.input is None and not args.items:
+        parser.error("请指定要计算的网段，或使用 -i 指定批量任务输入文件")
+    if args.input is not None and args.items:
+        parser.error("不能同时指定网段参数和 -i 输入文件")
+
+    output_format = args.to or detect_format(args.output, OUTPUT_EXTENSIONS, "text")
+    if output_format in ("excel", "pdf") and not args.output:
+        parser.error(f"{output_format} 格式需要使用 -o 指定输出文件")
+
+    input_stream = output_stream = None
+    total = failed = 0
+    try:
+        # 输入输出文件也在这里打开，文件不存在或无法写入时与计算错误一样只输出错误信息
+        input_stream = open_input(args.input) if args.input is not None else None
+        if output_format in ("excel", "pdf"):
+            output_stream = None
+        elif args.output and args.output != "-":
+            output_stream = open(args.output, "w", encoding="utf-8", newline="")
+        else:
+            output_stream = sys.stdout
+        writer = ResultWriter(command, output_format, output_stream, args.output)
+        jobs = iter_jobs(command, args, input_stream)
+        results = iter_results(command, jobs, max(1, args.jobs), not args.no_limit, max(1, args.chunk_size))
+        for total, (job, result) in enumerate(results, 1):
+            if "error" in result:
+                failed += 1
+                label = job_label(command, job) if "error" not in job else ""
+                label = f"（{label}）" if label else ""
+                print(f"任务 {total} 失败{label}: {result['error']}", file=sys.stderr)
+            writer.write(total, job, result)
+        if not writer.close():
+            print("写入输出文件失败", file=sys.stderr)
+            return 1
+    except (OSError, ValueError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if input_stream not in (None, sys.stdin):
+            input_stream.close()
+        if output_stream not in (None, sys.stdout):
+            output_stream.close()
+
+    if not args.quiet and args.input is not None:
+        print(f"完成 {total} 个任务，失败 {failed} 个", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
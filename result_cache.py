@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+计算结果缓存模块
+
+Web界面在切换标签页时会重新提交表单，分页接口每翻一页也要重新计算一次，
+这里为子网切分和子网规划结果提供缓存：
+- 缓存键由规范化后的父网段/切分网段或父网段/子网需求生成，写法不同但含义相同的输入共用同一条缓存
+- 支持过期时间（TTL）和按条目数限制的LRU淘汰
+- 后端可替换：进程内内存缓存，或兼容Redis协议的本地服务（Redis、Memurai、Valkey等），
+  后者可在多个Web工作进程之间共享
+- 统计命中次数、未命中次数等指标，供统计接口查询
+
+通过环境变量配置：
+    NETSUB_CACHE_BACKEND      memory（默认）、redis 或 off
+    NETSUB_CACHE_TTL          缓存过期时间（秒），默认300
+    NETSUB_CACHE_MAX_ENTRIES  内存缓存最大条目数，默认256
+    NETSUB_REDIS_URL          Redis地址，默认 redis://127.0.0.1:6379/0
+"""
+
+import os
+import json
+import time
+import socket
+import hashlib
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse, unquote
+
+from ip_subnet_calculator import parse_network
+
+
+def split_cache_key(parent_cidr, split_cidr):
+    """生成子网切分结果的缓存键，输入无效时返回None（不缓存）"""
+    try:
+        parent = parse_network(parent_cidr)
+        split = parse_network(split_cidr)
+    except ValueError:
+        return None
+    return f"split:{parent}|{split}"
+
+
+def plan_cache_key(parent_cidr, required_subnets, reserved_subnets=None):
+    """生成子网规划结果的缓存键，输入无效时返回None（不缓存）
+
+    规划结果与子网需求的顺序有关（主机数相同时按输入顺序分配），因此保留需求顺序；
+    预留结果按输入顺序列出每个预留网段，因此预留网段也保留原始顺序和写法
+    """
+    try:
+        parent = parse_network(parent_cidr)
+        requirements = [
+            [str(subnet["name"]), subnet.get("hosts"), subnet.get("prefix"), subnet.get("count", 1)]
+            for subnet in required_subnets
+        ]
+    except (ValueError, TypeError, KeyError):
+        return None
+    if reserved_subnets:
+        requirements.append(["reserved", [str(cidr).strip() for cidr in reserved_subnets]])
+    digest = hashlib.sha1(json.dumps(requirements, ensure_ascii=False).encode("utf-8")).hexdigest()
+    return f"plan:{parent}|{digest}"
+
+
+class MemoryCacheBackend:
+    """进程内缓存：按最近使用顺序淘汰，条目数超过上限时淘汰最久未使用的条目"""
+
+    name = "memory"
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            size = len(self._entries)
+        return {
+            "size": size,
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class RedisCacheBackend:
+    """兼容Redis协议的缓存后端
+
+    内置一个只实现GET/SET/DEL/SCAN等少量命令的RESP客户端，不需要额外安装依赖。
+    过期由服务端的SET EX处理，容量上限和淘汰策略由服务端的maxmemory配置决定。
+    """
+
+    name = "redis"
+
+    def __init__(self, url="redis://127.0.0.1:6379/0", prefix="netsub:", timeout=1.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.prefix = prefix
+        self.timeout = timeout
+        self._sock = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._reader = self._sock.makefile("rb")
+        if self.password:
+            self._execute("AUTH", self.password)
+        if self.db:
+            self._execute("SELECT", self.db)
+
+    def _close(self):
+        if self._sock is not None:
+            try:
+                self._reader.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._reader = None
+
+    def _execute(self, *args):
+        """发送一条命令并读取回复"""
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Redis连接已关闭")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            raise RuntimeError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(payload)
+            if count < 0:
+                return None
+            return [self._read_reply() for _ in range(count)]
+        raise RuntimeError(f"无法解析的Redis回复: {line!r}")
+
+    def command(self, *args):
+        """执行命令，连接断开时重连一次"""
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._execute(*args)
+                except (OSError, ConnectionError):
+                    self._close()
+                    if attempt:
+                        raise
+
+    def get(self, key):
+        data = self.command("GET", self.prefix + key)
+        if data is None:
+            return None
+        return json.loads(data.decode("utf-8"))
+
+    def set(self, key, value, ttl):
+        data = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        self.command("SET", self.prefix + key, data, "EX", max(1, int(ttl)))
+
+    def clear(self):
+        cursor = "0"
+        while True:
+            cursor, keys = self.command("SCAN", cursor, "MATCH", self.prefix + "*", "COUNT", 500)
+            cursor = cursor.decode("utf-8")
+            if keys:
+                self.command("DEL", *keys)
+            if cursor == "0":
+                break
+
+    def stats(self):
+        return {"host": self.host, "port": self.port, "db": self.db}
+
+
+class ResultCache:
+    """计算结果缓存，统计命中指标；后端出错时直接计算，不影响正常请求"""
+
+    def __init__(self, backend=None, ttl=300):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.errors = 0
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get_or_compute(self, key, compute):
+        """返回缓存中的结果，未命中时调用compute()计算；包含error的结果不缓存
+
+        缓存的结果会被多个请求共享，调用方不应修改返回的字典
+        """
+        if self.backend is None or key is None:
+            return compute()
+
+        try:
+            value = self.backend.get(key)
+        except Exception:
+            value = None
+            self._count("errors")
+        if value is not None:
+            self._count("hits")
+            return value
+
+        self._count("misses")
+        value = compute()
+        if "error" not in value:
+            try:
+                self.backend.set(key, value, self.ttl)
+                self._count("stores")
+            except Exception:
+                self._count("errors")
+        return value
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            data = {
+                "backend": self.backend.name if self.backend is not None else "off",
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "errors": self.errors,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+        if self.backend is not None:
+            try:
+                data.update(self.backend.stats())
+            except Exception:
+                pass
+        return data
+
+
+def create_result_cache():
+    """根据环境变量创建结果缓存"""
+    backend_name = os.environ.get("NETSUB_CACHE_BACKEND", "memory").strip().lower()
+    ttl = int(os.environ.get("NETSUB_CACHE_TTL", "300"))
+
+    if backend_name == "redis":
+        backend = RedisCacheBackend(os.environ.get("NETSUB_REDIS_URL", "redis://127.0.0.1:6379/0"))
+    elif backend_name in ("off", "none", "0"):
+        backend = None
+    else:
+        backend = MemoryCacheBackend(int(os.environ.get("NETSUB_CACHE_MAX_ENTRIES", "256")))
+    return ResultCache(backend, ttl)
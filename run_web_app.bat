@@ -18,8 +18,15 @@ if %errorlevel% neq 0 (
 )
 
 rem Run the web application
+rem   run_web_app.bat          production server, worker pool sized to CPU count (serve_web.py)
+rem   run_web_app.bat dev      Flask development server with debug mode (web_app.py)
+rem   Extra arguments are passed to serve_web.py, e.g. run_web_app.bat --port 8080 --workers 8
 echo Starting web server...
-python web_app.py
+if /i "%~1"=="dev" (
+    python web_app.py
+) else (
+    python serve_web.py %*
+)
 
 rem Check if application exited normally
 if %errorlevel% neq 0 (
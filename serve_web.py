@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Web版生产环境启动脚本
+
+python web_app.py 启动的是Flask开发服务器（单进程、调试模式），只适合开发调试。
+本脚本使用多工作进程/多线程的WSGI服务器运行同一个应用，工作进程数默认等于CPU核心数：
+
+- waitress：Windows下优先使用的多线程服务器（pip install waitress）
+- gunicorn：Linux/macOS下优先使用的预派生（pre-fork）多进程服务器（pip install gunicorn）
+- prefork：内置的预派生多进程服务器（仅Linux/macOS），未安装gunicorn时使用
+- threaded：Werkzeug多线程服务器，未安装waitress时在Windows下使用
+
+多进程模式下，主进程先导入web_app（计算模块、预编译模板等），再派生工作进程，
+工作进程通过写时复制共享这部分内存。注意进程内结果缓存不在工作进程之间共享，
+如需共享可设置 NETSUB_CACHE_BACKEND=redis。
+
+每个工作进程各有一个计算进程池（见compute_pool.py）。gunicorn和prefork模式下本脚本把工作进程数写入
+NETSUB_WEB_WORKERS，每个进程池默认大小为 CPU核心数 // 工作进程数，整台机器的计算进程总数约为CPU核心数；
+也可以用 NETSUB_POOL_WORKERS 直接指定每个工作进程的进程池大小。
+
+用法:
+    python serve_web.py [--host 0.0.0.0] [--port 5000] [--workers 4] [--server auto]
+"""
+
+import os
+import sys
+import signal
+import socket
+import argparse
+import importlib.util
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+SERVER_CHOICES = ["auto", "waitress", "gunicorn", "prefork", "threaded"]
+# 每个工作进程是独立进程、各自创建计算进程池的服务器
+MULTIPROCESS_SERVERS = {"gunicorn", "prefork"}
+
+
+def load_app():
+    """导入Web应用，多进程模式下在派生工作进程之前调用"""
+    from web_app import app
+
+    return app
+
+
+def shutdown_app():
+    """关闭Web应用创建的计算进程池，避免留下孤立的工作进程"""
+    web_app = sys.modules.get("web_app")
+    if web_app is not None and web_app.PLAN_POOL is not None:
+        web_app.PLAN_POOL.shutdown()
+
+
+def exit_on_sigterm(signum, frame):
+    """收到SIGTERM时正常退出，执行清理逻辑"""
+    sys.exit(0)
+
+
+def is_installed(module_name):
+    """检查可选依赖是否已安装"""
+    return importlib.util.find_spec(module_name) is not None
+
+
+def choose_server(server):
+    """auto模式下根据平台和已安装的依赖选择服务器"""
+    if server != "auto":
+        return server
+    if sys.platform == "win32":
+        return "waitress" if is_installed("waitress") else "threaded"
+    return "gunicorn" if is_installed("gunicorn") else "prefork"
+
+
+def serve_waitress(app, host, port, workers):
+    """使用waitress多线程服务器运行"""
+    from waitress import serve
+
+    serve(app, host=host, port=port, threads=workers)
+
+
+def serve_gunicorn(app, host, port, workers):
+    """使用gunicorn预派生多进程服务器运行，应用在主进程中预加载"""
+    from gunicorn.app.base import BaseApplication
+
+    class StandaloneApplication(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    options = {"bind": f"{host}:{port}", "workers": workers, "preload_app": True}
+    StandaloneApplication(app, options).run()
+
+
+def serve_prefork(app, host, port, workers):
+    """内置的预派生多进程服务器：主进程监听端口，工作进程共享监听套接字处理请求"""
+    from werkzeug.serving import make_server
+
+    if not hasattr(os, "fork"):
+        raise RuntimeError("prefork模式需要fork支持，Windows下请使用waitress或threaded模式")
+
+    listener = socket.create_server((host, port), backlog=128)
+    children = set()
+    stopping = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, exit_on_sigterm)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            try:
+                server = make_server(host, port, app, fd=listener.fileno())
+                server.serve_forever()
+            except (SystemExit, KeyboardInterrupt):
+                pass
+            finally:
+                shutdown_app()
+                os._exit(0)
+        children.add(pid)
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    for _ in range(workers):
+        spawn()
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"prefork服务器已启动: http://{host}:{port} ({workers} 个工作进程)")
+
+    while children:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        # 工作进程意外退出时重新派生
+        if not stopping:
+            spawn()
+    listener.close()
+
+
+def serve_threaded(app, host, port, workers):
+    """使用Werkzeug多线程服务器运行（每个请求一个线程）"""
+    from werkzeug.serving import make_server
+
+    print(f"threaded服务器已启动: http://{host}:{port}")
+    make_server(host, port, app, threaded=True).serve_forever()
+
+
+SERVERS = {
+    "waitress": serve_waitress,
+    "gunicorn": serve_gunicorn,
+    "prefork": serve_prefork,
+    "threaded": serve_threaded,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Web版生产环境启动脚本")
+    parser.add_argument("--host", default="0.0.0.0", help="监听地址")
+    parser.add_argument("--port", type=int, default=5000, help="监听端口")
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS, help=f"工作进程/线程数（默认CPU核心数: {DEFAULT_WORKERS}）"
+    )
+    parser.add_argument("--server", choices=SERVER_CHOICES, default="auto", help="WSGI服务器类型")
+    args = parser.parse_args()
+
+    server = choose_server(args.server)
+    workers = max(1, args.workers)
+    # 必须在导入web_app之前设置，计算进程池按它平分CPU核心数
+    os.environ["NETSUB_WEB_WORKERS"] = str(workers if server in MULTIPROCESS_SERVERS else 1)
+    app = load_app()
+    print(f"使用 {server} 服务器，工作进程/线程数: {args.workers}")
+    signal.signal(signal.SIGTERM, exit_on_sigterm)
+    try:
+        SERVERS[server](app, args.host, args.port, workers)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_app()
+
+
+if __name__ == "__main__":
+    main()
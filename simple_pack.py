@@ -3,7 +3,7 @@
 
 """
 简单的PyInstaller打包脚本
-仅生成单文件版本，并支持添加数字签名
+默认生成单文件版本，可选生成目录版本，并支持添加数字签名
 """
 
 import os
@@ -11,6 +11,36 @@ import shutil
 import sys
 import argparse
 
+# 程序名称
+APP_NAME = "IP子网分割工具"
+
+# 应用未使用、但可能被PyInstaller从环境中带入的重型模块
+# 使用--slim参数时排除，减小打包体积（单文件版本每次启动都要解压全部内容）
+HEAVY_EXCLUDE_MODULES = [
+    "numpy",
+    "pandas",
+    "matplotlib",
+    "scipy",
+    "PIL",
+    "IPython",
+    "jupyter",
+    "notebook",
+    "flask",
+    "werkzeug",
+    "jinja2",
+    "setuptools",
+    "pkg_resources",
+    "pip",
+    "distutils",
+    "lib2to3",
+    "pydoc",
+    "doctest",
+    "unittest",
+    "test",
+    "tkinter.test",
+    "pytest",
+]
+
 
 # 清理旧的打包文件
 def clean_old_builds():
@@ -22,13 +52,14 @@ def clean_old_builds():
 
 
 # 创建新的打包配置
-def create_pack_config(pack_type="onefile"):
+def create_pack_config(pack_type="onefile", slim=False):
     """创建打包配置
 
     Args:
         pack_type: 打包类型，'onefile'或'onedir'
+        slim: 是否排除应用未使用的重型模块以减小打包体积
     """
-    print(f"创建{pack_type}版本打包配置...")
+    print(f"创建{pack_type}版本打包配置{'（精简模式）' if slim else ''}...")
 
     # 基础命令
     cmd = [
@@ -38,7 +69,7 @@ def create_pack_config(pack_type="onefile"):
         f"--{pack_type}",  # 打包模式
         "--windowed",  # 窗口模式，无控制台
         "--icon=icon.ico",  # 指定图标
-        "--name=IP子网分割工具",  # 程序名称
+        f"--name={APP_NAME}",  # 程序名称
         "--distpath=dist",  # 输出目录
         "--workpath=build",  # 工作目录
         "--clean",  # 清理临时文件
@@ -70,6 +101,10 @@ def create_pack_config(pack_type="onefile"):
             ]
         )
 
+    # 精简模式：排除应用未使用的重型模块
+    if slim:
+        cmd.extend(f"--exclude-module={module}" for module in HEAVY_EXCLUDE_MODULES)
+
     cmd.append("windows_app.py")  # 主程序文件
 
     return cmd
@@ -93,19 +128,44 @@ def run_pack(cmd):
         return False
 
 
+# 获取打包后EXE文件的路径
+def get_exe_path(pack_type="onefile", dist_dir="dist"):
+    """获取指定打包类型生成的EXE文件路径
+
+    Args:
+        pack_type: 打包类型，'onefile'或'onedir'
+        dist_dir: 输出目录
+    """
+    if pack_type == "onedir":
+        return os.path.join(dist_dir, APP_NAME, f"{APP_NAME}.exe")
+    return os.path.join(dist_dir, f"{APP_NAME}.exe")
+
+
+# 计算打包结果的总大小（单文件版本为EXE大小，目录版本为整个目录大小）
+def get_bundle_size(pack_type="onefile", dist_dir="dist"):
+    exe_path = get_exe_path(pack_type, dist_dir)
+    if pack_type == "onefile":
+        return os.path.getsize(exe_path) if os.path.exists(exe_path) else 0
+
+    total = 0
+    for dirpath, _, filenames in os.walk(os.path.dirname(exe_path)):
+        for filename in filenames:
+            total += os.path.getsize(os.path.join(dirpath, filename))
+    return total
+
+
 # 测试打包结果
-def test_pack_result(sign_info=None):
+def test_pack_result(sign_info=None, pack_type="onefile"):
     print("检查打包结果...")
 
     # 查找EXE文件
-    import glob
+    exe_path = get_exe_path(pack_type)
 
-    exe_files = glob.glob(os.path.join("dist", "**", "IP子网分割工具.exe"), recursive=True)
-
-    if exe_files:
-        exe_path = exe_files[0]
+    if os.path.exists(exe_path):
         print(f"EXE文件已生成: {exe_path}")
         print(f"文件大小: {os.path.getsize(exe_path) / (1024*1024):.2f} MB")
+        if pack_type == "onedir":
+            print(f"目录总大小: {get_bundle_size(pack_type) / (1024*1024):.2f} MB")
 
         # 手动复制图标文件到EXE所在目录
         icon_path = os.path.abspath("icon.ico")
@@ -179,7 +239,18 @@ def sign_exe(exe_path, sign_info):
 # 主函数
 def main():
     # 设置命令行参数解析
-    parser = argparse.ArgumentParser(description="IP子网分割工具打包程序 - 仅生成单文件版本")
+    parser = argparse.ArgumentParser(description="IP子网分割工具打包程序")
+
+    # 打包参数
+    parser.add_argument(
+        "--mode",
+        choices=["onefile", "onedir", "both"],
+        default="onefile",
+        help="打包类型：单文件版本、目录版本或同时生成两种版本（默认单文件版本）",
+    )
+    parser.add_argument(
+        "--slim", action="store_true", help="排除应用未使用的重型模块，减小打包体积和单文件版本的解压耗时"
+    )
 
     # 代码签名参数
     parser.add_argument("--sign", action="store_true", help="为生成的EXE文件添加数字签名")
@@ -190,9 +261,17 @@ def main():
     args = parser.parse_args()
 
     # 打印欢迎信息
+    pack_types = ["onefile", "onedir"] if args.mode == "both" else [args.mode]
+
     print("IP子网分割工具打包程序")
     print("=" * 40)
-    print("仅生成单文件版本 (--onefile) [独立运行，优化减少误报]")
+    for pack_type in pack_types:
+        if pack_type == "onefile":
+            print("生成单文件版本 (--onefile) [独立运行，优化减少误报]")
+        else:
+            print("生成目录版本 (--onedir) [启动无需解压，启动更快]")
+    if args.slim:
+        print("精简模式：排除未使用的重型模块")
     print("=" * 40)
 
     # 检查签名参数
@@ -213,30 +292,34 @@ def main():
     # 清理旧文件
     clean_old_builds()
 
-    # 执行单文件版本打包
-    print(f"\n{'=' * 40}")
-    print("开始打包单文件版本...")
-    print(f"{'=' * 40}")
-
-    # 创建并执行打包命令
-    cmd = create_pack_config("onefile")
-    print(f"执行命令: {' '.join(cmd)}")
-
-    if run_pack(cmd):
-        # 测试打包结果并进行签名
-        exe_path = test_pack_result(sign_info)
-        if exe_path:
-            print("\n✅ 打包完成！您可以在以下路径找到程序:")
-            print(exe_path)
-
-            print("\n💡 提示: 单文件版本已优化减少360误报")
-
-            if sign_info:
-                print("\n🔒 提示: 程序已进行数字签名，可降低360等安全软件的误报率")
+    for pack_type in pack_types:
+        type_name = "单文件版本" if pack_type == "onefile" else "目录版本"
+        print(f"\n{'=' * 40}")
+        print(f"开始打包{type_name}...")
+        print(f"{'=' * 40}")
+
+        # 创建并执行打包命令
+        cmd = create_pack_config(pack_type, slim=args.slim)
+        print(f"执行命令: {' '.join(cmd)}")
+
+        if run_pack(cmd):
+            # 测试打包结果并进行签名
+            exe_path = test_pack_result(sign_info, pack_type)
+            if exe_path:
+                print(f"\n✅ {type_name}打包完成！您可以在以下路径找到程序:")
+                print(exe_path)
+
+                if pack_type == "onefile":
+                    print("\n💡 提示: 单文件版本已优化减少360误报")
+
+                if sign_info:
+                    print("\n🔒 提示: 程序已进行数字签名，可降低360等安全软件的误报率")
+            else:
+                print("\n❌ 打包过程完成，但未找到生成的EXE文件。")
         else:
-            print("\n❌ 打包过程完成，但未找到生成的EXE文件。")
-    else:
-        print("\n❌ 打包过程失败，请检查错误信息。")
+            print(f"\n❌ {type_name}打包过程失败，请检查错误信息。")
+
+    print("\n💡 提示: 可运行 python benchmarks/bench_startup.py 对比各版本的启动耗时")
 
     print(f"\n{'=' * 40}")
     print("打包任务已完成！")
@@ -0,0 +1,377 @@
+// 子网切分/规划结果渲染
+// 服务器只嵌入一份列式JSON数据（网络地址整数和前缀长度）的第一页，表格和图表都在浏览器端生成，
+// 其余页面在翻页时通过分页接口（offset/limit）获取，首屏渲染耗时与结果规模无关。
+// IPv6网络地址以字符串传递，使用BigInt计算
+
+// 整数转换为点分十进制IP地址
+function intToIp(value) {
+    return [(value >>> 24) & 255, (value >>> 16) & 255, (value >>> 8) & 255, value & 255].join('.');
+}
+
+// IPv6地址字符串转换为BigInt（使用BigInt()而不是字面量，不支持BigInt的旧浏览器仍可正常处理IPv4）
+function ipv6ToBigInt(address) {
+    var halves = address.split('::');
+    var head = halves[0] ? halves[0].split(':') : [];
+    var tail = halves.length > 1 && halves[1] ? halves[1].split(':') : [];
+    var groups = head.concat(new Array(8 - head.length - tail.length).fill('0'), tail);
+    return groups.reduce(function(value, group) {
+        return (value << BigInt(16)) | BigInt('0x' + group);
+    }, BigInt(0));
+}
+
+// BigInt转换为压缩格式的IPv6地址，最长的一段连续0（至少两组）缩写为::
+function bigIntToIpv6(value) {
+    var groups = [];
+    for (var i = 7; i >= 0; i--) {
+        groups.push(Number((value >> BigInt(i * 16)) & BigInt(0xFFFF)));
+    }
+    var bestStart = -1, bestLength = 1;
+    for (var start = 0; start < 8; start++) {
+        var length = 0;
+        while (start + length < 8 && groups[start + length] === 0) length++;
+        if (length > bestLength) {
+            bestStart = start;
+            bestLength = length;
+        }
+    }
+    var text = groups.map(function(group) { return group.toString(16); });
+    if (bestStart < 0) return text.join(':');
+    return text.slice(0, bestStart).join(':') + '::' + text.slice(bestStart + bestLength).join(':');
+}
+
+// IPv6网段信息：没有广播地址，broadcast为最后一个地址，全部地址均可用
+function subnetInfo6(address, prefix) {
+    var network = ipv6ToBigInt(address);
+    var numAddresses = BigInt(1) << BigInt(128 - prefix);
+    var wildcard = numAddresses - BigInt(1);
+    var mask = ((BigInt(1) << BigInt(128)) - BigInt(1)) ^ wildcard;
+    var networkText = bigIntToIpv6(network);
+    var broadcast = bigIntToIpv6(network + wildcard);
+    return {
+        cidr: networkText + '/' + prefix,
+        network: networkText,
+        netmask: bigIntToIpv6(mask),
+        wildcard: bigIntToIpv6(wildcard),
+        broadcast: broadcast,
+        prefixlen: prefix,
+        num_addresses: numAddresses,
+        usable_addresses: numAddresses,
+        host_range_start: networkText,
+        host_range_end: broadcast
+    };
+}
+
+// 根据网络地址整数和前缀长度计算网段信息，计算规则与ip_subnet_calculator.get_subnet_info一致
+function subnetInfo(network, prefix) {
+    if (typeof network === 'string') return subnetInfo6(network, prefix);
+    var numAddresses = Math.pow(2, 32 - prefix);
+    var mask = prefix === 0 ? 0 : (0xFFFFFFFF << (32 - prefix)) >>> 0;
+    var wildcard = (~mask) >>> 0;
+    var broadcast = (network + numAddresses - 1) >>> 0;
+    var hasHostRange = numAddresses > 2;
+    return {
+        cidr: intToIp(network) + '/' + prefix,
+        network: intToIp(network),
+        netmask: intToIp(mask),
+        wildcard: intToIp(wildcard),
+        broadcast: intToIp(broadcast),
+        prefixlen: prefix,
+        num_addresses: numAddresses,
+        usable_addresses: hasHostRange ? numAddresses - 2 : numAddresses,
+        host_range_start: intToIp(hasHostRange ? network + 1 : network),
+        host_range_end: intToIp(hasHostRange ? broadcast - 1 : broadcast)
+    };
+}
+
+// 转义HTML特殊字符
+function escapeHtml(text) {
+    return String(text)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;');
+}
+
+// 读取页面中嵌入的JSON数据
+function readResultData(elementId) {
+    var element = document.getElementById(elementId);
+    if (!element) return null;
+    try {
+        return JSON.parse(element.textContent);
+    } catch (e) {
+        console.error('解析结果数据失败:', e);
+        return null;
+    }
+}
+
+// 请求分页接口，body为空时使用GET请求
+function fetchJson(url, body) {
+    var options = body ? {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify(body)
+    } : {};
+    return fetch(url, options).then(function(response) {
+        return response.json().then(function(data) {
+            if (!response.ok) throw new Error(data.error || response.status);
+            return data;
+        });
+    });
+}
+
+// 分页结果：缓存已获取的页面，翻页时按需通过fetchPage(offset, limit)获取
+function PagedResult(firstPage, pageSize, fetchPage) {
+    this.total = firstPage.total;
+    this.pageSize = pageSize;
+    this.fetchPage = fetchPage;
+    this.pages = {0: firstPage};
+    this.pageIndex = 0;
+    this.listeners = [];
+}
+
+PagedResult.prototype.pageCount = function() {
+    return Math.max(1, Math.ceil(this.total / this.pageSize));
+};
+
+PagedResult.prototype.current = function() {
+    return this.pages[this.pageIndex];
+};
+
+PagedResult.prototype.onChange = function(listener) {
+    this.listeners.push(listener);
+    listener(this.current());
+};
+
+PagedResult.prototype.goTo = function(pageIndex) {
+    if (pageIndex < 0 || pageIndex >= this.pageCount() || pageIndex === this.pageIndex) return;
+    var self = this;
+    var cached = this.pages[pageIndex];
+    var load = cached ? Promise.resolve(cached) : this.fetchPage(pageIndex * this.pageSize, this.pageSize);
+    load.then(function(page) {
+        self.pages[pageIndex] = page;
+        self.pageIndex = pageIndex;
+        self.listeners.forEach(function(listener) {
+            listener(page);
+        });
+    }).catch(function(e) {
+        console.error('获取分页数据失败:', e);
+    });
+};
+
+// 生成翻页控件，只有一页时不显示
+function renderPager(pagerId, paged) {
+    var pager = document.getElementById(pagerId);
+    if (!pager || paged.pageCount() <= 1) return;
+
+    pager.innerHTML = '<button type="button" data-step="-1">上一页</button>' +
+        '<span class="pager-label"></span>' +
+        '<button type="button" data-step="1">下一页</button>';
+    var buttons = pager.querySelectorAll('button');
+    var label = pager.querySelector('.pager-label');
+
+    pager.addEventListener('click', function(e) {
+        var step = e.target.getAttribute('data-step');
+        if (step) paged.goTo(paged.pageIndex + parseInt(step, 10));
+    });
+    paged.onChange(function() {
+        label.textContent = '第 ' + (paged.pageIndex + 1) + ' / ' + paged.pageCount() + ' 页（共 ' + paged.total + ' 条）';
+        buttons[0].disabled = paged.pageIndex === 0;
+        buttons[1].disabled = paged.pageIndex >= paged.pageCount() - 1;
+    });
+}
+
+// 一次性生成一页表格行，避免逐行操作DOM
+function fillTableRows(tableId, page, buildRow) {
+    var table = document.getElementById(tableId);
+    if (!table) return;
+    var count = page.network.length;
+    var rows = new Array(count);
+    for (var i = 0; i < count; i++) {
+        rows[i] = '<tr><td>' + [page.offset + i + 1].concat(buildRow(page, i)).join('</td><td>') + '</td></tr>';
+    }
+    table.tBodies[table.tBodies.length - 1].innerHTML = rows.join('');
+}
+
+// 子网切分剩余网段的分页状态，表格和图表共用
+var splitResultPages = null;
+var splitResultData = null;
+
+// 渲染子网切分的剩余网段表格
+function renderSplitResult() {
+    splitResultData = readResultData('split-result-data');
+    if (!splitResultData) return;
+
+    var data = splitResultData;
+    var parentCidr = subnetInfo(data.parent.network[0], data.parent.prefix[0]).cidr;
+    var splitCidr = subnetInfo(data.split.network[0], data.split.prefix[0]).cidr;
+    splitResultPages = new PagedResult(data.remaining, data.page_size, function(offset, limit) {
+        var query = new URLSearchParams({parent: parentCidr, split: splitCidr, offset: offset, limit: limit});
+        return fetchJson(data.page_url + '?' + query.toString());
+    });
+
+    splitResultPages.onChange(function(page) {
+        fillTableRows('remaining-subnets-table', page, function(page, i) {
+            var info = subnetInfo(page.network[i], page.prefix[i]);
+            return [info.cidr, info.network, info.netmask, info.wildcard, info.broadcast, info.usable_addresses];
+        });
+    });
+    splitResultPages.listeners.push(drawSubnetChart);
+    renderPager('remaining-subnets-pager', splitResultPages);
+    renderPager('subnet-chart-pager', splitResultPages);
+}
+
+// 渲染子网规划的已分配子网和剩余网段表格
+function renderPlanResult() {
+    var data = readResultData('plan-result-data');
+    if (!data) return;
+
+    // 翻页按嵌入的本次规划输入请求，渲染后修改表单不会让后续页面来自另一个规划
+    function planPages(table, firstPage) {
+        return new PagedResult(firstPage, data.page_size, function(offset, limit) {
+            var body = {parent: data.parent, subnets: data.subnets, table: table, offset: offset, limit: limit};
+            if (data.reserved) body.reserved = data.reserved;
+            return fetchJson(data.page_url, body);
+        });
+    }
+
+    var allocatedPages = planPages('allocated', data.allocated);
+    allocatedPages.onChange(function(page) {
+        fillTableRows('plan-allocated-table', page, function(page, i) {
+            var info = subnetInfo(page.network[i], page.prefix[i]);
+            // 同一需求的多个相同子网只返回第一个子网和数量
+            var cidr = page.count[i] > 1 ? info.cidr + ' (×' + page.count[i] + ')' : info.cidr;
+            return [
+                escapeHtml(page.name[i]), cidr, page.required[i], info.usable_addresses,
+                info.network, info.broadcast, info.host_range_start, info.host_range_end, info.netmask
+            ];
+        });
+    });
+    renderPager('plan-allocated-pager', allocatedPages);
+
+    var remainingPages = planPages('remaining', data.remaining);
+    remainingPages.onChange(function(page) {
+        fillTableRows('plan-remaining-table', page, function(page, i) {
+            var info = subnetInfo(page.network[i], page.prefix[i]);
+            return [info.cidr, info.usable_addresses];
+        });
+    });
+    renderPager('plan-remaining-pager', remainingPages);
+}
+
+// 绘制网段分布图表，剩余网段只绘制当前页，画布高度不随结果规模增长
+function drawSubnetChart() {
+    var canvas = document.getElementById('subnetChartCanvas');
+    if (!canvas || !splitResultPages) return;
+
+    var ctx = canvas.getContext('2d');
+    if (!ctx) return;
+
+    try {
+        var data = splitResultData;
+        var parentInfo = subnetInfo(data.parent.network[0], data.parent.prefix[0]);
+        var splitInfo = subnetInfo(data.split.network[0], data.split.prefix[0]);
+        var page = splitResultPages.current();
+        var pageCount = page.network.length;
+
+        canvas.width = canvas.parentElement.clientWidth || 800;
+
+        // 使用对数比例尺来更好地显示差距巨大的网段大小
+        var logMax = Math.log10(Number(parentInfo.num_addresses));
+        var logMin = 3; // 最小显示3个数量级（1000个地址）
+        var minBarWidth = 50; // 为小网段设置最小显示宽度
+
+        var x = 50;
+        var y = 50;
+        var barHeight = 40;
+        var padding = 20;
+        var availableWidth = canvas.width - 100;
+
+        function barWidth(numAddresses) {
+            var logValue = Math.max(logMin, Math.log10(Number(numAddresses)));
+            return Math.max(minBarWidth, ((logValue - logMin) / (logMax - logMin)) * availableWidth);
+        }
+
+        function drawBar(color, width, segmentText, addressText) {
+            ctx.fillStyle = color;
+            ctx.fillRect(x, y, width, barHeight);
+
+            ctx.fillStyle = '#000000';
+            ctx.font = '16px Arial';
+            ctx.textBaseline = 'middle';
+            ctx.strokeStyle = '#ffffff';
+            ctx.lineWidth = 2;
+
+            // 网段信息左对齐，地址数在固定位置对齐
+            ctx.strokeText(segmentText, x + 15, y + barHeight / 2);
+            ctx.fillText(segmentText, x + 15, y + barHeight / 2);
+            ctx.strokeText(addressText, x + 250, y + barHeight / 2);
+            ctx.fillText(addressText, x + 250, y + barHeight / 2);
+        }
+
+        // 动态调整画布高度：父网段 + 切分网段 + 当前页剩余网段 + 图例
+        var totalBars = 2 + pageCount + 3;
+        canvas.height = Math.max(600, totalBars * (barHeight + padding) + 100);
+        ctx.clearRect(0, 0, canvas.width, canvas.height);
+
+        // 父网段占满整个宽度
+        drawBar('#95a5a6', availableWidth, '父网段: ' + parentInfo.cidr,
+            '可用地址: ' + parentInfo.num_addresses.toLocaleString());
+        y += barHeight + padding;
+
+        drawBar('#3498db', barWidth(splitInfo.num_addresses), '切分网段: ' + splitInfo.cidr,
+            '可用地址: ' + splitInfo.usable_addresses.toLocaleString());
+        y += barHeight + padding + 20;
+
+        var title = '剩余网段 (' + page.total + ' 个';
+        if (splitResultPages.pageCount() > 1) {
+            title += '，第 ' + (page.offset + 1) + '-' + (page.offset + pageCount) + ' 个';
+        }
+        ctx.fillStyle = '#34495e';
+        ctx.font = '18px Arial';
+        ctx.fillText(title + '):', x, y);
+        y += 20;
+
+        var colors = ['#27ae60', '#e74c3c', '#f39c12', '#8e44ad', '#16a085', '#2c3e50'];
+        for (var i = 0; i < pageCount; i++) {
+            var index = page.offset + i;
+            var subnet = subnetInfo(page.network[i], page.prefix[i]);
+            drawBar(colors[index % colors.length], barWidth(subnet.num_addresses), '网段 ' + (index + 1) + ': ' + subnet.cidr,
+                '可用地址: ' + subnet.usable_addresses.toLocaleString());
+            y += barHeight + padding;
+        }
+
+        // 绘制图例
+        y += 20;
+        ctx.fillStyle = '#34495e';
+        ctx.font = '14px Arial';
+        ctx.fillText('图例:', x, y);
+
+        y += 10;
+        var legend = [['#95a5a6', '父网段'], ['#3498db', '切分网段'], ['#27ae60', '剩余网段']];
+        ctx.font = '12px Arial';
+        ctx.textBaseline = 'middle';
+        for (var j = 0; j < legend.length; j++) {
+            ctx.fillStyle = legend[j][0];
+            ctx.fillRect(x + j * 100, y, 20, 15);
+            ctx.fillStyle = '#000000';
+            ctx.fillText(legend[j][1], x + j * 100 + 30, y + 7);
+        }
+    } catch (error) {
+        console.error('绘制图表时发生错误:', error);
+        // 设置最小高度以显示错误信息
+        canvas.height = 200;
+        ctx.clearRect(0, 0, canvas.width, canvas.height);
+        ctx.fillStyle = '#e74c3c';
+        ctx.font = '16px Arial';
+        ctx.textAlign = 'center';
+        ctx.fillText('图表加载失败: ' + error.message, canvas.width / 2, canvas.height / 2);
+    }
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    renderSplitResult();
+    renderPlanResult();
+});
+
+// 页面加载完成后绘制图表，切换到图表标签页时由openResultTab重新绘制
+window.addEventListener('load', drawSubnetChart);
@@ -0,0 +1,267 @@
+// 从localStorage加载保存的表单数据和当前激活的标签页
+let formData = JSON.parse(localStorage.getItem('formData')) || {
+    'subnet-split': {},
+    'subnet-plan': {}
+};
+let currentActiveTab = localStorage.getItem('currentActiveTab') || 'subnet-split';
+
+// 保存当前页面的表单数据
+function saveFormData() {
+    // 获取当前激活的标签页
+    const activeTab = document.querySelector('.tool-content.active');
+    if (!activeTab) return;
+
+    const tabId = activeTab.id;
+    const data = {};
+
+    // 保存普通输入字段
+    const singleInputs = activeTab.querySelectorAll('input[type="text"], input[type="number"], textarea, select');
+    singleInputs.forEach(input => {
+        if (input.name && !input.name.endsWith('[]')) {
+            data[input.name] = input.value;
+        }
+    });
+
+    // 特殊处理子网规划中的数组输入字段
+    if (tabId === 'subnet-plan') {
+        const requirementRows = activeTab.querySelectorAll('.subnet-requirement');
+        const subnetNames = [];
+        const subnetHosts = [];
+
+        requirementRows.forEach(row => {
+            const nameInput = row.querySelector('input[name="subnet-name[]"]');
+            const hostsInput = row.querySelector('input[name="subnet-hosts[]"]');
+
+            if (nameInput && hostsInput) {
+                subnetNames.push(nameInput.value.trim());
+                subnetHosts.push(hostsInput.value.trim());
+            }
+        });
+
+        // 保存子网名称和主机数数组
+        data['subnet-name'] = subnetNames;
+        data['subnet-hosts'] = subnetHosts;
+    }
+
+    formData[tabId] = data;
+
+    // 保存到localStorage
+    localStorage.setItem('formData', JSON.stringify(formData));
+}
+
+// 恢复表单数据
+function restoreFormData(tabId) {
+    const data = formData[tabId];
+    if (!data) return;
+
+    const targetTab = document.getElementById(tabId);
+    if (!targetTab) return;
+
+    // 恢复普通输入字段
+    Object.keys(data).forEach(fieldName => {
+        const value = data[fieldName];
+
+        if (!Array.isArray(value)) {
+            const inputs = targetTab.querySelectorAll(`input[name="${fieldName}"]`);
+            inputs.forEach(input => {
+                input.value = value;
+            });
+        }
+    });
+
+    // 特殊处理子网规划中的数组输入字段
+    if (tabId === 'subnet-plan') {
+        // 先清除现有输入行
+        const container = document.getElementById('subnet-requirements');
+        if (container) {
+            // 保留标题行，移除其他行
+            const rows = container.querySelectorAll('tr.subnet-requirement');
+            rows.forEach(row => row.remove());
+
+            // 获取子网名称和主机数数组
+            const subnetNames = data['subnet-name'] || [];
+            const subnetHosts = data['subnet-hosts'] || [];
+
+            // 添加新的输入行并填充数据
+            const maxLength = Math.max(subnetNames.length, subnetHosts.length);
+            for (let i = 0; i < maxLength; i++) {
+                addSubnetRequirement();
+            }
+
+            // 填充数据到新添加的输入行
+            const newRows = container.querySelectorAll('tr.subnet-requirement');
+            newRows.forEach((row, index) => {
+                const nameInput = row.querySelector('input[name="subnet-name[]"]');
+                const hostsInput = row.querySelector('input[name="subnet-hosts[]"]');
+
+                if (nameInput && subnetNames[index]) {
+                    nameInput.value = subnetNames[index];
+                }
+                if (hostsInput && subnetHosts[index]) {
+                    hostsInput.value = subnetHosts[index];
+                }
+            });
+        }
+    }
+}
+
+// 功能选项卡切换
+document.querySelectorAll('.tabs button[data-target]').forEach(button => {
+    button.addEventListener('click', () => {
+        // 保存当前表单数据
+        saveFormData();
+
+        // 移除所有激活状态
+        document.querySelectorAll('.tabs button[data-target]').forEach(btn => {
+            btn.classList.remove('active');
+        });
+        document.querySelectorAll('.tool-content').forEach(content => {
+            content.classList.remove('active');
+        });
+
+        // 添加当前激活状态
+        const targetId = button.getAttribute('data-target');
+        button.classList.add('active');
+
+        const targetTab = document.getElementById(targetId);
+        targetTab.classList.add('active');
+
+        // 更新当前激活的标签页
+        currentActiveTab = targetId;
+        localStorage.setItem('currentActiveTab', currentActiveTab);
+
+        // 恢复目标页面的表单数据
+        restoreFormData(targetId);
+    });
+});
+
+// 页面加载完成后初始化
+document.addEventListener('DOMContentLoaded', function() {
+    // 如果有保存的当前激活标签页，恢复它
+    if (currentActiveTab) {
+        // 移除所有激活状态
+        document.querySelectorAll('.tabs button[data-target]').forEach(btn => {
+            btn.classList.remove('active');
+        });
+        document.querySelectorAll('.tool-content').forEach(content => {
+            content.classList.remove('active');
+        });
+
+        // 添加当前激活状态
+        const button = document.querySelector(`.tabs button[data-target="${currentActiveTab}"]`);
+        const targetTab = document.getElementById(currentActiveTab);
+
+        if (button && targetTab) {
+            button.classList.add('active');
+            targetTab.classList.add('active');
+
+            // 恢复目标页面的表单数据
+            restoreFormData(currentActiveTab);
+        }
+    }
+
+    // 监听表单提交事件，保存数据并添加所有页面的数据到表单
+const forms = document.querySelectorAll('form');
+forms.forEach(form => {
+    form.addEventListener('submit', function(event) {
+        saveFormData();
+
+        // 创建隐藏输入字段，将所有表单数据发送给后端
+        const formDataInput = document.createElement('input');
+        formDataInput.type = 'hidden';
+        formDataInput.name = 'allFormData';
+        formDataInput.value = JSON.stringify(formData);
+        form.appendChild(formDataInput);
+
+        // 创建隐藏输入字段，将当前激活的标签页发送给后端
+        const activeTabInput = document.createElement('input');
+        activeTabInput.type = 'hidden';
+        activeTabInput.name = 'currentActiveTab';
+        activeTabInput.value = currentActiveTab;
+        form.appendChild(activeTabInput);
+    });
+});
+});
+
+// 监听页面卸载事件，保存数据
+window.addEventListener('beforeunload', function() {
+    saveFormData();
+});
+
+// 内层结果标签页切换函数（仅影响切分结果内部的标签页）
+function openResultTab(evt, tabName) {
+    // 移除所有标签页内容的激活状态
+    var allTabContents = document.querySelectorAll('.tab-content');
+    for (var i = 0; i < allTabContents.length; i++) {
+        allTabContents[i].classList.remove("active");
+    }
+
+    // 移除所有标签页按钮的激活状态
+    var allTabButtons = document.querySelectorAll('.result-tab');
+    for (var j = 0; j < allTabButtons.length; j++) {
+        allTabButtons[j].classList.remove("active");
+    }
+
+    // 添加当前标签页内容的激活状态
+    var targetTabContent = document.getElementById(tabName);
+    if (targetTabContent) {
+        targetTabContent.classList.add("active");
+    }
+
+    // 添加当前标签页按钮的激活状态
+    evt.currentTarget.classList.add("active");
+
+    // 如果切换到图表标签页，重新绘制图表
+    if (tabName === 'subnet-chart') {
+        setTimeout(drawSubnetChart, 100);
+    }
+}
+
+// 添加子网需求
+function addSubnetRequirement() {
+    var container = document.getElementById("subnet-requirements");
+    var newRow = document.createElement("tr");
+    newRow.className = "subnet-requirement";
+    var count = container.children.length + 1;
+
+    newRow.innerHTML = `
+        <td>${count}</td>
+        <td><input type="text" name="subnet-name[]" placeholder="例如: 办公区"></td>
+        <td><input type="number" name="subnet-hosts[]" placeholder="例如: 200" min="1"></td>
+        <td>
+            <button type="button" onclick="removeSubnetRequirement(this)" style="background-color: #e74c3c; color: white; border: none; padding: 6px 12px; cursor: pointer; border-radius: 4px; font-size: 14px; width: 100%;">
+                删除
+            </button>
+        </td>
+    `;
+
+    container.appendChild(newRow);
+}
+
+// 删除子网需求
+function removeSubnetRequirement(button) {
+    var row = button.closest("tr");
+    var container = document.getElementById("subnet-requirements");
+
+    // 确保至少保留一行
+    if (container.children.length > 1) {
+        row.remove();
+        updateSubnetIndices();
+    } else {
+        alert("至少需要保留一个子网需求");
+    }
+}
+
+// 更新子网序号
+function updateSubnetIndices() {
+    var container = document.getElementById("subnet-requirements");
+    const rows = container.querySelectorAll('.subnet-requirement');
+
+    rows.forEach((row, index) => {
+        // 更新序号列
+        const indexCell = row.querySelector('td:first-child');
+        if (indexCell) {
+            indexCell.textContent = index + 1;
+        }
+    });
+}
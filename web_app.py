@@ -1,11 +1,50 @@
-from flask import Flask, request, render_template_string
-import ipaddress
+from flask import Flask, Response, request, render_template, jsonify, url_for
+from markupsafe import Markup
+import os
+import zlib
+import hashlib
 import json
-from ip_subnet_calculator import split_subnet, suggest_subnet_planning
+from ip_subnet_calculator import (
+    split_subnet,
+    suggest_subnet_planning,
+    suggest_multi_pool_planning,
+    update_subnet_planning,
+    get_subnet_info,
+    estimate_split_cost,
+    estimate_planning_cost,
+    check_cost_limits,
+    find_subnet_conflicts,
+    HostSequence,
+    DEFAULT_COST_LIMITS,
+    parse_network,
+)
+from hierarchical_plan import plan_hierarchy, MAX_TREE_DEPTH
+from result_cache import create_result_cache, split_cache_key, plan_cache_key
+from compute_pool import create_compute_pool
 from version import __version__
 
 app = Flask(__name__)
 
+# 静态资源URL带有内容哈希，内容变化时URL随之变化，因此可以让浏览器长期缓存；
+# Flask发送静态文件时会附带ETag，缓存过期后浏览器通过条件请求重新验证
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 365 * 24 * 3600
+# 请求体大小上限，超出时Flask直接返回413
+app.config["MAX_CONTENT_LENGTH"] = 4 * 1024 * 1024
+
+STATIC_FILES = ["css/web_app.css", "js/subnet_results.js", "js/web_app.js"]
+
+
+def compute_static_version():
+    """根据静态资源内容计算版本哈希，用于静态资源URL的缓存失效"""
+    digest = hashlib.sha1()
+    for filename in STATIC_FILES:
+        with open(os.path.join(app.static_folder, filename), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:10]
+
+
+STATIC_VERSION = compute_static_version()
+
 HTML_TEMPLATE = '''
 <!DOCTYPE html>
 <html lang="zh-CN">
@@ -13,262 +52,7 @@ HTML_TEMPLATE = '''
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>IP子网切分工具</title>
-    <style>
-        body {
-            font-family: Arial, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background-color: #f0f8ff;
-        }
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            background-color: white;
-            padding: 30px;
-            border-radius: 8px;
-            box-shadow: 0 0 10px rgba(0, 0, 0, 0.1);
-        }
-        h1 {
-            color: #333;
-            text-align: center;
-            margin-bottom: 30px;
-        }
-        h2 {
-            color: #444;
-            margin-top: 30px;
-        }
-        h3 {
-            color: #555;
-            margin-top: 20px;
-        }
-        h4 {
-            color: #666;
-            margin-top: 15px;
-        }
-        .form-group {
-            margin-bottom: 20px;
-        }
-        label {
-            display: block;
-            margin-bottom: 5px;
-            font-weight: bold;
-            color: #555;
-        }
-        input[type="text"],
-        input[type="number"] {
-            width: 300px;
-            padding: 10px;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-            font-size: 16px;
-        }
-        button {
-            background-color: #3498db;
-            color: white;
-            padding: 10px 20px;
-            border: none;
-            border-radius: 4px;
-            font-size: 16px;
-            cursor: pointer;
-        }
-        button:hover {
-            background-color: #2980b9;
-        }
-        .result {
-            margin-top: 30px;
-            padding: 20px;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-            background-color: #f9f9f9;
-        }
-        .error {
-            color: red;
-            margin-bottom: 20px;
-        }
-        .info-row {
-            margin-bottom: 10px;
-        }
-        .info-label {
-            display: inline-block;
-            width: 120px;
-            font-weight: bold;
-            color: #555;
-        }
-        .info-value {
-            display: inline-block;
-        }
-        .subnet-info {
-            background-color: white;
-            padding: 15px;
-            margin-bottom: 20px;
-            box-shadow: 0 2px 5px rgba(0, 0, 0, 0.05);
-        }
-        .tabs {
-            display: flex;
-            margin-bottom: 20px;
-            border-bottom: 1px solid #ddd;
-        }
-        /* 最顶级功能标签页样式 */
-        .tab {
-            border: none;
-            padding: 10px 20px;
-            cursor: pointer;
-            margin-right: 5px;
-            border-radius: 4px 4px 0 0;
-            transition: all 0.3s ease;
-        }
-        /* 子网切分标签页颜色 */
-        .tab:nth-child(1) {
-            background-color: rgba(52, 152, 219, 0.3); /* 浅蓝色背景 */
-            color: #2980b9;
-        }
-        .tab:nth-child(1).active {
-            background-color: #3498db; /* 蓝色激活状态 */
-            color: white;
-        }
-        /* 子网规划建议标签页颜色 */
-        .tab:nth-child(2) {
-            background-color: rgba(46, 204, 113, 0.3); /* 浅绿色背景 */
-            color: #27ae60;
-        }
-        .tab:nth-child(2).active {
-            background-color: #2ecc71; /* 绿色激活状态 */
-            color: white;
-        }
-        /* 切分结果内部标签页样式 */
-        .result-tab {
-            border: none;
-            padding: 8px 16px;
-            cursor: pointer;
-            border-radius: 4px 4px 0 0;
-            margin-right: 5px;
-            transition: all 0.3s ease;
-        }
-        /* 切分结果内部标签页颜色 */
-        .result-tab:nth-child(1) {
-            background-color: rgba(52, 152, 219, 0.3); /* 浅蓝色背景 */
-            color: #2980b9;
-        }
-        .result-tab:nth-child(1).active {
-            background-color: #3498db; /* 蓝色激活状态 */
-            color: white;
-            font-weight: bold;
-        }
-        .result-tab:nth-child(2) {
-            background-color: rgba(46, 204, 113, 0.3); /* 浅绿色背景 */
-            color: #27ae60;
-        }
-        .result-tab:nth-child(2).active {
-            background-color: #2ecc71; /* 绿色激活状态 */
-            color: white;
-            font-weight: bold;
-        }
-        .result-tab:nth-child(3) {
-            background-color: rgba(230, 126, 34, 0.3); /* 浅橙色背景 */
-            color: #d35400;
-        }
-        .result-tab:nth-child(3).active {
-            background-color: #e67e22; /* 橙色激活状态 */
-            color: white;
-            font-weight: bold;
-        }
-        .tool-content {
-            display: none;
-        }
-        .tool-content.active {
-            display: block;
-        }
-        .subnet-requirement {
-            margin: 15px 0;
-            padding: 15px;
-            background-color: #f8f9fa;
-            border-radius: 4px;
-        }
-        .subnet-requirement input[type="text"],
-        .subnet-requirement input[type="number"] {
-            width: 200px;
-            margin: 0 10px 10px 0;
-        }
-        .table-container {
-            border: 1px solid #ddd;
-        }
-        .subnet-table {
-            width: 100%;
-            min-width: 100%;
-            border-collapse: collapse;
-            table-layout: auto;
-            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-        }
-        .subnet-table th, .subnet-table td {
-            padding: 6px 8px;
-            text-align: center;
-            vertical-align: middle;
-            height: auto;
-            line-height: 1.4;
-            white-space: nowrap;
-            max-width: 180px;
-        }
-        .subnet-table th {
-            background-color: #555;
-            color: white;
-            font-weight: bold;
-            white-space: nowrap;
-            font-size: 14px;
-            letter-spacing: 0.3px;
-            min-width: 70px;
-        }
-        .subnet-table tr {
-            border-bottom: 1px solid #e8e8e8;
-            transition: background-color 0.2s ease;
-        }
-        .subnet-table tr:nth-child(even) {
-            background-color: #f8f9fa;
-        }
-        .subnet-table tr:hover {
-            background-color: #e3f2fd;
-        }
-        .subnet-table input[type="text"],
-        .subnet-table input[type="number"] {
-            box-sizing: border-box;
-            padding: 8px 10px;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-            font-size: 14px;
-            transition: border-color 0.2s ease;
-            width: 100%;
-            height: 32px;
-            vertical-align: middle;
-            display: inline-block;
-            margin: auto;
-        }
-        .subnet-table input[type="text"]:focus,
-        .subnet-table input[type="number"]:focus {
-            outline: none;
-            border-color: #3498db;
-            box-shadow: 0 0 0 2px rgba(52, 152, 219, 0.2);
-        }
-        .subnet-table button {
-            transition: all 0.2s ease;
-            font-weight: 500;
-            height: 32px;
-            line-height: 16px;
-            margin: auto;
-            display: block;
-        }
-        .subnet-table button:hover {
-            opacity: 0.9;
-            transform: translateY(-1px);
-        }
-        .table-container {
-            border: none;
-        }
-        .tab-content {
-            display: none;
-        }
-        .tab-content.active {
-            display: block;
-        }
-    </style>
+    <link rel="stylesheet" href="{{ url_for('static', filename='css/web_app.css', v=static_version) }}">
 </head>
 <body>
     <div class="container">
@@ -363,31 +147,24 @@ HTML_TEMPLATE = '''
                         <!-- 剩余网段列表标签页 -->
                         <div id="remaining-subnets" class="tab-content" style="background-color: #fff; padding: 15px; border-radius: 4px; border: 1px solid #ddd;">
                             <div class="content-container">
-                                <h3>剩余网段 ({{ result.remaining_subnets_info|length }} 个)</h3>
+                                <h3>剩余网段 ({{ result.remaining_subnets|length }} 个)</h3>
                                 
                                 <div class="table-container">
-                                    <table class="subnet-table">
-                                        <tr>
-                                            <th>序号</th>
-                                            <th>CIDR</th>
-                                            <th>网络地址</th>
-                                            <th>子网掩码</th>
-                                            <th>通配符掩码</th>
-                                            <th>广播地址</th>
-                                            <th>可用地址</th>
-                                        </tr>
-                                        {% for subnet in result.remaining_subnets_info %}
+                                    <table class="subnet-table" id="remaining-subnets-table">
+                                        <thead>
                                             <tr>
-                                                <td>{{ loop.index }}</td>
-                                                <td>{{ subnet.cidr }}</td>
-                                                <td>{{ subnet.network }}</td>
-                                                <td>{{ subnet.netmask }}</td>
-                                                <td>{{ subnet.wildcard }}</td>
-                                                <td>{{ subnet.broadcast }}</td>
-                                                <td>{{ subnet.usable_addresses }}</td>
+                                                <th>序号</th>
+                                                <th>CIDR</th>
+                                                <th>网络地址</th>
+                                                <th>子网掩码</th>
+                                                <th>通配符掩码</th>
+                                                <th>广播地址</th>
+                                                <th>可用地址</th>
                                             </tr>
-                                        {% endfor %}
+                                        </thead>
+                                        <tbody></tbody>
                                     </table>
+                                    <div class="pager" id="remaining-subnets-pager"></div>
                                 </div>
                             </div>
                         </div>
@@ -397,311 +174,9 @@ HTML_TEMPLATE = '''
                             <div style="width: 100%; overflow: hidden;">
                                 <canvas id="subnetChartCanvas"></canvas>
                             </div>
-                            <script>
-                                function drawSubnetChart() {
-                                    try {
-                                        console.log('=== 开始绘制网段图表 ===');
-                                        
-                                        // 1. 获取canvas元素
-                                        var canvas = document.getElementById('subnetChartCanvas');
-                                        if (!canvas) {
-                                            console.error('❌ Canvas元素不存在');
-                                            return;
-                                        }
-                                        console.log('✅ Canvas元素:', canvas);
-                                        
-                                        // 2. 获取绘图上下文
-                                        var ctx = canvas.getContext('2d');
-                                        if (!ctx) {
-                                            console.error('❌ 无法获取Canvas上下文');
-                                            return;
-                                        }
-                                        console.log('✅ Canvas上下文:', ctx);
-                                        
-                                        // 3. 设置画布尺寸
-                                        var containerWidth = canvas.parentElement.clientWidth || 800;
-                                        canvas.width = containerWidth;
-                                        console.log('✅ 画布宽度设置完成:', canvas.width);
-                                        
-                                        // 4. 清空画布
-                                        ctx.clearRect(0, 0, canvas.width, canvas.height);
-                                        // 设置白色背景
-                                        ctx.fillStyle = '#fff';
-                                        ctx.fillRect(0, 0, canvas.width, canvas.height);
-                                        
-                                        // 5. 获取数据 - 使用默认数据作为备用
-                                        var parentCidr, splitInfo, remainingSubnets;
-                                        try {
-                                            // 从模板获取数据
-                                            parentCidr = "{{ result.parent if result else '192.168.0.0/16' }}";
-                                            splitInfo = {
-                                                network: "{{ result.split_info.network if (result and result.split_info) else '192.168.0.0' }}",
-                                                cidr: "{{ result.split_info.cidr if (result and result.split_info) else '192.168.0.0/18' }}",
-                                                prefixlen: {{ result.split_info.prefixlen if (result and result.split_info) else 18 }},
-                                                num_addresses: {{ result.split_info.num_addresses if (result and result.split_info) else 16384 }},
-                                                usable_addresses: {{ result.split_info.usable_addresses if (result and result.split_info) else 16382 }}
-                                            };
-                                            
-                                            remainingSubnets = [
-                                                {% if result and result.remaining_subnets_info %}
-                                                {% for subnet in result.remaining_subnets_info %}
-                                                    {
-                                                        network: "{{ subnet.network }}",
-                                                        cidr: "{{ subnet.cidr }}",
-                                                        prefixlen: {{ subnet.prefixlen }},
-                                                        num_addresses: {{ subnet.num_addresses }},
-                                                        usable_addresses: {{ subnet.usable_addresses }}
-                                                    }{{ ',' if not loop.last else '' }}
-                                                {% endfor %}
-                                                {% else %}
-                                                    {
-                                                        network: '192.168.64.0',
-                                                        cidr: '192.168.64.0/18',
-                                                        prefixlen: 18,
-                                                        num_addresses: 16384,
-                                                        usable_addresses: 16382
-                                                    }
-                                                {% endif %}
-                                            ];
-                                            
-                                            console.log('✅ 从模板获取数据:', {
-                                                parentCidr: parentCidr,
-                                                splitInfo: splitInfo,
-                                                remainingSubnets: remainingSubnets
-                                            });
-                                        } catch (e) {
-                                            console.error('❌ 从模板获取数据失败:', e);
-                                            // 使用默认数据
-                                            parentCidr = '192.168.0.0/16';
-                                            splitInfo = {
-                                                network: '192.168.0.0',
-                                                cidr: '192.168.0.0/18',
-                                                prefixlen: 18,
-                                                num_addresses: 16384,
-                                                usable_addresses: 16382
-                                            };
-                                            remainingSubnets = [
-                                                {
-                                                    network: '192.168.64.0',
-                                                    cidr: '192.168.64.0/18',
-                                                    prefixlen: 18,
-                                                    num_addresses: 16384,
-                                                    usable_addresses: 16382
-                                                }
-                                            ];
-                                            console.log('ℹ️ 使用默认测试数据');
-                                        }
-                                        
-                                        // 确保数据有效性
-                                        if (!parentCidr) parentCidr = '192.168.0.0/16';
-                                        if (!splitInfo) {
-                                            splitInfo = {
-                                                network: '192.168.0.0',
-                                                cidr: '192.168.0.0/18',
-                                                prefixlen: 18,
-                                                num_addresses: 16384,
-                                                usable_addresses: 16382
-                                            };
-                                        }
-                                        if (!remainingSubnets || remainingSubnets.length === 0) {
-                                            remainingSubnets = [
-                                                {
-                                                    network: '192.168.64.0',
-                                                    cidr: '192.168.64.0/18',
-                                                    prefixlen: 18,
-                                                    num_addresses: 16384,
-                                                    usable_addresses: 16382
-                                                }
-                                            ];
-                                        }
-                                        
-                                        // 6. 计算父网段的总地址数和比例尺
-                                        var parentPrefix = parseInt(parentCidr.split('/')[1]);
-                                        var parentTotalAddresses = Math.pow(2, 32 - parentPrefix);
-                                        
-                                        // 使用对数比例尺来更好地显示差距巨大的网段大小
-                                        var logMax = Math.log10(parentTotalAddresses);
-                                        var logMin = 3; // 最小显示3个数量级（1000个地址）
-                                        
-                                        // 为小网段设置最小显示宽度
-                                        var minBarWidth = 50;
-                                        
-                                        // 7. 绘制配置
-                                        var x = 50;
-                                        var y = 50;
-                                        var barHeight = 40;
-                                        var padding = 20;
-                                        var availableWidth = canvas.width - 100;
-                                        
-                                        // 8. 动态调整画布高度：父网段 + 切分网段 + 剩余网段列表 + 图例
-                                        var totalBars = 2 + remainingSubnets.length + 3; // 父+切分+剩余+图例+标题
-                                        canvas.height = Math.max(600, totalBars * (barHeight + padding) + 100);
-                                        console.log('✅ 画布尺寸设置完成:', canvas.width, 'x', canvas.height);
-                                        
-                                        // 9. 重新清空画布（因为高度可能变化）
-                                        ctx.clearRect(0, 0, canvas.width, canvas.height);
-                                        
-                                        // 10. 绘制父网段
-                                        ctx.fillStyle = '#95a5a6'; // 灰色表示父网段
-                                        var parentBarWidth = availableWidth; // 父网段占满整个宽度
-                                        ctx.fillRect(x, y, parentBarWidth, barHeight);
-                                        
-                                        // 绘制父网段文本
-                                        ctx.fillStyle = '#000000';
-                                        ctx.font = '16px Arial';
-                                        ctx.textBaseline = 'middle';
-                                        ctx.strokeStyle = '#ffffff';
-                                        ctx.lineWidth = 2;
-                                        
-                                        var segmentText = '父网段: ' + parentCidr;
-                                        var addressText = '可用地址: ' + parentTotalAddresses.toLocaleString();
-                                        var addressX = x + 250;
-                                        
-                                        ctx.strokeText(segmentText, x + 15, y + barHeight / 2);
-                                        ctx.fillText(segmentText, x + 15, y + barHeight / 2);
-                                        ctx.strokeText(addressText, addressX, y + barHeight / 2);
-                                        ctx.fillText(addressText, addressX, y + barHeight / 2);
-                                        
-                                        y += barHeight + padding;
-                                        
-                                        // 11. 绘制切分网段
-                                        // 使用对数比例尺计算宽度
-                                        var splitLogValue = Math.max(logMin, Math.log10(splitInfo.num_addresses));
-                                        var splitBarWidth = Math.max(minBarWidth, ((splitLogValue - logMin) / (logMax - logMin)) * availableWidth);
-                                        
-                                        ctx.fillStyle = '#3498db'; // 蓝色表示切分网段
-                                        ctx.fillRect(x, y, splitBarWidth, barHeight);
-                                        
-                                        // 绘制切分网段文本
-                                        ctx.fillStyle = '#000000';
-                                        ctx.font = '16px Arial';
-                                        ctx.textBaseline = 'middle';
-                                        ctx.strokeStyle = '#ffffff';
-                                        ctx.lineWidth = 2;
-                                        
-                                        // 绘制网段信息（左对齐）
-                                        var segmentText = '切分网段: ' + splitInfo.cidr;
-                                        var addressText = '可用地址: ' + splitInfo.usable_addresses.toLocaleString();
-                                        
-                                        // 网段信息左对齐，地址数在固定位置对齐
-                                        var addressX = x + 250; // 固定地址数的起始位置
-                                        
-                                        ctx.strokeText(segmentText, x + 15, y + barHeight / 2);
-                                        ctx.fillText(segmentText, x + 15, y + barHeight / 2);
-                                        ctx.strokeText(addressText, addressX, y + barHeight / 2);
-                                        ctx.fillText(addressText, addressX, y + barHeight / 2);
-                                        
-                                        y += barHeight + padding + 20;
-                                        
-                                        // 12. 绘制剩余网段标题
-                                        ctx.fillStyle = '#34495e';
-                                        ctx.font = '18px Arial';
-                                        ctx.fillText('剩余网段 (' + remainingSubnets.length + ' 个):', x, y);
-                                        
-                                        y += 20;
-                                        
-                                        // 13. 绘制剩余网段
-                                        var colors = ['#27ae60', '#e74c3c', '#f39c12', '#8e44ad', '#16a085', '#2c3e50'];
-                                        for (var i = 0; i < remainingSubnets.length; i++) {
-                                            var subnet = remainingSubnets[i];
-                                            
-                                            // 使用对数比例尺计算宽度
-                                            var subnetLogValue = Math.max(logMin, Math.log10(subnet.num_addresses));
-                                            var subnetBarWidth = Math.max(minBarWidth, ((subnetLogValue - logMin) / (logMax - logMin)) * availableWidth);
-                                            
-                                            ctx.fillStyle = colors[i % colors.length];
-                                            ctx.fillRect(x, y, subnetBarWidth, barHeight);
-                                            
-                                            // 绘制网段信息
-                                            ctx.fillStyle = '#000000';
-                                            ctx.font = '16px Arial';
-                                            ctx.textBaseline = 'middle';
-                                            ctx.strokeStyle = '#ffffff';
-                                            ctx.lineWidth = 2;
-                                            
-                                            // 绘制网段信息（左对齐）
-                                            var segmentText = '网段 ' + (i + 1) + ': ' + subnet.cidr;
-                                            var addressText = '可用地址: ' + subnet.usable_addresses.toLocaleString();
-                                            
-                                            // 网段信息左对齐，地址数在固定位置对齐
-                                            var addressX = x + 250; // 固定地址数的起始位置
-                                            
-                                            ctx.strokeText(segmentText, x + 15, y + barHeight / 2);
-                                            ctx.fillText(segmentText, x + 15, y + barHeight / 2);
-                                            ctx.strokeText(addressText, addressX, y + barHeight / 2);
-                                            ctx.fillText(addressText, addressX, y + barHeight / 2);
-                                            
-                                            y += barHeight + padding;
-                                        }
-                                        
-                                        // 13. 绘制图例
-                                        y += 20;
-                                        ctx.fillStyle = '#34495e';
-                                        ctx.font = '14px Arial';
-                                        ctx.fillText('图例:', x, y);
-                                        
-                                        y += 10;
-                                        ctx.fillStyle = '#95a5a6';
-                                        ctx.fillRect(x, y, 20, 15);
-                                        ctx.fillStyle = '#000000';
-                                        ctx.font = '12px Arial';
-                                        ctx.textBaseline = 'middle';
-                                        ctx.fillText('父网段', x + 30, y + 7);
-                                        
-                                        ctx.fillStyle = '#3498db';
-                                        ctx.fillRect(x + 100, y, 20, 15);
-                                        ctx.fillStyle = '#000000';
-                                        ctx.fillText('切分网段', x + 130, y + 7);
-                                        
-                                        ctx.fillStyle = '#27ae60';
-                                        ctx.fillRect(x + 200, y, 20, 15);
-                                        ctx.fillStyle = '#000000';
-                                        ctx.fillText('剩余网段', x + 230, y + 7);
-                                        
-                                        console.log('✅ 图表绘制完成');
-                                    } catch (error) {
-                                        console.error('绘制图表时发生错误:', error);
-                                        
-                                        // 尝试获取canvas元素并显示错误信息
-                                        var canvas = document.getElementById('subnetChartCanvas');
-                                        if (canvas) {
-                                            var ctx = canvas.getContext('2d');
-                                            if (ctx) {
-                                                // 设置最小高度以显示错误信息
-                                                canvas.height = 200;
-                                                ctx.clearRect(0, 0, canvas.width, canvas.height);
-                                                ctx.fillStyle = '#e74c3c';
-                                                ctx.font = '16px Arial';
-                                                ctx.textAlign = 'center';
-                                                ctx.fillText('图表加载失败: ' + error.message, canvas.width / 2, canvas.height / 2);
-                                            }}
-                                    }
-                                }
-                            
-                            // 页面加载完成后绘制图表
-                            window.onload = function() {
-                                // 检查是否有结果数据
-                                {% if result and not result.error %}
-                                    drawSubnetChart();
-                                {% endif %}
-                            };
-                            
-                            // 监听标签页切换事件，当切换到图表标签页时重新绘制
-                            document.addEventListener('DOMContentLoaded', function() {
-                                // 监听所有标签页按钮，包括功能选项卡和结果标签页
-                                var tabs = document.querySelectorAll('.tab, .result-tab');
-                                tabs.forEach(function(tab) {
-                                    tab.addEventListener('click', function(e) {
-                                        if (e.target.textContent === '网段分布图表' || e.target.innerHTML === '网段分布图表') {
-                                            setTimeout(function() {
-                                                console.log('切换到图表标签页，重新绘制图表');
-                                                drawSubnetChart();
-                                            }, 100);
-                                        }
-                                    });
-                                });
-                            });
-                              </script>
+                            <div class="pager" id="subnet-chart-pager"></div>
+                            <!-- 剩余网段以列式JSON嵌入一次，表格和图表都在浏览器端生成 -->
+                            <script type="application/json" id="split-result-data">{{ split_payload }}</script>
                           </div>
                     {% endif %}
                 </div>
@@ -781,330 +256,50 @@ HTML_TEMPLATE = '''
                     
                     <h3>已分配子网</h3>
                     <div class="table-container">
-                        <table class="subnet-table">
-                            <tr>
-                                <th>序号</th>
-                                <th>名称</th>
-                                <th>CIDR</th>
-                                <th>需求主机数</th>
-                                <th>可用主机数</th>
-                                <th>网络地址</th>
-                                <th>广播地址</th>
-                                <th>起始IP</th>
-                                <th>结束IP</th>
-                                <th>子网掩码</th>
-                            </tr>
-                            {% for subnet in plan_result.allocated_subnets %}
+                        <table class="subnet-table" id="plan-allocated-table">
+                            <thead>
                                 <tr>
-                                    <td>{{ loop.index }}</td>
-                                    <td>{{ subnet.name }}</td>
-                                    <td>{{ subnet.cidr }}</td>
-                                    <td>{{ subnet.required_hosts }}</td>
-                                    <td>{{ subnet.available_hosts }}</td>
-                                    <td>{{ subnet.info.network }}</td>
-                                    <td>{{ subnet.info.broadcast }}</td>
-                                    <td>{{ subnet.info.host_range_start }}</td>
-                                    <td>{{ subnet.info.host_range_end }}</td>
-                                    <td>{{ subnet.info.netmask }}</td>
+                                    <th>序号</th>
+                                    <th>名称</th>
+                                    <th>CIDR</th>
+                                    <th>需求主机数</th>
+                                    <th>可用主机数</th>
+                                    <th>网络地址</th>
+                                    <th>广播地址</th>
+                                    <th>起始IP</th>
+                                    <th>结束IP</th>
+                                    <th>子网掩码</th>
                                 </tr>
-                            {% endfor %}
+                            </thead>
+                            <tbody></tbody>
                         </table>
+                        <div class="pager" id="plan-allocated-pager"></div>
                     </div>
                     
                     {% if plan_result.remaining_subnets %}
                         <h3>剩余可用网段</h3>
                         <div class="table-container">
-                            <table class="subnet-table">
-                                <tr>
-                                    <th>序号</th>
-                                    <th>网段</th>
-                                    <th>可用地址</th>
-                                </tr>
-                                {% for subnet in plan_result.remaining_subnets %}
-                                    {% set info = plan_result.remaining_subnets_info[loop.index0] %}
+                            <table class="subnet-table" id="plan-remaining-table">
+                                <thead>
                                     <tr>
-                                        <td>{{ loop.index }}</td>
-                                        <td>{{ subnet }}</td>
-                                        <td>{{ info.usable_addresses }}</td>
+                                        <th>序号</th>
+                                        <th>网段</th>
+                                        <th>可用地址</th>
                                     </tr>
-                                {% endfor %}
+                                </thead>
+                                <tbody></tbody>
                             </table>
+                            <div class="pager" id="plan-remaining-pager"></div>
                         </div>
                     {% endif %}
+                    <script type="application/json" id="plan-result-data">{{ plan_payload }}</script>
                     {% endif %}
                 </div>
             {% endif %}
         </div>
         
-        <script>
-            // 从localStorage加载保存的表单数据和当前激活的标签页
-            let formData = JSON.parse(localStorage.getItem('formData')) || {
-                'subnet-split': {},
-                'subnet-plan': {}
-            };
-            let currentActiveTab = localStorage.getItem('currentActiveTab') || 'subnet-split';
-            
-            // 保存当前页面的表单数据
-            function saveFormData() {
-                // 获取当前激活的标签页
-                const activeTab = document.querySelector('.tool-content.active');
-                if (!activeTab) return;
-                
-                const tabId = activeTab.id;
-                const data = {};
-                
-                // 保存普通输入字段
-                const singleInputs = activeTab.querySelectorAll('input[type="text"], input[type="number"], textarea, select');
-                singleInputs.forEach(input => {
-                    if (input.name && !input.name.endsWith('[]')) {
-                        data[input.name] = input.value;
-                    }
-                });
-                
-                // 特殊处理子网规划中的数组输入字段
-                if (tabId === 'subnet-plan') {
-                    const requirementRows = activeTab.querySelectorAll('.subnet-requirement');
-                    const subnetNames = [];
-                    const subnetHosts = [];
-                    
-                    requirementRows.forEach(row => {
-                        const nameInput = row.querySelector('input[name="subnet-name[]"]');
-                        const hostsInput = row.querySelector('input[name="subnet-hosts[]"]');
-                        
-                        if (nameInput && hostsInput) {
-                            subnetNames.push(nameInput.value.trim());
-                            subnetHosts.push(hostsInput.value.trim());
-                        }
-                    });
-                    
-                    // 保存子网名称和主机数数组
-                    data['subnet-name'] = subnetNames;
-                    data['subnet-hosts'] = subnetHosts;
-                }
-                
-                formData[tabId] = data;
-                
-                // 保存到localStorage
-                localStorage.setItem('formData', JSON.stringify(formData));
-            }
-            
-            // 恢复表单数据
-            function restoreFormData(tabId) {
-                const data = formData[tabId];
-                if (!data) return;
-                
-                const targetTab = document.getElementById(tabId);
-                if (!targetTab) return;
-                
-                // 恢复普通输入字段
-                Object.keys(data).forEach(fieldName => {
-                    const value = data[fieldName];
-                    
-                    if (!Array.isArray(value)) {
-                        const inputs = targetTab.querySelectorAll(`input[name="${fieldName}"]`);
-                        inputs.forEach(input => {
-                            input.value = value;
-                        });
-                    }
-                });
-                
-                // 特殊处理子网规划中的数组输入字段
-                if (tabId === 'subnet-plan') {
-                    // 先清除现有输入行
-                    const container = document.getElementById('subnet-requirements');
-                    if (container) {
-                        // 保留标题行，移除其他行
-                        const rows = container.querySelectorAll('tr.subnet-requirement');
-                        rows.forEach(row => row.remove());
-                        
-                        // 获取子网名称和主机数数组
-                        const subnetNames = data['subnet-name'] || [];
-                        const subnetHosts = data['subnet-hosts'] || [];
-                        
-                        // 添加新的输入行并填充数据
-                        const maxLength = Math.max(subnetNames.length, subnetHosts.length);
-                        for (let i = 0; i < maxLength; i++) {
-                            addSubnetRequirement();
-                        }
-                        
-                        // 填充数据到新添加的输入行
-                        const newRows = container.querySelectorAll('tr.subnet-requirement');
-                        newRows.forEach((row, index) => {
-                            const nameInput = row.querySelector('input[name="subnet-name[]"]');
-                            const hostsInput = row.querySelector('input[name="subnet-hosts[]"]');
-                            
-                            if (nameInput && subnetNames[index]) {
-                                nameInput.value = subnetNames[index];
-                            }
-                            if (hostsInput && subnetHosts[index]) {
-                                hostsInput.value = subnetHosts[index];
-                            }
-                        });
-                    }
-                }
-            }
-            
-            // 功能选项卡切换
-            document.querySelectorAll('.tabs button[data-target]').forEach(button => {
-                button.addEventListener('click', () => {
-                    // 保存当前表单数据
-                    saveFormData();
-                    
-                    // 移除所有激活状态
-                    document.querySelectorAll('.tabs button[data-target]').forEach(btn => {
-                        btn.classList.remove('active');
-                    });
-                    document.querySelectorAll('.tool-content').forEach(content => {
-                        content.classList.remove('active');
-                    });
-                    
-                    // 添加当前激活状态
-                    const targetId = button.getAttribute('data-target');
-                    button.classList.add('active');
-                    
-                    const targetTab = document.getElementById(targetId);
-                    targetTab.classList.add('active');
-                    
-                    // 更新当前激活的标签页
-                    currentActiveTab = targetId;
-                    localStorage.setItem('currentActiveTab', currentActiveTab);
-                    
-                    // 恢复目标页面的表单数据
-                    restoreFormData(targetId);
-                });
-            });
-            
-            // 页面加载完成后初始化
-            document.addEventListener('DOMContentLoaded', function() {
-                // 如果有保存的当前激活标签页，恢复它
-                if (currentActiveTab) {
-                    // 移除所有激活状态
-                    document.querySelectorAll('.tabs button[data-target]').forEach(btn => {
-                        btn.classList.remove('active');
-                    });
-                    document.querySelectorAll('.tool-content').forEach(content => {
-                        content.classList.remove('active');
-                    });
-                    
-                    // 添加当前激活状态
-                    const button = document.querySelector(`.tabs button[data-target="${currentActiveTab}"]`);
-                    const targetTab = document.getElementById(currentActiveTab);
-                    
-                    if (button && targetTab) {
-                        button.classList.add('active');
-                        targetTab.classList.add('active');
-                        
-                        // 恢复目标页面的表单数据
-                        restoreFormData(currentActiveTab);
-                    }
-                }
-                
-                // 监听表单提交事件，保存数据并添加所有页面的数据到表单
-            const forms = document.querySelectorAll('form');
-            forms.forEach(form => {
-                form.addEventListener('submit', function(event) {
-                    saveFormData();
-                    
-                    // 创建隐藏输入字段，将所有表单数据发送给后端
-                    const formDataInput = document.createElement('input');
-                    formDataInput.type = 'hidden';
-                    formDataInput.name = 'allFormData';
-                    formDataInput.value = JSON.stringify(formData);
-                    form.appendChild(formDataInput);
-                    
-                    // 创建隐藏输入字段，将当前激活的标签页发送给后端
-                    const activeTabInput = document.createElement('input');
-                    activeTabInput.type = 'hidden';
-                    activeTabInput.name = 'currentActiveTab';
-                    activeTabInput.value = currentActiveTab;
-                    form.appendChild(activeTabInput);
-                });
-            });
-            });
-            
-            // 监听页面卸载事件，保存数据
-            window.addEventListener('beforeunload', function() {
-                saveFormData();
-            });
-            
-            // 内层结果标签页切换函数（仅影响切分结果内部的标签页）
-            function openResultTab(evt, tabName) {
-                // 移除所有标签页内容的激活状态
-                var allTabContents = document.querySelectorAll('.tab-content');
-                for (var i = 0; i < allTabContents.length; i++) {
-                    allTabContents[i].classList.remove("active");
-                }
-                
-                // 移除所有标签页按钮的激活状态
-                var allTabButtons = document.querySelectorAll('.result-tab');
-                for (var j = 0; j < allTabButtons.length; j++) {
-                    allTabButtons[j].classList.remove("active");
-                }
-                
-                // 添加当前标签页内容的激活状态
-                var targetTabContent = document.getElementById(tabName);
-                if (targetTabContent) {
-                    targetTabContent.classList.add("active");
-                }
-                
-                // 添加当前标签页按钮的激活状态
-                evt.currentTarget.classList.add("active");
-                
-                // 如果切换到图表标签页，重新绘制图表
-                if (tabName === 'subnet-chart') {
-                    setTimeout(drawSubnetChart, 100);
-                }
-            }
-            
-            // 添加子网需求
-            function addSubnetRequirement() {
-                var container = document.getElementById("subnet-requirements");
-                var newRow = document.createElement("tr");
-                newRow.className = "subnet-requirement";
-                var count = container.children.length + 1;
-                
-                newRow.innerHTML = `
-                    <td>${count}</td>
-                    <td><input type="text" name="subnet-name[]" placeholder="例如: 办公区"></td>
-                    <td><input type="number" name="subnet-hosts[]" placeholder="例如: 200" min="1"></td>
-                    <td>
-                        <button type="button" onclick="removeSubnetRequirement(this)" style="background-color: #e74c3c; color: white; border: none; padding: 6px 12px; cursor: pointer; border-radius: 4px; font-size: 14px; width: 100%;">
-                            删除
-                        </button>
-                    </td>
-                `;
-                
-                container.appendChild(newRow);
-            }
-            
-            // 删除子网需求
-            function removeSubnetRequirement(button) {
-                var row = button.closest("tr");
-                var container = document.getElementById("subnet-requirements");
-                
-                // 确保至少保留一行
-                if (container.children.length > 1) {
-                    row.remove();
-                    updateSubnetIndices();
-                } else {
-                    alert("至少需要保留一个子网需求");
-                }
-            }
-            
-            // 更新子网序号
-            function updateSubnetIndices() {
-                var container = document.getElementById("subnet-requirements");
-                const rows = container.querySelectorAll('.subnet-requirement');
-                
-                rows.forEach((row, index) => {
-                    // 更新序号列
-                    const indexCell = row.querySelector('td:first-child');
-                    if (indexCell) {
-                        indexCell.textContent = index + 1;
-                    }
-                });
-            }
-        </script>
+        <script src="{{ url_for('static', filename='js/subnet_results.js', v=static_version) }}"></script>
+        <script src="{{ url_for('static', filename='js/web_app.js', v=static_version) }}"></script>
         
         <div style="text-align: center; margin-top: 20px; color: #7f8c8d; font-size: 14px;">
             版本: v{{ version }}
@@ -1114,6 +309,193 @@ HTML_TEMPLATE = '''
 </html>
 '''
 
+# 模板在导入时编译一次，避免每次请求都以整个模板字符串为键查找缓存
+INDEX_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE)
+
+
+# 子网切分和子网规划结果缓存：切换标签页重新提交表单、翻页时不必重复计算
+RESULT_CACHE = create_result_cache()
+
+
+# 计算量上限：提交的任务在实际计算前先估算计算量，超出上限时直接拒绝
+COST_LIMITS = {
+    "steps": int(os.environ.get("NETSUB_MAX_STEPS", DEFAULT_COST_LIMITS["steps"])),
+    "remaining_blocks": int(os.environ.get("NETSUB_MAX_REMAINING_BLOCKS", DEFAULT_COST_LIMITS["remaining_blocks"])),
+    "response_bytes": int(os.environ.get("NETSUB_MAX_RESPONSE_BYTES", DEFAULT_COST_LIMITS["response_bytes"])),
+}
+
+
+def run_split_subnet(parent, split):
+    """执行子网切分：先检查估算的计算量"""
+    estimate = estimate_split_cost(parent, split)
+    if "error" not in estimate:
+        error = check_cost_limits(estimate, COST_LIMITS)
+        if error:
+            return {"error": error, "status": 413}
+    return split_subnet(parent, split)
+
+
+def cached_split_subnet(parent, split):
+    """带缓存的子网切分"""
+    result = RESULT_CACHE.get_or_compute(split_cache_key(parent, split), lambda: run_split_subnet(parent, split))
+    # 缓存按规范化后的网段共用，返回时恢复本次输入的原始写法
+    if "error" not in result and (result["parent"] != parent or result["split"] != split):
+        result = dict(result, parent=parent, split=split)
+    return result
+
+
+# 大规模子网规划放到独立的进程池中计算，避免阻塞Web工作线程
+PLAN_POOL = create_compute_pool()
+# 单次规划允许的子网需求数量上限
+MAX_PLAN_SUBNETS = int(os.environ.get("NETSUB_MAX_PLAN_SUBNETS", "5000"))
+# 估算计算步数达到该值（约15毫秒）时使用进程池计算
+HEAVY_PLAN_STEPS = 2000
+# 多级规划的节点数达到该值时使用进程池计算
+HEAVY_TREE_NODES = 500
+# 单次多地址池规划允许的地址池数量上限
+MAX_PLAN_POOLS = int(os.environ.get("NETSUB_MAX_PLAN_POOLS", "10000"))
+# 多地址池规划的子网需求数达到该值时使用进程池计算
+HEAVY_POOL_SUBNETS = 1000
+# 单次规划允许的预留网段数量上限
+MAX_RESERVED_SUBNETS = int(os.environ.get("NETSUB_MAX_RESERVED_SUBNETS", "100000"))
+# 单次冲突检测允许的网段数量上限
+MAX_CONFLICT_CIDRS = int(os.environ.get("NETSUB_MAX_CONFLICT_CIDRS", "200000"))
+# 网段数量达到该值（约0.1秒）时使用进程池检测冲突
+HEAVY_CONFLICT_CIDRS = 20000
+# 单次冲突检测最多返回的冲突数
+MAX_CONFLICT_LIMIT = 10000
+
+
+def run_subnet_planning(parent, required_subnets, reserved_subnets=None):
+    """执行子网规划：先检查规模和估算的计算量，耗时较长的规划交给进程池计算"""
+    if len(required_subnets) > MAX_PLAN_SUBNETS:
+        return {"error": f"子网需求数量超过上限（最多{MAX_PLAN_SUBNETS}个）", "status": 413}
+    if reserved_subnets and len(reserved_subnets) > MAX_RESERVED_SUBNETS:
+        return {"error": f"预留网段数量超过上限（最多{MAX_RESERVED_SUBNETS}个）", "status": 413}
+    estimate = estimate_planning_cost(parent, required_subnets, reserved_subnets)
+    if "error" in estimate:
+        return suggest_subnet_planning(parent, required_subnets, reserved_subnets)
+    error = check_cost_limits(estimate, COST_LIMITS)
+    if error:
+        return {"error": error, "status": 413}
+    if PLAN_POOL is not None and estimate["steps"] >= HEAVY_PLAN_STEPS:
+        return PLAN_POOL.run(suggest_subnet_planning, parent, required_subnets, reserved_subnets)
+    return suggest_subnet_planning(parent, required_subnets, reserved_subnets)
+
+
+def cached_suggest_subnet_planning(parent, required_subnets, reserved_subnets=None):
+    """带缓存的子网规划"""
+    result = RESULT_CACHE.get_or_compute(
+        plan_cache_key(parent, required_subnets, reserved_subnets),
+        lambda: run_subnet_planning(parent, required_subnets, reserved_subnets),
+    )
+    if "error" not in result and result["parent_cidr"] != parent:
+        result = dict(result, parent_cidr=parent)
+    return result
+
+
+# 结果表格和图表每页显示的行数；页面只嵌入第一页，其余页面通过分页接口获取
+RESULT_PAGE_SIZE = 100
+# 分页接口单次允许返回的最大行数
+MAX_PAGE_SIZE = 1000
+
+
+def to_script_json(data):
+    """序列化为紧凑JSON并转义HTML特殊字符，可直接嵌入<script type="application/json">"""
+    if data is None:
+        return Markup("null")
+    text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    text = text.replace("<", "\\u003c").replace(">", "\\u003e").replace("&", "\\u0026")
+    return Markup(text)
+
+
+def columnar_subnets(cidrs):
+    """将CIDR列表转换为列式数组：网络地址和前缀长度，其他字段由浏览器端计算
+
+    IPv4网络地址为整数；IPv6地址超出JavaScript整数精度，以地址字符串传递
+    """
+    networks = []
+    prefixes = []
+    for cidr in cidrs:
+        network = parse_network(cidr)
+        if network.version == 4:
+            networks.append(int(network.network_address))
+        else:
+            networks.append(str(network.network_address))
+        prefixes.append(network.prefixlen)
+    return {"network": networks, "prefix": prefixes}
+
+
+def subnet_page(cidrs, offset=0, limit=RESULT_PAGE_SIZE, **columns):
+    """截取结果表格的一页，返回列式数组以及总行数和起始位置
+
+    Args:
+        cidrs: 完整的CIDR列表
+        offset: 起始位置
+        limit: 每页行数
+        **columns: 需要一并截取的其他列，例如规划结果的子网名称
+    """
+    end = offset + limit
+    page = columnar_subnets(cidrs[offset:end])
+    for key, values in columns.items():
+        page[key] = values[offset:end]
+    page["total"] = len(cidrs)
+    page["offset"] = offset
+    return page
+
+
+def plan_table_page(plan_result, table, offset=0, limit=RESULT_PAGE_SIZE):
+    """截取子网规划结果中已分配子网表（allocated）或剩余网段表（remaining）的一页"""
+    if table == "allocated":
+        allocated_subnets = plan_result["allocated_subnets"]
+        return subnet_page(
+            [subnet["cidr"] for subnet in allocated_subnets],
+            offset,
+            limit,
+            name=[subnet["name"] for subnet in allocated_subnets],
+            required=[subnet["required_hosts"] for subnet in allocated_subnets],
+            count=[subnet.get("count", 1) for subnet in allocated_subnets],
+        )
+    return subnet_page(plan_result["remaining_subnets"], offset, limit)
+
+
+def build_split_payload(result):
+    """构造子网切分结果页面嵌入的数据，剩余网段只嵌入第一页"""
+    if not result or "error" in result:
+        return None
+    return {
+        "parent": columnar_subnets([result["parent"]]),
+        "split": columnar_subnets([result["split"]]),
+        "remaining": subnet_page(result["remaining_subnets"]),
+        "page_size": RESULT_PAGE_SIZE,
+        "page_url": url_for("api_split_page"),
+    }
+
+
+def build_plan_payload(plan_result):
+    """
+    构造子网规划结果页面嵌入的数据，表格只嵌入第一页
+
+    同时嵌入产生这次结果的父网段和子网需求，翻页时按它们请求，不受之后对表单的修改影响
+    """
+    if not plan_result or "error" in plan_result:
+        return None
+    payload = {
+        "parent": plan_result["parent_cidr"],
+        "subnets": [
+            {key: subnet[key] for key in ("name", "hosts", "prefix", "count") if key in subnet}
+            for subnet in plan_result["required_subnets"]
+        ],
+        "allocated": plan_table_page(plan_result, "allocated"),
+        "remaining": plan_table_page(plan_result, "remaining"),
+        "page_size": RESULT_PAGE_SIZE,
+        "page_url": url_for("api_plan_page"),
+    }
+    if "reserved_subnets" in plan_result:
+        payload["reserved"] = [reserved["cidr"] for reserved in plan_result["reserved_subnets"]]
+    return payload
+
+
 @app.route("/", methods=["GET", "POST"])
 def index():
     # 默认值设置为None，只有当表单提交包含特定字段时才更新
@@ -1171,7 +553,7 @@ def index():
             parent = request.form.get("parent", parent or "10.0.0.0/8")
             split = request.form.get("split", split or "10.21.60.0/23")
             # 执行切分
-            result = split_subnet(parent, split)
+            result = cached_split_subnet(parent, split)
         elif action == 'plan':
             # 只有子网规划表单提交时才更新这些值
             plan_parent = request.form.get('plan-parent', plan_parent or "192.168.0.0/16")
@@ -1207,7 +589,7 @@ def index():
                         required_subnets.append({"name": name, "hosts": hosts})
                     
                     # 调用子网规划建议函数
-                    plan_result = suggest_subnet_planning(plan_parent, required_subnets)
+                    plan_result = cached_suggest_subnet_planning(plan_parent, required_subnets)
                 else:
                     # 如果有无效输入，返回错误信息
                     plan_result = {"error": "请确保所有子网的主机数字段都填写了有效的整数"}
@@ -1223,7 +605,558 @@ def index():
     
     # 将 subnet_names 和 host_counts 组合成列表传递给模板
     subnet_requirements = list(zip(subnet_names, host_counts)) if subnet_names and host_counts else []
-    return render_template_string(HTML_TEMPLATE, parent=parent, split=split, result=result, plan_result=plan_result, plan_parent=plan_parent, subnet_requirements=subnet_requirements, version=__version__, active_tab=active_tab)
+    return render_template(INDEX_TEMPLATE, parent=parent, split=split, result=result, plan_result=plan_result, plan_parent=plan_parent, subnet_requirements=subnet_requirements, version=__version__, active_tab=active_tab, static_version=STATIC_VERSION,
+                           split_payload=to_script_json(build_split_payload(result)), plan_payload=to_script_json(build_plan_payload(plan_result)))
+
+
+# ---------------------------------------------------------------------------
+# JSON REST API：供自动化脚本调用，直接返回JSON，不渲染模板
+# ---------------------------------------------------------------------------
+
+# 流式输出时每次写出的数据块大小
+API_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def api_error(message, status=400):
+    """返回JSON格式的错误信息"""
+    return jsonify({"error": message}), status
+
+
+def get_api_params():
+    """获取API请求参数：优先使用JSON请求体，其次使用表单或查询参数"""
+    try:
+        data = request.get_json(silent=True)
+    except RecursionError:
+        # 嵌套过深的JSON与格式错误的JSON一样忽略
+        data = None
+    if isinstance(data, dict):
+        return data
+    return request.values.to_dict()
+
+
+def is_truthy(value, default=True):
+    """解析布尔型请求参数"""
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() not in ("0", "false", "no", "off", "")
+
+
+def get_plan_params(params):
+    """解析子网规划参数，返回(父网段, 子网需求列表, 错误信息)"""
+    parent = str(params.get("parent", "")).strip()
+    subnets = params.get("subnets")
+    if not parent:
+        return None, None, "缺少参数: parent"
+    if not isinstance(subnets, list) or not subnets:
+        return None, None, "缺少参数: subnets 必须是非空的子网需求列表"
+    required_subnets, error = get_required_subnets(subnets)
+    return parent, required_subnets, error
+
+
+def get_required_subnets(subnets):
+    """校验并规范化子网需求列表，返回(子网需求列表, 错误信息)"""
+    required_subnets = []
+    for i, subnet in enumerate(subnets, 1):
+        if not isinstance(subnet, dict):
+            return None, f"第{i}个子网需求格式错误，应包含name和hosts字段"
+        required = {"name": str(subnet.get("name") or f"子网{i}")}
+        # 可以用prefix直接指定前缀长度代替主机数，用count指定相同子网的数量
+        for key, label in (("hosts", "主机数"), ("prefix", "前缀长度"), ("count", "子网数量")):
+            if subnet.get(key) is None:
+                continue
+            try:
+                required[key] = int(subnet[key])
+            except (TypeError, ValueError):
+                return None, f"第{i}个子网需求的{label}必须是整数"
+        if "hosts" not in required and "prefix" not in required:
+            return None, f"第{i}个子网需求缺少主机数（hosts）或前缀长度（prefix）"
+        if required.get("hosts", 1) <= 0:
+            return None, f"第{i}个子网需求的主机数必须大于0"
+        if required.get("prefix", 0) < 0:
+            return None, f"第{i}个子网需求的前缀长度不能小于0"
+        if required.get("count", 1) <= 0:
+            return None, f"第{i}个子网需求的子网数量必须大于0"
+        required_subnets.append(required)
+    return required_subnets, None
+
+
+def get_reserved_subnets(params):
+    """解析预留网段参数（网段列表，或以换行、逗号、空格分隔的文本），返回(预留网段列表, 错误信息)"""
+    reserved = params.get("reserved")
+    if reserved is None or reserved == "":
+        return None, None
+    if isinstance(reserved, str):
+        reserved = reserved.replace(",", " ").split()
+    if not isinstance(reserved, list):
+        return None, "reserved 必须是网段列表"
+    return [str(cidr) for cidr in reserved], None
+
+
+def get_page_params(params):
+    """解析分页参数，返回(offset, limit, 错误信息)"""
+    try:
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", RESULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        return None, None, "offset 和 limit 必须是整数"
+    if offset < 0 or not 0 < limit <= MAX_PAGE_SIZE:
+        return None, None, f"offset 不能小于0，limit 必须在1到{MAX_PAGE_SIZE}之间"
+    return offset, limit, None
+
+
+def iter_json_chunks(head, array_key, items):
+    """将结果序列化为JSON文本块，大数组逐项序列化，避免一次性生成完整字符串
+
+    Args:
+        head: 数组之外的其他字段
+        array_key: 数组字段名
+        items: 数组元素的可迭代对象
+    """
+    head_json = json.dumps(head, ensure_ascii=False)
+    prefix = head_json[:-1] + (", " if head else "")
+    buffer = [prefix, json.dumps(array_key), ": ["]
+    size = 0
+    first = True
+    for item in items:
+        item_json = json.dumps(item, ensure_ascii=False)
+        buffer.append(item_json if first else "," + item_json)
+        first = False
+        size += len(item_json)
+        if size >= API_STREAM_CHUNK_SIZE:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    buffer.append("]}")
+    yield "".join(buffer)
+
+
+def gzip_chunks(chunks):
+    """对文本块进行流式gzip压缩"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_json_response(head, array_key, items):
+    """以流式JSON响应返回结果，客户端支持时使用gzip压缩"""
+    chunks = iter_json_chunks(head, array_key, items)
+    if "gzip" in request.headers.get("Accept-Encoding", "").lower():
+        response = Response(gzip_chunks(chunks), mimetype="application/json")
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = Response((chunk.encode("utf-8") for chunk in chunks), mimetype="application/json")
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+
+@app.route("/api/v1/info", methods=["GET", "POST"])
+def api_info():
+    """查询单个网段的详细信息"""
+    params = get_api_params()
+    cidr = str(params.get("cidr", "")).strip()
+    if not cidr:
+        return api_error("缺少参数: cidr")
+
+    info = get_subnet_info(cidr)
+    if "error" in info:
+        return api_error(info["error"])
+    return jsonify(info)
+
+
+@app.route("/api/v1/hosts", methods=["GET", "POST"])
+def api_hosts():
+    """分页获取网段中的可用主机地址，按需计算，不生成完整的地址列表
+
+    参数:
+    cidr: 网段
+    step: 可选，每隔step个地址取一个，为负数时从最后一个地址倒序，默认1
+    offset: 起始位置（按step取地址后的位置），默认0
+    limit: 每页地址数，默认100，最大1000
+    """
+    params = get_api_params()
+    cidr = str(params.get("cidr", "")).strip()
+    if not cidr:
+        return api_error("缺少参数: cidr")
+    offset, limit, error = get_page_params(params)
+    if error:
+        return api_error(error)
+    try:
+        step = int(params.get("step", 1))
+    except (TypeError, ValueError):
+        return api_error("step 必须是整数")
+    if step == 0:
+        return api_error("step 不能为0")
+    try:
+        hosts = HostSequence(cidr)[::step]
+    except ValueError as e:
+        return api_error(str(e))
+    return jsonify(
+        {"cidr": cidr, "hosts": list(hosts[offset:offset + limit]), "total": hosts.size, "offset": offset}
+    )
+
+
+@app.route("/api/v1/split", methods=["GET", "POST"])
+def api_split():
+    """子网切分：返回切分网段信息和剩余网段列表
+
+    参数:
+    parent: 父网段
+    split: 要切分的子网
+    detail: 为false时剩余网段只返回CIDR字符串列表，默认返回详细信息
+    """
+    params = get_api_params()
+    parent = str(params.get("parent", "")).strip()
+    split = str(params.get("split", "")).strip()
+    if not parent or not split:
+        return api_error("缺少参数: parent 和 split 都不能为空")
+
+    result = cached_split_subnet(parent, split)
+    if "error" in result:
+        return api_error(result["error"], result.get("status", 400))
+
+    head = {
+        "parent": result["parent"],
+        "split": result["split"],
+        "parent_info": result["parent_info"],
+        "split_info": result["split_info"],
+        "remaining_count": len(result["remaining_subnets"]),
+    }
+    if is_truthy(params.get("detail")):
+        items = result["remaining_subnets_info"]
+    else:
+        items = result["remaining_subnets"]
+    return stream_json_response(head, "remaining_subnets", items)
+
+
+@app.route("/api/v1/plan", methods=["POST"])
+def api_plan():
+    """子网规划：根据子网需求在父网段中分配子网
+
+    参数:
+    parent: 父网段
+    subnets: 子网需求列表，每项包含name和hosts两个字段
+    reserved: 可选，已使用或需要预留的网段列表，规划时不分配这些地址
+    detail: 为false时已分配子网不返回info详细信息，剩余网段只返回CIDR字符串列表
+    """
+    params = get_api_params()
+    parent, required_subnets, error = get_plan_params(params)
+    if not error:
+        reserved_subnets, error = get_reserved_subnets(params)
+    if error:
+        return api_error(error)
+
+    plan_result = cached_suggest_subnet_planning(parent, required_subnets, reserved_subnets)
+    if "error" in plan_result:
+        return api_error(plan_result["error"], plan_result.get("status", 400))
+
+    detail = is_truthy(params.get("detail"))
+    allocated = plan_result["allocated_subnets"]
+    if not detail:
+        allocated = strip_plan_details(allocated)
+    head = {
+        "parent_cidr": plan_result["parent_cidr"],
+        "allocated_subnets": allocated,
+        "remaining_count": len(plan_result["remaining_subnets"]),
+    }
+    if "reserved_subnets" in plan_result:
+        head["reserved_subnets"] = plan_result["reserved_subnets"]
+    items = plan_result["remaining_subnets_info"] if detail else plan_result["remaining_subnets"]
+    return stream_json_response(head, "remaining_subnets", items)
+
+
+def strip_plan_details(subnets):
+    """去掉分配记录中的info详细信息"""
+    return [{key: value for key, value in subnet.items() if key != "info"} for subnet in subnets]
+
+
+@app.route("/api/v1/plan/update", methods=["POST"])
+def api_plan_update():
+    """增量子网规划：在已有规划结果上删除和新增子网需求，已有的分配保持不变
+
+    参数:
+    plan: 之前/api/v1/plan返回的规划结果（至少包含parent_cidr、allocated_subnets和remaining_subnets，
+        剩余网段需为CIDR字符串列表，即detail为false时的格式）
+    add: 新增的子网需求列表，格式与subnets相同
+    remove: 要删除的子网名称列表
+    detail: 为false时分配记录不返回info详细信息，剩余网段只返回CIDR字符串列表
+    """
+    params = get_api_params()
+    plan = params.get("plan")
+    if not isinstance(plan, dict) or not all(
+        isinstance(plan.get(key), list) for key in ("allocated_subnets", "remaining_subnets")
+    ):
+        return api_error("缺少参数: plan 必须是包含allocated_subnets和remaining_subnets的规划结果")
+    added_subnets, error = get_required_subnets(params.get("add") or [])
+    if error:
+        return api_error(error)
+    removed_names = params.get("remove") or []
+    if not isinstance(removed_names, list):
+        return api_error("remove 必须是子网名称列表")
+    if len(plan["allocated_subnets"]) + len(added_subnets) > MAX_PLAN_SUBNETS:
+        return api_error(f"子网需求数量超过上限（最多{MAX_PLAN_SUBNETS}个）", 413)
+    if len(plan["remaining_subnets"]) > COST_LIMITS["remaining_blocks"]:
+        return api_error(f"剩余网段数量超过上限（最多{COST_LIMITS['remaining_blocks']}个）", 413)
+
+    try:
+        plan_result = update_subnet_planning(plan, added_subnets, [str(name) for name in removed_names])
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return api_error("plan 格式错误，请提交/api/v1/plan返回的规划结果")
+    if "error" in plan_result:
+        return api_error(plan_result["error"])
+
+    detail = is_truthy(params.get("detail"))
+    allocated = plan_result["allocated_subnets"]
+    added = plan_result["added_subnets"]
+    if not detail:
+        allocated, added = strip_plan_details(allocated), strip_plan_details(added)
+    head = {
+        "parent_cidr": plan_result["parent_cidr"],
+        "allocated_subnets": allocated,
+        "added_subnets": added,
+        "removed_subnets": [subnet["name"] for subnet in plan_result["removed_subnets"]],
+        "remaining_count": len(plan_result["remaining_subnets"]),
+    }
+    items = plan_result["remaining_subnets_info"] if detail else plan_result["remaining_subnets"]
+    return stream_json_response(head, "remaining_subnets", items)
+
+
+def count_tree_nodes(nodes):
+    """统计多级规划请求中的节点数和层数，返回(节点数, 层数)，格式错误的部分不计入，由规划函数报告"""
+    total = 0
+    depth = 0
+    stack = [(nodes, 1)]
+    while stack:
+        level, level_number = stack.pop()
+        if not isinstance(level, list):
+            continue
+        total += len(level)
+        depth = max(depth, level_number)
+        stack.extend((node.get("children"), level_number + 1) for node in level if isinstance(node, dict))
+    return total, depth
+
+
+@app.route("/api/v1/plan/tree", methods=["POST"])
+def api_plan_tree():
+    """多级子网规划：按区域、站点、VLAN等多级需求一次完成规划
+
+    参数:
+    parent: 父网段
+    tree: 第一级节点列表，中间节点包含children，叶子节点包含hosts或prefix（可选count）
+    headroom: 可选，中间节点额外预留的比例，默认0
+    detail: 为false时分配记录不返回info详细信息
+    """
+    params = get_api_params()
+    parent = str(params.get("parent", "")).strip()
+    tree = params.get("tree")
+    if not parent:
+        return api_error("缺少参数: parent")
+    if not isinstance(tree, list) or not tree:
+        return api_error("缺少参数: tree 必须是非空的节点列表")
+    nodes, depth = count_tree_nodes(tree)
+    if nodes > MAX_PLAN_SUBNETS:
+        return api_error(f"节点数量超过上限（最多{MAX_PLAN_SUBNETS}个）", 413)
+    if depth > MAX_TREE_DEPTH:
+        return api_error(f"节点层级超过上限（最多{MAX_TREE_DEPTH}级）")
+    headroom = params.get("headroom", 0)
+
+    if PLAN_POOL is not None and nodes >= HEAVY_TREE_NODES:
+        result = PLAN_POOL.run(plan_hierarchy, parent, tree, headroom)
+    else:
+        result = plan_hierarchy(parent, tree, headroom)
+    if "error" in result:
+        return api_error(result["error"], result.get("status", 400))
+
+    allocated = result["allocated_subnets"]
+    if not is_truthy(params.get("detail")):
+        allocated = strip_plan_details(allocated)
+    head = {"parent_cidr": result["parent_cidr"], "remaining_subnets": result["remaining_subnets"]}
+    return stream_json_response(head, "allocated_subnets", allocated)
+
+
+@app.route("/api/v1/plan/pools", methods=["POST"])
+def api_plan_pools():
+    """多地址池子网规划：在多个不连续的父网段中分配子网需求
+
+    参数:
+    pools: 地址池列表，每项为CIDR字符串，或{"cidr": ..., "priority": ...}（数值越小越优先，默认0）
+    subnets: 子网需求列表，格式与/api/v1/plan相同
+    detail: 为false时已分配子网不返回info详细信息，剩余网段只返回CIDR字符串列表
+    """
+    params = get_api_params()
+    pools = params.get("pools")
+    if isinstance(pools, str):
+        pools = pools.replace(",", " ").split()
+    if not isinstance(pools, list) or not pools:
+        return api_error("缺少参数: pools 必须是非空的地址池列表")
+    if len(pools) > MAX_PLAN_POOLS:
+        return api_error(f"地址池数量超过上限（最多{MAX_PLAN_POOLS}个）", 413)
+    subnets = params.get("subnets")
+    if not isinstance(subnets, list) or not subnets:
+        return api_error("缺少参数: subnets 必须是非空的子网需求列表")
+    required_subnets, error = get_required_subnets(subnets)
+    if error:
+        return api_error(error)
+    if len(required_subnets) > MAX_PLAN_SUBNETS:
+        return api_error(f"子网需求数量超过上限（最多{MAX_PLAN_SUBNETS}个）", 413)
+
+    if PLAN_POOL is not None and len(required_subnets) >= HEAVY_POOL_SUBNETS:
+        plan_result = PLAN_POOL.run(suggest_multi_pool_planning, pools, required_subnets)
+    else:
+        plan_result = suggest_multi_pool_planning(pools, required_subnets)
+    if "error" in plan_result:
+        return api_error(plan_result["error"], plan_result.get("status", 400))
+
+    detail = is_truthy(params.get("detail"))
+    allocated = plan_result["allocated_subnets"]
+    if not detail:
+        allocated = strip_plan_details(allocated)
+    head = {
+        "parent_pools": plan_result["parent_pools"],
+        "allocated_subnets": allocated,
+        "remaining_count": len(plan_result["remaining_subnets"]),
+    }
+    items = plan_result["remaining_subnets_info"] if detail else plan_result["remaining_subnets"]
+    return stream_json_response(head, "remaining_subnets", items)
+
+
+@app.route("/api/v1/split/page", methods=["GET", "POST"])
+def api_split_page():
+    """分页获取子网切分的剩余网段，返回列式数组（network/prefix）以及total和offset
+
+    参数:
+    parent: 父网段
+    split: 要切分的子网
+    offset: 起始位置，默认0
+    limit: 每页行数，默认100，最大1000
+    """
+    params = get_api_params()
+    parent = str(params.get("parent", "")).strip()
+    split = str(params.get("split", "")).strip()
+    if not parent or not split:
+        return api_error("缺少参数: parent 和 split 都不能为空")
+    offset, limit, error = get_page_params(params)
+    if error:
+        return api_error(error)
+
+    result = cached_split_subnet(parent, split)
+    if "error" in result:
+        return api_error(result["error"], result.get("status", 400))
+    return jsonify(subnet_page(result["remaining_subnets"], offset, limit))
+
+
+@app.route("/api/v1/plan/page", methods=["POST"])
+def api_plan_page():
+    """分页获取子网规划结果，返回列式数组以及total和offset
+
+    参数:
+    parent: 父网段
+    subnets: 子网需求列表，每项包含name和hosts两个字段
+    reserved: 可选，预留网段列表
+    table: allocated（已分配子网，额外返回name和required列）或remaining（剩余网段）
+    offset: 起始位置，默认0
+    limit: 每页行数，默认100，最大1000
+    """
+    params = get_api_params()
+    parent, required_subnets, error = get_plan_params(params)
+    if not error:
+        reserved_subnets, error = get_reserved_subnets(params)
+    if error:
+        return api_error(error)
+    table = params.get("table", "allocated")
+    if table not in ("allocated", "remaining"):
+        return api_error("table 必须是 allocated 或 remaining")
+    offset, limit, error = get_page_params(params)
+    if error:
+        return api_error(error)
+
+    plan_result = cached_suggest_subnet_planning(parent, required_subnets, reserved_subnets)
+    if "error" in plan_result:
+        return api_error(plan_result["error"], plan_result.get("status", 400))
+    return jsonify(plan_table_page(plan_result, table, offset, limit))
+
+
+@app.route("/api/v1/estimate", methods=["GET", "POST"])
+def api_estimate():
+    """估算计算量：不执行实际计算，返回预计的剩余网段数、计算步数和响应大小
+
+    参数:
+    parent: 父网段
+    split: 要切分的子网（估算子网切分）
+    subnets: 子网需求列表（估算子网规划，仅支持POST）
+    reserved: 可选，子网规划的预留网段列表
+    """
+    params = get_api_params()
+    if "subnets" in params:
+        parent, required_subnets, error = get_plan_params(params)
+        if not error:
+            reserved_subnets, error = get_reserved_subnets(params)
+        if error:
+            return api_error(error)
+        estimate = estimate_planning_cost(parent, required_subnets, reserved_subnets)
+    else:
+        parent = str(params.get("parent", "")).strip()
+        split = str(params.get("split", "")).strip()
+        if not parent or not split:
+            return api_error("缺少参数: parent 和 split（或 subnets）不能为空")
+        estimate = estimate_split_cost(parent, split)
+    if "error" in estimate:
+        return api_error(estimate["error"])
+
+    error = check_cost_limits(estimate, COST_LIMITS)
+    return jsonify(dict(estimate, limits=COST_LIMITS, accepted=error is None, reason=error))
+
+
+@app.route("/api/v1/conflicts", methods=["POST"])
+def api_conflicts():
+    """冲突检测：找出网段列表中重复或互相包含的网段
+
+    参数:
+    cidrs: 网段列表，也可以是以换行、逗号或空格分隔的文本
+    limit: 最多返回的冲突数，默认1000
+    """
+    params = get_api_params()
+    cidrs = params.get("cidrs")
+    if isinstance(cidrs, str):
+        cidrs = cidrs.replace(",", " ").split()
+    if not isinstance(cidrs, list) or not cidrs:
+        return api_error("缺少参数: cidrs 必须是非空的网段列表")
+    if len(cidrs) > MAX_CONFLICT_CIDRS:
+        return api_error(f"网段数量超过上限（最多{MAX_CONFLICT_CIDRS}个）", 413)
+    try:
+        limit = int(params.get("limit", 1000))
+    except (TypeError, ValueError):
+        return api_error("limit 必须是整数")
+    if not 0 < limit <= MAX_CONFLICT_LIMIT:
+        return api_error(f"limit 必须在1到{MAX_CONFLICT_LIMIT}之间")
+
+    cidrs = [str(cidr) for cidr in cidrs]
+    if PLAN_POOL is not None and len(cidrs) >= HEAVY_CONFLICT_CIDRS:
+        result = PLAN_POOL.run(find_subnet_conflicts, cidrs, limit)
+    else:
+        result = find_subnet_conflicts(cidrs, limit)
+    if "error" in result:
+        return api_error(result["error"], result.get("status", 400))
+    return jsonify(result)
+
+
+@app.route("/api/v1/cache/stats", methods=["GET"])
+def api_cache_stats():
+    """查询计算结果缓存的命中统计"""
+    return jsonify(RESULT_CACHE.stats())
+
+
+@app.route("/api/v1/pool/stats", methods=["GET"])
+def api_pool_stats():
+    """查询重计算进程池的任务统计"""
+    if PLAN_POOL is None:
+        return jsonify({"enabled": False})
+    return jsonify(dict(PLAN_POOL.stats(), enabled=True))
+
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
@@ -6,12 +6,84 @@
 """
 
 # 所有导入语句放在最顶部
+import time
+
+# 启动计时起点，必须在其他导入之前记录，用于启动耗时报告
+_STARTUP_T0 = time.perf_counter()
+
+import os
+import sys
+import json
 import tkinter as tk
 import math
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk, filedialog, messagebox, font as tkfont
 
 # 导入自定义模块
-from ip_subnet_calculator import split_subnet, ip_to_int, get_subnet_info, suggest_subnet_planning
+from ip_subnet_calculator import (
+    split_subnet,
+    ip_to_int,
+    get_subnet_info,
+    suggest_subnet_planning,
+    estimate_split_cost,
+    estimate_planning_cost,
+    check_cost_limits,
+)
+
+
+# 启动耗时计时器：记录导入完成、首次绘制和可交互的时间点，便于跨版本跟踪启动性能
+class StartupTimer:
+    # 导出功能依赖的重型库，启动阶段不应被导入
+    LAZY_MODULES = ("reportlab", "openpyxl")
+
+    def __init__(self, t0):
+        self.t0 = t0
+        self.marks = {}
+
+    def mark(self, name):
+        """记录一个时间点（毫秒，相对于启动计时起点），同名时间点只记录第一次"""
+        if name not in self.marks:
+            self.marks[name] = round((time.perf_counter() - self.t0) * 1000, 1)
+
+    def attach(self, root, on_interactive=None):
+        """绑定主窗口事件：窗口首次映射记为首次绘制，随后的首个空闲时刻记为可交互"""
+
+        def on_interactive_idle():
+            self.mark("interactive")
+            if on_interactive:
+                on_interactive()
+
+        def on_map(event):
+            if event.widget is root and "first_paint" not in self.marks:
+                root.update_idletasks()
+                self.mark("first_paint")
+                root.after_idle(on_interactive_idle)
+
+        root.bind("<Map>", on_map, add="+")
+
+    def report(self, version):
+        """生成启动耗时报告字典"""
+        return {
+            "version": version,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "import_ms": self.marks.get("import"),
+            "app_init_ms": self.marks.get("app_init"),
+            "first_paint_ms": self.marks.get("first_paint"),
+            "interactive_ms": self.marks.get("interactive"),
+            "lazy_modules_loaded": [m for m in self.LAZY_MODULES if m in sys.modules],
+        }
+
+    def write_report(self, path, version):
+        """以JSON Lines格式追加写入启动耗时报告，便于跨版本对比"""
+        report = self.report(version)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(report, ensure_ascii=False) + "\n")
+        return report
+
+
+STARTUP_TIMER = StartupTimer(_STARTUP_T0)
 
 
 # 自定义的ColoredNotebook类，支持每个标签不同颜色
@@ -240,9 +312,22 @@ class ColoredNotebook(ttk.Frame):
             # 发生错误时，不设置自定义背景色，使用默认样式
             pass
 
-    def add_tab(self, label, content_frame, color="#e0e0e0"):
-        """添加一个新标签"""
-        tab = {"label": label, "content": content_frame, "color": color, "button": None}
+    def add_tab(self, label, content_frame, color="#e0e0e0", builder=None):
+        """添加一个新标签
+
+        Args:
+            label: 标签文字
+            content_frame: 标签内容框架
+            color: 标签颜色
+            builder: 可选的内容构建函数，首次选中该标签时才调用，用于延迟创建标签页内容
+        """
+        tab = {
+            "label": label,
+            "content": content_frame,
+            "color": color,
+            "button": None,
+            "builder": builder,
+        }
 
         # 创建标签按钮 - 移除边框和间距，使标签栏更好地融入背景
         # 设置初始样式参数
@@ -341,8 +426,9 @@ class ColoredNotebook(ttk.Frame):
                     foreground="#333333",  # 默认深灰色文字
                 )
 
-        # 显示选中的标签内容
+        # 显示选中的标签内容，首次选中时先构建延迟创建的内容
         selected_tab = self.tabs[tab_index]
+        self._build_tab_content(selected_tab)
         selected_tab["content"].pack(fill="both", expand=True, padx=0, pady=0)
         
         # 更新当前激活的标签页索引
@@ -401,12 +487,117 @@ class ColoredNotebook(ttk.Frame):
         if self.tab_change_callback:
             self.tab_change_callback(tab_index)
 
+    def _build_tab_content(self, tab):
+        """调用标签的内容构建函数（只调用一次）"""
+        builder = tab.get("builder")
+        if builder is not None:
+            # 先清除构建函数，避免构建过程中再次选中标签时重复构建
+            tab["builder"] = None
+            builder()
+
+    def is_tab_built(self, tab_index):
+        """判断标签内容是否已经构建"""
+        if tab_index < 0 or tab_index >= len(self.tabs):
+            return False
+        return self.tabs[tab_index].get("builder") is None
+
     def add(self, frame, text=""):
         """模拟ttk.Notebook的add方法"""
         # 这里我们不使用这个方法，而是使用add_tab方法
         pass
 
 
+# 图表标签绘制器：缓存文字尺寸，用单个文字项加深色底板代替多次偏移绘制的描边效果
+class ChartLabelRenderer:
+    def __init__(self, canvas, max_cache_size=4096, plate_padding=(4, 2)):
+        self.canvas = canvas
+        # 缓存上限，超过后整体清空，避免长时间运行时无限增长
+        self.max_cache_size = max_cache_size
+        self.plate_padding = plate_padding
+        # 字体对象缓存：字体描述 -> tkfont.Font
+        self._fonts = {}
+        # 文字尺寸缓存：(字体描述, 文字) -> (宽度, 高度)
+        self._metrics = {}
+
+    def _get_font(self, font):
+        """获取（并缓存）字体对象"""
+        font_obj = self._fonts.get(font)
+        if font_obj is None:
+            font_obj = tkfont.Font(root=self.canvas, font=font)
+            self._fonts[font] = font_obj
+        return font_obj
+
+    def measure(self, text, font):
+        """测量文字的像素宽高，按(字体, 文字)缓存结果
+
+        Returns:
+            tuple: (宽度, 高度)
+        """
+        key = (font, text)
+        metrics = self._metrics.get(key)
+        if metrics is None:
+            font_obj = self._get_font(font)
+            metrics = (font_obj.measure(text), font_obj.metrics("linespace"))
+            if len(self._metrics) >= self.max_cache_size:
+                self._metrics.clear()
+            self._metrics[key] = metrics
+        return metrics
+
+    def clear_cache(self):
+        """清空尺寸缓存（例如字体缩放设置变化后）"""
+        self._metrics.clear()
+        self._fonts.clear()
+
+    @staticmethod
+    def shade_color(color, factor=0.45):
+        """将#rrggbb颜色按比例调暗，用作与白色文字对比的底板颜色"""
+        try:
+            red = int(int(color[1:3], 16) * factor)
+            green = int(int(color[3:5], 16) * factor)
+            blue = int(int(color[5:7], 16) * factor)
+            return f"#{red:02x}{green:02x}{blue:02x}"
+        except (ValueError, IndexError, TypeError):
+            return "#000000"
+
+    def draw_label_row(self, labels, y, font, fill="#ffffff", plate="#000000"):
+        """在同一行绘制一组左对齐标签，共用一个底板
+
+        每个标签只创建一个文字项，整行只创建一个底板矩形，
+        相比4方向描边（每个标签5个文字项）大幅减少Canvas项目数。
+
+        Args:
+            labels: [(文字, 起始x坐标), ...]
+            y: 行中心y坐标
+            font: 字体设置
+            fill: 文字颜色
+            plate: 底板颜色，为None时不绘制底板
+        """
+        if not labels:
+            return
+
+        if plate:
+            pad_x, pad_y = self.plate_padding
+            left = min(label_x for _, label_x in labels)
+            right = left
+            height = 0
+            for text, label_x in labels:
+                width, text_height = self.measure(text, font)
+                right = max(right, label_x + width)
+                height = max(height, text_height)
+            self.canvas.create_rectangle(
+                left - pad_x,
+                y - height / 2 - pad_y,
+                right + pad_x,
+                y + height / 2 + pad_y,
+                fill=plate,
+                outline="",
+                width=0,
+            )
+
+        for text, label_x in labels:
+            self.canvas.create_text(label_x, y, text=text, font=font, anchor=tk.W, fill=fill)
+
+
 class IPSubnetSplitterApp:
     def __init__(self, root):
         # 导入版本管理模块
@@ -775,12 +966,12 @@ class IPSubnetSplitterApp:
             self.top_level_notebook.content_area, style=self.top_level_notebook.get_light_pink_style()
         )
 
-        # 设置子网规划功能的界面
-        self.setup_planning_page()
-
         # 添加顶级标签页 - 使用不同颜色
+        # 子网规划功能的界面在首次切换到该标签页时才创建，缩短启动时间
         self.top_level_notebook.add_tab("子网切分", self.split_frame, "#fff3e0")  # 浅橙色
-        self.top_level_notebook.add_tab("子网规划", self.planning_frame, "#fce4ec")  # 淡粉色
+        self.top_level_notebook.add_tab(
+            "子网规划", self.planning_frame, "#fce4ec", builder=self.setup_planning_page
+        )  # 淡粉色
 
     def create_result_section(self):
         """创建结果显示区域"""
@@ -897,33 +1088,15 @@ class IPSubnetSplitterApp:
             self.notebook.content_area, padding="5", style=self.notebook.get_light_purple_style()
         )
 
+        # 图表Canvas在首次切换到图表标签页时才创建
+        self.chart_canvas = None
+
         # 添加标签页，每个标签页设置不同的颜色
         self.notebook.add_tab("切分网段信息", self.split_info_frame, "#e3f2fd")  # 浅蓝色
         self.notebook.add_tab("剩余网段列表", self.remaining_frame, "#e8f5e9")  # 浅绿色
-        self.notebook.add_tab("网段分布图表", self.chart_frame, "#f3e5f5")  # 浅紫色
-
-        # 创建滚动容器
-        scroll_frame = ttk.Frame(self.chart_frame)
-        scroll_frame.pack(fill=tk.BOTH, expand=True)
-
-        # 添加滚动条
-        self.chart_scrollbar = ttk.Scrollbar(scroll_frame, orient=tk.VERTICAL)
-        self.chart_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        # 创建Canvas用于绘制柱状图，移除pady边距以避免显示灰色背景
-        self.chart_canvas = tk.Canvas(
-            scroll_frame, bg="white", yscrollcommand=self.chart_scrollbar.set
-        )
-        self.chart_canvas.pack(fill=tk.BOTH, expand=True, pady=0)
-
-        # 配置滚动条
-        self.chart_scrollbar.config(command=self.chart_canvas.yview)
-
-        # 绑定窗口大小变化事件，实现图表自适应
-        self.chart_canvas.bind("<Configure>", self.on_chart_resize)
-        # 绑定鼠标滚轮事件
-        self.chart_canvas.bind("<MouseWheel>", self.on_chart_mousewheel)
-        self.chart_frame.bind("<Enter>", lambda e: self.chart_canvas.focus_set())
+        self.notebook.add_tab(
+            "网段分布图表", self.chart_frame, "#f3e5f5", builder=self.build_chart_section
+        )  # 浅紫色
 
         # 调整列宽，确保所有列都能完整显示并自适应窗口宽度
         self.remaining_tree.column("broadcast", minwidth=100, width=130, stretch=True)
@@ -951,6 +1124,34 @@ class IPSubnetSplitterApp:
         # 在窗口完全渲染后再调用动态计算方法，确保获取准确的高度
         self.root.after(100, self.initial_table_setup)
 
+    def build_chart_section(self):
+        """创建网段分布图表页面的内容（首次切换到图表标签页时调用）"""
+        # 创建滚动容器
+        scroll_frame = ttk.Frame(self.chart_frame)
+        scroll_frame.pack(fill=tk.BOTH, expand=True)
+
+        # 添加滚动条
+        self.chart_scrollbar = ttk.Scrollbar(scroll_frame, orient=tk.VERTICAL)
+        self.chart_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # 创建Canvas用于绘制柱状图，移除pady边距以避免显示灰色背景
+        self.chart_canvas = tk.Canvas(
+            scroll_frame, bg="white", yscrollcommand=self.chart_scrollbar.set
+        )
+        self.chart_canvas.pack(fill=tk.BOTH, expand=True, pady=0)
+
+        # 图表标签绘制器（缓存文字尺寸，减少每个网段条的Canvas项目数）
+        self.chart_label_renderer = ChartLabelRenderer(self.chart_canvas)
+
+        # 配置滚动条
+        self.chart_scrollbar.config(command=self.chart_canvas.yview)
+
+        # 绑定窗口大小变化事件，实现图表自适应
+        self.chart_canvas.bind("<Configure>", self.on_chart_resize)
+        # 绑定鼠标滚轮事件
+        self.chart_canvas.bind("<MouseWheel>", self.on_chart_mousewheel)
+        self.chart_frame.bind("<Enter>", lambda e: self.chart_canvas.focus_set())
+
     def setup_planning_page(self):
         """设置子网规划功能的界面"""
         # 创建主框架
@@ -1504,6 +1705,19 @@ class IPSubnetSplitterApp:
             del self.current_edit_column
             del self.current_edit_column_index
 
+    def confirm_heavy_task(self, estimate):
+        """计算量超过上限时询问是否继续，返回True表示继续计算"""
+        if "error" in estimate:
+            return True
+        reason = check_cost_limits(estimate)
+        if reason is None:
+            return True
+        return messagebox.askyesno(
+            "计算量过大",
+            f"{reason}。\n\n继续计算可能需要较长时间，期间界面将无法响应。是否继续？",
+            icon="warning",
+        )
+
     def execute_subnet_planning(self):
         """执行子网规划"""
         # 获取父网段
@@ -1526,7 +1740,11 @@ class IPSubnetSplitterApp:
             # 执行子网规划
             # 转换子网需求格式以匹配函数参数要求
             formatted_requirements = [{'name': name, 'hosts': hosts} for name, hosts in subnet_requirements]
-            
+
+            # 先估算计算量，过大时由用户决定是否继续
+            if not self.confirm_heavy_task(estimate_planning_cost(parent_cidr, formatted_requirements)):
+                return
+
             # 调用子网规划函数
             plan_result = suggest_subnet_planning(parent_cidr, formatted_requirements)
             
@@ -1551,7 +1769,12 @@ class IPSubnetSplitterApp:
                     tk.END,
                     values=(
                         subnet["name"],
-                        subnet["cidr"],
+                        # 同一需求的多个相同子网只显示第一个和最后一个
+                        (
+                            f"{subnet['cidr']} ~ {subnet['last_cidr']} (×{subnet['count']})"
+                            if subnet.get("count", 1) > 1
+                            else subnet["cidr"]
+                        ),
                         subnet["required_hosts"],
                         subnet["available_hosts"],
                         subnet["info"]["network"],
@@ -1607,6 +1830,10 @@ class IPSubnetSplitterApp:
             self.split_tree.tag_configure("error", foreground="red")
             return
 
+        # 先估算计算量，过大时由用户决定是否继续
+        if not self.confirm_heavy_task(estimate_split_cost(parent, split)):
+            return
+
         try:
             # 调用切分函数
             result = split_subnet(parent, split)
@@ -1855,6 +2082,9 @@ class IPSubnetSplitterApp:
         # 检查chart_data属性是否存在且不为None
         if not hasattr(self, 'chart_data') or not self.chart_data:
             return
+        # 图表标签页尚未创建时不绘制，切换到图表标签页时会重新绘制
+        if self.chart_canvas is None:
+            return
 
         try:
             # 清空Canvas
@@ -1941,22 +2171,17 @@ class IPSubnetSplitterApp:
             # 绘制父网段信息
             usable_addresses = parent_range - 2 if parent_range > 2 else parent_range
 
-            # 网段信息 - 使用带描边的文字绘制，提高可见度
+            # 网段信息和可用地址数 - 单个文字项加深色底板，提高可见度
             segment_text = f"父网段: {parent_cidr}"
-            text_x = x + 15
+            address_text = f"可用地址数: {usable_addresses:,}"
             text_y = y + bar_height / 2
             font = ("微软雅黑", 11, "bold")  # 使用粗体提高可读性
-            # 使用带描边的文字绘制方法
-            self.draw_text_with_stroke(
-                segment_text, text_x, text_y, font, anchor=tk.W, fill="#ffffff"
-            )
-
-            # 可用地址数 - 使用带描边的文字绘制，提高可见度
-            address_text = f"可用地址数: {usable_addresses:,}"
-            text_x = x + 250
-            # 使用带描边的文字绘制方法
-            self.draw_text_with_stroke(
-                address_text, text_x, text_y, font, anchor=tk.W, fill="#ffffff"
+            self.chart_label_renderer.draw_label_row(
+                [(segment_text, x + 15), (address_text, x + 250)],
+                text_y,
+                font,
+                fill="#ffffff",
+                plate=ChartLabelRenderer.shade_color(color),
             )
 
             y += bar_height + padding
@@ -1981,22 +2206,17 @@ class IPSubnetSplitterApp:
                 name = network.get("name", "")
                 usable_addresses = network_range - 2 if network_range > 2 else network_range
 
-                # 网段信息 - 使用带描边的文字绘制，提高可见度
+                # 网段信息和可用地址数 - 单个文字项加深色底板，提高可见度
                 segment_text = f"切分网段: {name}"
-                text_x = x + 15
+                address_text = f"可用地址数: {usable_addresses:,}"
                 text_y = y + bar_height / 2
                 font = ("微软雅黑", 11, "bold")  # 使用粗体提高可读性
-                # 使用带描边的文字绘制方法
-                self.draw_text_with_stroke(
-                    segment_text, text_x, text_y, font, anchor=tk.W, fill="#ffffff"
-                )
-
-                # 可用地址数 - 使用带描边的文字绘制，提高可见度
-                address_text = f"可用地址数: {usable_addresses:,}"
-                text_x = x + 250
-                # 使用带描边的文字绘制方法
-                self.draw_text_with_stroke(
-                    address_text, text_x, text_y, font, anchor=tk.W, fill="#ffffff"
+                self.chart_label_renderer.draw_label_row(
+                    [(segment_text, x + 15), (address_text, x + 250)],
+                    text_y,
+                    font,
+                    fill="#ffffff",
+                    plate=ChartLabelRenderer.shade_color(color),
                 )
 
                 y += bar_height + padding
@@ -2067,22 +2287,17 @@ class IPSubnetSplitterApp:
                 name = network.get("name", "")
                 usable_addresses = network_range - 2 if network_range > 2 else network_range
 
-                # 网段信息 - 使用带描边的文字绘制，提高可见度
+                # 网段信息和可用地址数 - 单个文字项加深色底板，提高可见度
                 segment_text = f"网段 {i + 1}: {name}"
-                text_x = x + 15
+                address_text = f"可用地址数: {usable_addresses:,}"
                 text_y = y + bar_height / 2
                 font = ("微软雅黑", 9, "bold")  # 使用粗体提高可读性
-                # 使用带描边的文字绘制方法
-                self.draw_text_with_stroke(
-                    segment_text, text_x, text_y, font, anchor=tk.W, fill="#ffffff"
-                )
-
-                # 可用地址数 - 使用带描边的文字绘制，提高可见度
-                address_text = f"可用地址数: {usable_addresses:,}"
-                text_x = x + 250
-                # 使用带描边的文字绘制方法
-                self.draw_text_with_stroke(
-                    address_text, text_x, text_y, font, anchor=tk.W, fill="#ffffff"
+                self.chart_label_renderer.draw_label_row(
+                    [(segment_text, x + 15), (address_text, x + 250)],
+                    text_y,
+                    font,
+                    fill="#ffffff",
+                    plate=ChartLabelRenderer.shade_color(color),
                 )
 
                 y += bar_height + padding
@@ -3044,7 +3259,8 @@ class IPSubnetSplitterApp:
         self.calculate_and_update_empty_rows(self.remaining_tree)
 
         # 清空图表
-        self.chart_canvas.delete("all")
+        if self.chart_canvas is not None:
+            self.chart_canvas.delete("all")
         self.chart_data = None
 
     def create_about_link(self):
@@ -3200,6 +3416,9 @@ class IPSubnetSplitterApp:
 
 
 if __name__ == "__main__":
+    # 模块导入完成
+    STARTUP_TIMER.mark("import")
+
     # 创建主窗口
     root = tk.Tk()
 
@@ -3229,8 +3448,6 @@ if __name__ == "__main__":
         # 尝试加载图标文件
         # 在开发环境中，图标文件位于当前目录
         # 在打包后的程序中，使用PyInstaller的资源路径
-        import os
-        import sys
         import tkinter as tk
 
         # 获取图标文件路径
@@ -3261,6 +3478,22 @@ if __name__ == "__main__":
 
     # 创建应用实例
     app = IPSubnetSplitterApp(root)
+    STARTUP_TIMER.mark("app_init")
+
+    # 启动耗时报告：设置环境变量NETSUB_STARTUP_REPORT为报告文件路径即可启用，
+    # 同时设置NETSUB_STARTUP_EXIT=1时在可交互后立即退出，便于脚本批量测量
+    startup_report_path = os.environ.get("NETSUB_STARTUP_REPORT")
+    if startup_report_path:
+
+        def on_startup_interactive():
+            try:
+                STARTUP_TIMER.write_report(startup_report_path, app.app_version)
+            except OSError as e:
+                print(f"写入启动耗时报告失败: {e}")
+            if os.environ.get("NETSUB_STARTUP_EXIT") == "1":
+                root.after(0, root.destroy)
+
+        STARTUP_TIMER.attach(root, on_interactive=on_startup_interactive)
 
     # 运行应用
     root.mainloop()
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+WSGI入口，供外部WSGI服务器加载，例如:
+    NETSUB_WEB_WORKERS=4 gunicorn -w 4 --preload -b 0.0.0.0:5000 wsgi:application
+    waitress-serve --threads 4 --port 5000 wsgi:application
+
+多进程服务器需要用NETSUB_WEB_WORKERS（或gunicorn的WEB_CONCURRENCY）告知工作进程数，
+每个工作进程的计算进程池按它平分CPU核心数，见compute_pool.py
+"""
+
+from web_app import app
+
+application = app